@@ -0,0 +1,145 @@
+"""Concurrent-request throughput of the Flask adapter vs the ASGI adapter.
+
+Seeds a temporary SQLite database (or DATABASE_URL), serves it with each adapter on
+a local port and fires `--requests` GET /api/students/<id>/grade calls with
+`--concurrency` in flight. A DATABASE_URL that already has tables is only seeded
+with --reset, which drops them; --no-seed benchmarks its existing data instead.
+
+Usage:
+  python -m benchmarks.bench_async_vs_flask [--students 200] [--requests 2000] [--concurrency 50]
+  DATABASE_URL=postgresql://... python -m benchmarks.bench_async_vs_flask --no-seed
+  DATABASE_URL=postgresql://... python -m benchmarks.bench_async_vs_flask --reset
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _seed(url: str, students: int, reset: bool) -> None:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from src.infrastructure.adapters.database import SQLAlchemyStudentRepository, SQLAlchemyEvaluationRepository
+    from src.application.services import StudentService
+    from benchmarks.schema import recreate_schema
+
+    engine = create_engine(url)
+    try:
+        recreate_schema(engine, reset=reset)
+        rng = random.Random(0)
+        with Session(engine) as session:
+            service = StudentService(SQLAlchemyStudentRepository(session), SQLAlchemyEvaluationRepository(session))
+            for i in range(students):
+                s = service.crear_estudiante(f"B{i:06d}", f"Alumno {i}", attendance=rng.random() > 0.2)
+                service.importar_evaluaciones(
+                    [{"student_id": s.id, "score": rng.uniform(0, 20), "weight": 25} for _ in range(4)]
+                )
+    finally:
+        engine.dispose()
+
+
+def _serve_flask(port: int):
+    from werkzeug.serving import make_server
+    from src.infrastructure.adapters.api import app
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.shutdown
+
+
+def _serve_asgi(port: int, url: str):
+    import uvicorn
+    from src.infrastructure.adapters.asgi import create_asgi_app
+
+    server = uvicorn.Server(uvicorn.Config(create_asgi_app(url), host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+
+    def stop():
+        server.should_exit = True
+    return stop
+
+
+async def _drive(base: str, student_ids, requests: int, concurrency: int) -> dict:
+    import httpx
+
+    latencies = []
+    queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(student_ids[i % len(student_ids)])
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=60) as client:
+        login = await client.post("/api/login", json={"username": "admin", "password": "admin"})
+        login.raise_for_status()
+        client.headers["Authorization"] = "Bearer " + login.json()["access_token"]
+
+        async def worker():
+            while not queue.empty():
+                sid = queue.get_nowait()
+                start = time.perf_counter()
+                r = await client.get(f"/api/students/{sid}/grade")
+                r.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests_per_second": round(requests / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    seeding = parser.add_mutually_exclusive_group()
+    seeding.add_argument("--no-seed", action="store_true", help="use the existing data at DATABASE_URL")
+    seeding.add_argument("--reset", action="store_true", help="drop the tables already in DATABASE_URL and seed it")
+    args = parser.parse_args()
+
+    if "DATABASE_URL" not in os.environ:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    # Measure the adapters, not the cache
+    os.environ["GRADE_CACHE_SIZE"] = "0"
+    url = os.environ["DATABASE_URL"]
+    if not args.no_seed:
+        try:
+            _seed(url, args.students, args.reset)
+        except ValueError as e:
+            parser.error(str(e))
+    student_ids = list(range(1, args.students + 1))
+
+    report = {"students": args.students, "requests": args.requests, "concurrency": args.concurrency}
+    for name, serve in (("flask", _serve_flask), ("asgi", lambda p: _serve_asgi(p, url))):
+        port = _free_port()
+        stop = serve(port)
+        try:
+            report[name] = asyncio.run(_drive(f"http://127.0.0.1:{port}", student_ids, args.requests, args.concurrency))
+        finally:
+            stop()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Latency of the per-student evaluation lookups with and without the covering index.
+
+Seeds `--evaluations` rows spread over `--students` students, then times
+`find_by_student_id` (the scan behind every detailed grade read) for random
+students, first without `ix_evaluations_student_id_covering` and then with it.
+
+Usage:
+  python -m benchmarks.bench_evaluation_indexes [--evaluations 2000000] [--students 100000]
+  DATABASE_URL=postgresql://... python -m benchmarks.bench_evaluation_indexes [--reset]
+
+DATABASE_URL defaults to a temporary SQLite file. A database that already has tables
+is refused unless --reset is given, which drops them.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from benchmarks.schema import recreate_schema
+from src.infrastructure.adapters.database import (
+    students_table,
+    evaluations_table,
+    SQLAlchemyEvaluationRepository,
+)
+
+INDEX = next(ix for ix in evaluations_table.indexes if ix.name == 'ix_evaluations_student_id_covering')
+CHUNK = 50000
+
+
+def _seed(engine, students: int, evaluations: int, seed: int, reset: bool) -> None:
+    rng = random.Random(seed)
+    recreate_schema(engine, reset=reset)
+    INDEX.drop(bind=engine)
+    with engine.begin() as conn:
+        for lo in range(0, students, CHUNK):
+            conn.execute(insert(students_table), [
+                {"id": i + 1, "code": f"B{i:08d}", "nombre": f"Alumno {i}", "attendance": True}
+                for i in range(lo, min(lo + CHUNK, students))
+            ])
+        for lo in range(0, evaluations, CHUNK):
+            conn.execute(insert(evaluations_table), [
+                {"student_id": rng.randint(1, students), "score": rng.uniform(0, 20), "weight": 10.0}
+                for _ in range(min(CHUNK, evaluations - lo))
+            ])
+
+
+def _time_lookups(engine, student_ids) -> dict:
+    latencies = []
+    with Session(engine) as session:
+        repo = SQLAlchemyEvaluationRepository(session)
+        for sid in student_ids:
+            start = time.perf_counter()
+            repo.find_by_student_id(sid)
+            latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 3),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+    }
+
+
+def run(url: str, students: int, evaluations: int, lookups: int, seed: int = 0, reset: bool = False) -> dict:
+    engine = create_engine(url)
+    try:
+        _seed(engine, students, evaluations, seed, reset)
+    except ValueError:
+        engine.dispose()
+        raise
+    rng = random.Random(seed + 1)
+    sample = [rng.randint(1, students) for _ in range(lookups)]
+
+    before = _time_lookups(engine, sample)
+    start = time.perf_counter()
+    INDEX.create(bind=engine)
+    build_seconds = time.perf_counter() - start
+    if engine.dialect.name == 'postgresql':
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE evaluations")
+    after = _time_lookups(engine, sample)
+    engine.dispose()
+    return {
+        "dialect": engine.dialect.name,
+        "students": students,
+        "evaluations": evaluations,
+        "lookups": lookups,
+        "without_index": before,
+        "with_index": after,
+        "index_build_seconds": round(build_seconds, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--evaluations", type=int, default=2000000)
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--reset", action="store_true", help="drop the tables already in DATABASE_URL")
+    args = parser.parse_args()
+    url = os.getenv("DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/bench_indexes.db"
+    try:
+        report = run(url, args.students, args.evaluations, args.lookups, reset=args.reset)
+    except ValueError as e:
+        parser.error(str(e))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
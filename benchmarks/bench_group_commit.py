@@ -0,0 +1,122 @@
+"""Evaluation inserts per second: one commit per row vs write-behind group commit.
+
+`--threads` concurrent clients each insert `--per-thread` evaluations, first with
+`SQLAlchemyEvaluationRepository.save` (one transaction per row, as the API does
+today) and then through a `GroupCommitWriter` at every `--durability` level.
+Per-insert latency percentiles are what a caller waits for its id.
+
+Usage:
+  python -m benchmarks.bench_group_commit [--threads 16] [--per-thread 200] [--max-batch 256]
+  DATABASE_URL=postgresql://... python -m benchmarks.bench_group_commit --durability full relaxed [--reset]
+
+DATABASE_URL defaults to a temporary SQLite file. A database that already has tables
+is refused unless --reset is given, which drops them.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.schema import recreate_schema
+from src.domain.models import Evaluation
+from src.infrastructure.adapters.database import students_table, SQLAlchemyEvaluationRepository
+from src.infrastructure.adapters.group_commit import GroupCommitWriter
+from src.infrastructure.metrics import MetricsRegistry
+
+STUDENTS = 1000
+
+
+def _reset(engine, reset: bool) -> None:
+    recreate_schema(engine, reset=reset)
+    with engine.begin() as conn:
+        conn.execute(insert(students_table), [
+            {"id": i, "code": f"G{i:06d}", "nombre": f"Alumno {i}", "attendance": True}
+            for i in range(1, STUDENTS + 1)
+        ])
+
+
+def _drive(save, threads: int, per_thread: int, seed: int) -> dict:
+    def client(n: int) -> list:
+        rng = random.Random(seed + n)
+        latencies = []
+        for _ in range(per_thread):
+            ev = Evaluation(None, rng.randint(1, STUDENTS), rng.uniform(0, 20), 10.0)
+            start = time.perf_counter()
+            save(ev)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        latencies = sorted(l for ls in pool.map(client, range(threads)) for l in ls)
+    elapsed = time.perf_counter() - start
+    return {
+        "inserts_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 3),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 3),
+    }
+
+
+def run(url: str, threads: int, per_thread: int, max_batch: int, max_delay_ms: float,
+        durabilities=("full",), seed: int = 0, reset: bool = False) -> dict:
+    if url.startswith("sqlite"):
+        # SQLite serializes writers: wait for the lock instead of failing the per-row baseline
+        engine = create_engine(url, connect_args={"timeout": 60})
+    else:
+        engine = create_engine(url, pool_size=threads + 1)
+    Session = sessionmaker(bind=engine)
+    report = {"dialect": engine.dialect.name, "threads": threads, "inserts": threads * per_thread}
+
+    try:
+        _reset(engine, reset)
+    except ValueError:
+        engine.dispose()
+        raise
+
+    def save_per_row(ev):
+        with Session() as session:
+            SQLAlchemyEvaluationRepository(session).save(ev)
+
+    report["per_row_commit"] = _drive(save_per_row, threads, per_thread, seed)
+
+    for durability in durabilities:
+        # Only our own rows from the previous run are dropped here
+        _reset(engine, True)
+        registry = MetricsRegistry()
+        writer = GroupCommitWriter(Session, max_batch=max_batch, max_delay=max_delay_ms / 1000,
+                                   durability=durability, registry=registry)
+        result = _drive(writer.save, threads, per_thread, seed)
+        writer.close()
+        batches = registry.histogram("evaluation_group_commit_batch_size", "")
+        result["commits"] = batches.count()
+        report[f"group_commit_{durability}"] = result
+    engine.dispose()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--per-thread", type=int, default=200)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-delay-ms", type=float, default=5)
+    parser.add_argument("--durability", nargs="+", default=["full"], choices=["full", "relaxed"])
+    parser.add_argument("--reset", action="store_true", help="drop the tables already in DATABASE_URL")
+    args = parser.parse_args()
+    url = os.getenv("DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/bench_group_commit.db"
+    try:
+        report = run(url, args.threads, args.per_thread, args.max_batch, args.max_delay_ms,
+                     args.durability, reset=args.reset)
+    except ValueError as e:
+        parser.error(str(e))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Cold import cost of each layer, measured with `python -X importtime`.
+
+Each module is imported in a fresh interpreter; the median cumulative import
+time over --repeat runs is reported in milliseconds, together with the
+frameworks it pulled in. The same measurement guards the budget in
+tests/test_import_time.py.
+
+Usage:
+  python -m benchmarks.bench_import_time [--repeat 5]
+"""
+import argparse
+import json
+import statistics
+
+from tests.test_import_time import FRAMEWORKS, importtime
+
+MODULES = (
+    "src.domain.ports",
+    "src.application.services",
+    "src.infrastructure.config",
+    "src.infrastructure.adapters.database",
+    "src.infrastructure.adapters.api",
+    "src.infrastructure.adapters.asgi",
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    report = {}
+    for module in MODULES:
+        runs = [importtime(f"import {module}")[0] for _ in range(args.repeat)]
+        report[module] = {
+            "cumulative_ms": round(statistics.median(r[module] for r in runs) / 1000, 1),
+            "frameworks": sorted({m.split(".")[0] for m in runs[0]} & set(FRAMEWORKS)),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Memory benchmark for GradeCalculator storage.
+
+Loads a synthetic cohort into a long-lived calculator and reports the bytes
+allocated per evaluation, next to the previous layout (a dict of lists of
+per-evaluation objects) for comparison. The per-student overhead weighs most
+with few evaluations each, so check small counts too (`--evaluations 1`).
+
+Usage:
+  python -m benchmarks.bench_memory [--students 20000] [--evaluations 10]
+"""
+import argparse
+import json
+import random
+import tracemalloc
+from typing import Callable, Dict, List
+
+from src.application.grade_calculator import GradeCalculator
+
+
+class _LegacyEvaluation:
+    # Layout used before the compact storage: a plain object with a __dict__
+    def __init__(self, score: float, weight: float) -> None:
+        self.score = float(score)
+        self.weight = float(weight)
+
+
+def _load_legacy(rows) -> Dict[str, List[_LegacyEvaluation]]:
+    store: Dict[str, List[_LegacyEvaluation]] = {}
+    for sid, score, weight in rows:
+        store.setdefault(str(sid), []).append(_LegacyEvaluation(score, weight))
+    return store
+
+
+def _load_compact(rows) -> GradeCalculator:
+    calc = GradeCalculator()
+    for sid, score, weight in rows:
+        calc.add_evaluation(sid, score, weight)
+    return calc
+
+
+def _measure(loader: Callable, rows) -> int:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = loader(rows)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def run(students: int, evaluations: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    rows = [
+        (sid, rng.uniform(0, 20), 100.0 / evaluations)
+        for sid in range(students)
+        for _ in range(evaluations)
+    ]
+    total = len(rows)
+    legacy = _measure(_load_legacy, rows)
+    compact = _measure(_load_compact, rows)
+    return {
+        "students": students,
+        "evaluations": total,
+        "legacy_bytes_per_evaluation": round(legacy / total, 2),
+        "compact_bytes_per_evaluation": round(compact / total, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--evaluations", type=int, default=10, help="evaluations per student")
+    args = parser.parse_args()
+    print(json.dumps(run(args.students, args.evaluations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""Deterministic synthetic cohorts shared by the benchmarks."""
+import random
+
+COHORT_SIZES = (100, 1000, 10000)
+EVALUATIONS_PER_STUDENT = 4
+
+
+def make_cohort(students: int, seed: int = 0):
+    """(student_id, score, weight) rows, EVALUATIONS_PER_STUDENT per student."""
+    rng = random.Random(seed)
+    weight = 100.0 / EVALUATIONS_PER_STUDENT
+    return [
+        (sid, round(rng.uniform(0, 20), 2), weight)
+        for sid in range(1, students + 1)
+        for _ in range(EVALUATIONS_PER_STUDENT)
+    ]
@@ -0,0 +1,56 @@
+import os
+import tempfile
+
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-with-32-bytes!")
+
+import pytest
+
+from src.domain.models import Student, Evaluation
+from benchmarks.cohort import make_cohort
+
+
+def pytest_addoption(parser):
+    parser.addoption("--reset", action="store_true",
+                     help="drop the tables already in BENCHMARK_DATABASE_URL before seeding it")
+
+
+@pytest.fixture(scope="session")
+def domain_rows():
+    rows = make_cohort(10000)
+    students = [Student(id=i, code=f"C{i:06d}", nombre=f"Alumno {i}", attendance=i % 5 != 0) for i in range(1, 10001)]
+    evaluations = [Evaluation(id=n, student_id=sid, score=sc, weight=w) for n, (sid, sc, w) in enumerate(rows, 1)]
+    return students, evaluations
+
+
+@pytest.fixture(scope="session")
+def seeded_app(pytestconfig):
+    """Flask app seeded with 1000 students (4 evaluations each).
+
+    The database is a temporary SQLite file unless BENCHMARK_DATABASE_URL names one;
+    DATABASE_URL is deliberately ignored so that an exported production URL is never
+    seeded. A database that already has tables needs `--reset`.
+    """
+    from src.infrastructure.adapters import api
+    from src.infrastructure.adapters.database import metadata
+    from benchmarks.schema import recreate_schema
+
+    url = os.getenv("BENCHMARK_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/benchmarks.db"
+    # Measure the grade computation itself, not cache hits
+    app = api.create_app({"DATABASE_URL": url, "GRADE_CACHE_SIZE": 0})
+    database = app.extensions["database"]
+    try:
+        recreate_schema(database.engine, reset=pytestconfig.getoption("reset"))
+    except ValueError as e:
+        pytest.exit(str(e), returncode=2)
+    with app.app_context():
+        service = api.get_student_service()
+        for i in range(1, 1001):
+            service.crear_estudiante(f"C{i:06d}", f"Alumno {i}", attendance=i % 5 != 0)
+        service.importar_evaluaciones(
+            {"student_id": sid, "score": sc, "weight": w} for sid, sc, w in make_cohort(1000)
+        )
+    client = app.test_client()
+    token = client.post('/api/login', json={"username": "admin", "password": "admin"}).json['access_token']
+    yield client, {"Authorization": "Bearer " + token}
+    metadata.drop_all(bind=database.engine)
+    database.dispose()
@@ -0,0 +1,325 @@
+"""Load test of the Flask API with the traffic patterns of the frontend.
+
+Starts the real app (`src.infrastructure.adapters.api`) in a separate process on a
+local port, backed by a fresh SQLite file, a throwaway PostgreSQL cluster
+(`--postgres`, needs the `initdb`/`pg_ctl` binaries) or `--database-url` (an empty
+database, or any one with `--reset`, which drops its tables), seeds it through a
+columnar snapshot import and runs three scenarios, one after the other:
+
+  login        `--users` clients log in `--logins` times each, all at once
+  browse       each client logs in once, then `--iterations` times lists the students
+               and opens the detailed grade of the first `--grades-per-list` rows,
+               one request per row, as frontend/index.html does
+  evaluations  each client posts `--evaluations` evaluations for random students
+
+`--users` requests are in flight at a time. The JSON report has, per scenario and
+endpoint, the throughput and the p50/p95/p99 latencies, plus the error counts; the
+exit status is 1 when the error rate goes over `--max-error-rate`. With `--url`
+an already running server is targeted instead (no backend is started or seeded).
+
+Usage:
+  python -m benchmarks.loadtest [--students 1000] [--users 32] [--output report.json]
+  python -m benchmarks.loadtest --postgres
+  python -m benchmarks.loadtest --database-url postgresql://bench@localhost/loadtest --reset
+  python -m benchmarks.loadtest --url http://127.0.0.1:8000 --students 1000
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+CREDENTIALS = {"username": "admin", "password": "admin"}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port: int, process: Optional[subprocess.Popen] = None, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"The server exited with status {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Nothing is listening on port {port} after {timeout}s")
+
+
+# --- Backends ---
+
+def _pg_binary(name: str) -> str:
+    found = shutil.which(name) or next(iter(sorted(glob.glob(f"/usr/lib/postgresql/*/bin/{name}"), reverse=True)), None)
+    if found is None:
+        raise RuntimeError(f"{name} not found: install PostgreSQL or pass --database-url")
+    return found
+
+
+@contextmanager
+def throwaway_postgres():
+    """A private PostgreSQL cluster in a temporary directory, deleted on exit."""
+    workdir = tempfile.mkdtemp(prefix="loadtest-pg-")
+    data, port = os.path.join(workdir, "data"), _free_port()
+    subprocess.run([_pg_binary("initdb"), "-D", data, "-U", "loadtest", "--auth=trust", "-E", "UTF8"],
+                   check=True, stdout=subprocess.DEVNULL)
+    subprocess.run([
+        _pg_binary("pg_ctl"), "-D", data, "-l", os.path.join(workdir, "postgres.log"), "-w",
+        "-o", f"-p {port} -k {workdir} -c listen_addresses=127.0.0.1 -c fsync=on", "start",
+    ], check=True, stdout=subprocess.DEVNULL)
+    try:
+        yield f"postgresql+psycopg2://loadtest@127.0.0.1:{port}/postgres"
+    finally:
+        subprocess.run([_pg_binary("pg_ctl"), "-D", data, "-m", "fast", "-w", "stop"], stdout=subprocess.DEVNULL)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def seed(url: str, students: int, evaluations_per_student: int = 3, seed: int = 0, reset: bool = False) -> None:
+    """Create the schema and bulk load a synthetic cohort.
+
+    A database that already has tables is refused unless `reset` is set, in which
+    case every table of the app is dropped first.
+    """
+    import numpy as np
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from src.infrastructure.adapters.snapshot import GradebookSnapshot, StringColumn, import_snapshot
+    from benchmarks.schema import recreate_schema
+
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, students + 1, dtype=np.int64)
+    count = students * evaluations_per_student
+    snapshot = GradebookSnapshot(
+        student_id=ids,
+        code=StringColumn.from_strings(f"L{i:07d}" for i in ids.tolist()),
+        nombre=StringColumn.from_strings(f"Alumno {i}" for i in ids.tolist()),
+        attendance=rng.random(students) > 0.2,
+        evaluation_id=np.arange(1, count + 1, dtype=np.int64),
+        evaluation_student_id=np.repeat(ids, evaluations_per_student),
+        score=np.round(rng.uniform(0, 20, count), 1),
+        weight=np.full(count, 100.0 / evaluations_per_student),
+    )
+    engine = create_engine(url)
+    try:
+        recreate_schema(engine, reset=reset)
+        with Session(engine) as session:
+            import_snapshot(session, snapshot)
+    finally:
+        engine.dispose()
+
+
+@contextmanager
+def serve(url: str, port: int):
+    """Run the Flask app in a child process (its own interpreter and GIL)."""
+    env = {**os.environ, "DATABASE_URL": url}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.loadtest", "--serve", str(port)],
+        env=env, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    try:
+        _wait_for_port(port, process)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        process.wait(10)
+
+
+def _serve_forever(port: int) -> None:
+    import logging
+    from werkzeug.serving import make_server
+    from src.infrastructure.adapters.api import create_app
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    make_server("127.0.0.1", port, create_app(), threaded=True).serve_forever()
+
+
+# --- Load generation ---
+
+class Recorder:
+    """Latencies and statuses per endpoint (method plus route template)."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def request(self, client, method: str, endpoint: str, path: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+        except Exception as e:
+            self.errors[f"{method} {endpoint}"][type(e).__name__] += 1
+            return None
+        self.latencies[f"{method} {endpoint}"].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[f"{method} {endpoint}"][str(response.status_code)] += 1
+            return None
+        return response
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        for name in sorted(set(self.latencies) | set(self.errors)):
+            latencies = sorted(self.latencies.get(name, []))
+            errors = dict(self.errors.get(name, {}))
+            endpoints[name] = {
+                "requests": len(latencies) + sum(v for k, v in errors.items() if not k.isdigit()),
+                "errors": errors,
+                "throughput_rps": round(len(latencies) / elapsed, 1),
+                **{f"p{p}_ms": percentile_ms(latencies, p) for p in (50, 95, 99)},
+                "max_ms": round(latencies[-1] * 1000, 2) if latencies else None,
+            }
+        total = sum(e["requests"] for e in endpoints.values())
+        failed = sum(sum(e["errors"].values()) for e in endpoints.values())
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "requests": total,
+            "errors": failed,
+            "throughput_rps": round(total / elapsed, 1) if elapsed else None,
+            "endpoints": endpoints,
+        }
+
+
+def percentile_ms(sorted_latencies: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of latencies in seconds, in milliseconds."""
+    if not sorted_latencies:
+        return None
+    rank = max(int(-(-len(sorted_latencies) * p // 100)), 1)
+    return round(sorted_latencies[rank - 1] * 1000, 2)
+
+
+async def _login(recorder: Recorder, client) -> Optional[str]:
+    response = await recorder.request(client, "POST", "/api/login", "/api/login", json=CREDENTIALS)
+    return response.json()["access_token"] if response is not None else None
+
+
+async def login_burst(recorder: Recorder, client, args, rng: random.Random) -> None:
+    for _ in range(args.logins):
+        await _login(recorder, client)
+
+
+async def browse(recorder: Recorder, client, args, rng: random.Random) -> None:
+    token = await _login(recorder, client)
+    headers = {"Authorization": f"Bearer {token}"}
+    for _ in range(args.iterations):
+        response = await recorder.request(client, "GET", "/api/students", "/api/students", headers=headers)
+        students = response.json() if response is not None else []
+        for student in students[:args.grades_per_list]:
+            await recorder.request(
+                client, "GET", "/api/students/<id>/grade", f"/api/students/{student['id']}/grade?details=true",
+                headers=headers,
+            )
+
+
+async def evaluation_burst(recorder: Recorder, client, args, rng: random.Random) -> None:
+    token = await _login(recorder, client)
+    headers = {"Authorization": f"Bearer {token}"}
+    for _ in range(args.evaluations):
+        body = {"student_id": rng.randint(1, args.students), "score": round(rng.uniform(0, 20), 1), "weight": 10}
+        await recorder.request(client, "POST", "/api/evaluations", "/api/evaluations", json=body, headers=headers)
+
+
+SCENARIOS = {"login": login_burst, "browse": browse, "evaluations": evaluation_burst}
+
+
+async def run_scenario(base: str, scenario, args, seed: int = 0) -> dict:
+    import httpx
+
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=args.timeout) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            scenario(recorder, client, args, random.Random(seed + user)) for user in range(args.users)
+        ))
+        elapsed = time.perf_counter() - start
+    return recorder.report(elapsed)
+
+
+def run(base: str, args) -> dict:
+    report = {
+        "target": base,
+        "users": args.users,
+        "students": args.students,
+        "scenarios": {},
+    }
+    for name in args.scenarios:
+        report["scenarios"][name] = asyncio.run(run_scenario(base, SCENARIOS[name], args))
+    requests = sum(s["requests"] for s in report["scenarios"].values())
+    errors = sum(s["errors"] for s in report["scenarios"].values())
+    report["error_rate"] = round(errors / requests, 4) if requests else 0.0
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="drive an already running server instead of starting one")
+    target.add_argument("--database-url", help="seed and serve this database (default: a temporary SQLite file); "
+                                               "it must be empty unless --reset is given")
+    target.add_argument("--postgres", action="store_true", help="seed and serve a throwaway local PostgreSQL")
+    parser.add_argument("--reset", action="store_true",
+                        help="drop every table of the app in --database-url before seeding it")
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=32, help="concurrent clients (requests in flight)")
+    parser.add_argument("--logins", type=int, default=5, help="logins per client in the login burst")
+    parser.add_argument("--iterations", type=int, default=3, help="list-then-grade rounds per client")
+    parser.add_argument("--grades-per-list", type=int, default=20)
+    parser.add_argument("--evaluations", type=int, default=20, help="evaluation posts per client")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--output", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        _serve_forever(args.serve)
+        return
+
+    if args.url:
+        report = run(args.url.rstrip("/"), args)
+    else:
+        with (throwaway_postgres() if args.postgres else _given(args.database_url)) as url:
+            try:
+                seed(url, args.students, reset=args.reset)
+            except ValueError as e:
+                parser.error(str(e))
+            with serve(url, _free_port()) as base:
+                report = run(base, args)
+        report["backend"] = "postgresql" if args.postgres or url.startswith("postgresql") else "sqlite"
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+    sys.exit(1 if report["error_rate"] > args.max_error_rate else 0)
+
+
+@contextmanager
+def _given(database_url: Optional[str]):
+    if database_url:
+        yield database_url
+        return
+    workdir = tempfile.mkdtemp(prefix="loadtest-")
+    try:
+        yield f"sqlite:///{workdir}/loadtest.db"
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
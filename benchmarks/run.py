@@ -0,0 +1,95 @@
+"""Run the benchmark suite, save the results as JSON and optionally check for regressions.
+
+Usage:
+  python -m benchmarks.run                                   # -> benchmarks/results/<timestamp>.json
+  python -m benchmarks.run --output current.json --compare baseline.json [--max-regression 0.2]
+  python -m benchmarks.run --compare-only baseline.json current.json
+  BENCHMARK_DATABASE_URL=postgresql://... python -m benchmarks.run --reset
+
+The endpoint benchmarks seed a temporary SQLite file, or BENCHMARK_DATABASE_URL when
+set (DATABASE_URL is ignored); a database that already has tables needs --reset,
+which drops them.
+
+A benchmark regresses when its mean time grows by more than --max-regression
+(a fraction, 0.2 = 20%), i.e. when latency goes up or throughput goes down.
+The exit status is 1 when any benchmark regresses.
+"""
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+
+
+def run_suite(output: str, extra_args: List[str]) -> int:
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    cmd = [
+        sys.executable, "-m", "pytest", BENCH_DIR, "-q", "-p", "no:cacheprovider",
+        f"--benchmark-json={output}", "--benchmark-min-rounds=5",
+    ] + extra_args
+    return subprocess.call(cmd, cwd=ROOT)
+
+
+def _means(path: str) -> Dict[str, float]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {b["fullname"]: b["stats"]["mean"] for b in data["benchmarks"]}
+
+
+def compare(baseline: str, current: str, max_regression: float) -> Tuple[List[dict], bool]:
+    """Compare mean times per benchmark; returns the rows and whether anything regressed."""
+    old, new = _means(baseline), _means(current)
+    rows, regressed = [], False
+    for name in sorted(old.keys() & new.keys()):
+        change = new[name] / old[name] - 1.0
+        failed = change > max_regression
+        regressed = regressed or failed
+        rows.append({
+            "benchmark": name,
+            "baseline_mean_s": old[name],
+            "current_mean_s": new[name],
+            "change": round(change, 4),
+            "regressed": failed,
+        })
+    return rows, regressed
+
+
+def _print_report(rows: List[dict]) -> None:
+    for row in rows:
+        flag = "REGRESSED" if row["regressed"] else "ok"
+        print(f"{flag:>9}  {row['change']:+8.1%}  {row['benchmark']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    parser.add_argument("--output", default=os.path.join(BENCH_DIR, "results", f"{stamp}.json"))
+    parser.add_argument("--compare", metavar="BASELINE", help="results JSON to compare the new run against")
+    parser.add_argument("--compare-only", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="compare two existing results files without running the suite")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args, pytest_args = parser.parse_known_args()
+
+    if args.compare_only:
+        baseline, current = args.compare_only
+    else:
+        status = run_suite(args.output, pytest_args)
+        if status != 0:
+            sys.exit(status)
+        print(f"Results written to {args.output}")
+        if not args.compare:
+            return
+        baseline, current = args.compare, args.output
+
+    rows, regressed = compare(baseline, current, args.max_regression)
+    _print_report(rows)
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""Schema setup shared by the benchmarks that seed their own database."""
+
+
+def recreate_schema(engine, reset: bool = False) -> None:
+    """Drop and create the app's tables, refusing a database that already has any.
+
+    Benchmarks seed synthetic data, so a populated database is only wiped when the
+    caller explicitly asks for it with `reset` (the `--reset` flag of each benchmark).
+    """
+    from sqlalchemy import inspect
+    from src.infrastructure.adapters.database import metadata
+
+    existing = inspect(engine).get_table_names()
+    if existing and not reset:
+        raise ValueError(f"{engine.url.render_as_string()} already has tables ({', '.join(existing)}); "
+                         "pass --reset to drop them and load the synthetic cohort")
+    metadata.drop_all(bind=engine)
+    metadata.create_all(bind=engine)
@@ -0,0 +1,37 @@
+"""End-to-end Flask endpoint latency (test client over a seeded SQLite database)."""
+import itertools
+
+
+def _ok(response):
+    assert response.status_code < 400, response.data
+    return response
+
+
+def test_list_students(benchmark, seeded_app):
+    client, auth = seeded_app
+    benchmark(lambda: _ok(client.get('/api/students', headers=auth)))
+
+
+def test_student_grade(benchmark, seeded_app):
+    client, auth = seeded_app
+    ids = itertools.cycle(range(1, 1001))
+    benchmark(lambda: _ok(client.get(f'/api/students/{next(ids)}/grade?details=true', headers=auth)))
+
+
+def test_student_grade_from_totals(benchmark, seeded_app):
+    client, auth = seeded_app
+    ids = itertools.cycle(range(1, 1001))
+    benchmark(lambda: _ok(client.get(f'/api/students/{next(ids)}/grade', headers=auth)))
+
+
+def test_cohort_grades(benchmark, seeded_app):
+    client, auth = seeded_app
+    benchmark(lambda: _ok(client.get('/api/grades?details=false', headers=auth)))
+
+
+def test_add_evaluation(benchmark, seeded_app):
+    client, auth = seeded_app
+    # Spread inserts over many students so the max_evaluations rule never kicks in
+    ids = itertools.cycle(range(1, 1001))
+    body = lambda: {"student_id": next(ids), "score": 15, "weight": 0}
+    benchmark.pedantic(lambda: _ok(client.post('/api/evaluations', json=body(), headers=auth)), rounds=200, iterations=1)
@@ -0,0 +1,16 @@
+"""Auth overhead per request on a route that does no other work, with and without the token cache."""
+import pytest
+
+from src.infrastructure.adapters.api import create_app
+
+
+@pytest.mark.parametrize("cache_size", [0, 4096], ids=["verify_every_request", "token_cache"])
+def test_authenticated_request(benchmark, cache_size):
+    app = create_app({"JWT_CACHE_SIZE": cache_size, "GRADE_CACHE_SIZE": 0})
+    client = app.test_client()
+    token = client.post('/api/login', json={"username": "admin", "password": "admin"}).json['access_token']
+    headers = {"Authorization": "Bearer " + token}
+
+    response = benchmark(client.get, '/api/cache/stats', headers=headers)
+    assert response.status_code == 200
+
@@ -0,0 +1,36 @@
+import pytest
+
+from src.application.grade_calculator import GradeCalculator
+from benchmarks.cohort import COHORT_SIZES, make_cohort
+
+
+def _load(rows):
+    calc = GradeCalculator()
+    for sid, score, weight in rows:
+        calc.add_evaluation(sid, score, weight)
+    return calc
+
+
+@pytest.mark.parametrize("students", COHORT_SIZES)
+def test_add_evaluation(benchmark, students):
+    rows = make_cohort(students)
+    benchmark(_load, rows)
+
+
+@pytest.mark.parametrize("students", COHORT_SIZES)
+def test_calculate_final(benchmark, students):
+    calc = _load(make_cohort(students))
+    ids = [str(sid) for sid in range(1, students + 1)]
+
+    def grade_all():
+        for sid in ids:
+            calc.calculate_final(sid)
+
+    benchmark(grade_all)
+
+
+@pytest.mark.parametrize("students", COHORT_SIZES)
+def test_calculate_many(benchmark, students):
+    ids, scores, weights = zip(*make_cohort(students))
+    calc = GradeCalculator()
+    benchmark(calc.calculate_many, ids, scores, weights)
@@ -0,0 +1,43 @@
+"""CPU per JSON response for a 10k-row listing: mappers + stdlib vs dataclasses + FastJSONProvider."""
+import pytest
+from flask import Flask
+
+from src.application.mappers import StudentMapper, EvaluationMapper
+from src.infrastructure.adapters.json_provider import FastJSONProvider, TimedJSONProvider
+
+
+def _app(provider):
+    app = Flask(__name__)
+    app.json = provider(app)
+    return app
+
+
+@pytest.mark.parametrize("kind", ["students", "evaluations"])
+def test_response_via_mappers_and_stdlib(benchmark, domain_rows, kind):
+    students, evaluations = domain_rows
+    rows, to_list = (students, StudentMapper.to_list) if kind == "students" else (evaluations, EvaluationMapper.to_list)
+    app = _app(TimedJSONProvider)
+    with app.app_context():
+        benchmark(lambda: app.json.response(to_list(rows)))
+
+
+@pytest.mark.parametrize("kind", ["students", "evaluations"])
+def test_response_from_dataclasses_fast(benchmark, domain_rows, kind):
+    students, evaluations = domain_rows
+    rows = students if kind == "students" else evaluations
+    app = _app(FastJSONProvider)
+    with app.app_context():
+        benchmark(lambda: app.json.response(rows))
+
+
+@pytest.mark.parametrize("provider", [TimedJSONProvider, FastJSONProvider], ids=["stdlib", "fast"])
+def test_grade_breakdowns_response(benchmark, domain_rows, provider):
+    students, _ = domain_rows
+    grades = [
+        {"student_id": s.id, "weighted_average": 14.25, "attendance_penalty": 0.0, "extra_points": 0.0,
+         "final_grade": 14.25, "details": {"evaluation_count": 4, "total_weight": 100.0, "weighted_sum": 1425.0}}
+        for s in students
+    ]
+    app = _app(provider)
+    with app.app_context():
+        benchmark(lambda: app.json.response(grades))
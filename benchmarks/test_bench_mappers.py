@@ -0,0 +1,11 @@
+from src.application.mappers import StudentMapper, EvaluationMapper
+
+
+def test_student_mapper_to_list(benchmark, domain_rows):
+    students, _ = domain_rows
+    benchmark(StudentMapper.to_list, students)
+
+
+def test_evaluation_mapper_to_list(benchmark, domain_rows):
+    _, evaluations = domain_rows
+    benchmark(EvaluationMapper.to_list, evaluations)
@@ -5,7 +5,9 @@ CREATE TABLE IF NOT EXISTS students (
     id SERIAL PRIMARY KEY,
     code VARCHAR(50) UNIQUE NOT NULL,
     nombre VARCHAR(150) NOT NULL,
-    attendance BOOLEAN DEFAULT TRUE
+    attendance BOOLEAN DEFAULT TRUE,
+    -- Se incrementa con cada cambio del estudiante o de sus evaluaciones (ETags HTTP)
+    version INTEGER NOT NULL DEFAULT 1
 );
 
 -- Tabla de evaluaciones
@@ -20,6 +22,11 @@ CREATE TABLE IF NOT EXISTS evaluations (
         ON DELETE CASCADE
 );
 
+-- PostgreSQL no indexa las claves foráneas: índice cubriente para las consultas por estudiante
+-- (mantenido también por la migración 0002 de migrations/versions)
+CREATE INDEX IF NOT EXISTS ix_evaluations_student_id_covering
+    ON evaluations (student_id) INCLUDE (score, weight);
+
 -- Datos iniciales de ejemplo
 INSERT INTO students (code, nombre, attendance) VALUES
 ('S001', 'Juan Perez', true),
@@ -29,4 +36,46 @@ INSERT INTO students (code, nombre, attendance) VALUES
 INSERT INTO evaluations (student_id, score, weight) VALUES
 (1, 14, 50),
 (1, 16, 50),
-(2, 18, 100);
\ No newline at end of file
+(2, 18, 100);
+-- Agregados por estudiante, mantenidos en la misma transacción que cada inserción de evaluación
+CREATE TABLE IF NOT EXISTS evaluation_totals (
+    student_id INTEGER PRIMARY KEY REFERENCES students(id) ON DELETE CASCADE,
+    evaluation_count INTEGER NOT NULL,
+    total_weight DOUBLE PRECISION NOT NULL,
+    weighted_sum DOUBLE PRECISION NOT NULL
+);
+
+INSERT INTO evaluation_totals (student_id, evaluation_count, total_weight, weighted_sum)
+SELECT student_id, COUNT(*), SUM(weight), SUM(score * weight)
+FROM evaluations
+GROUP BY student_id;
+
+-- Notas finales materializadas (mantenidas por los repositorios; `python -m src.application.recompute` las recalcula)
+CREATE TABLE IF NOT EXISTS final_grades (
+    student_id INTEGER PRIMARY KEY REFERENCES students(id) ON DELETE CASCADE,
+    weighted_average DOUBLE PRECISION NOT NULL,
+    attendance_penalty DOUBLE PRECISION NOT NULL,
+    extra_points DOUBLE PRECISION NOT NULL,
+    final_grade DOUBLE PRECISION NOT NULL
+);
+
+-- Notas de los datos de ejemplo, con los valores por defecto de GradeCalculator
+-- (1 punto menos sin asistencia, sin puntos extra, hasta 10 evaluaciones)
+INSERT INTO final_grades (student_id, weighted_average, attendance_penalty, extra_points, final_grade)
+SELECT t.student_id,
+       ROUND(CAST(t.weighted_sum / t.total_weight AS NUMERIC), 4),
+       CASE WHEN s.attendance THEN 0 ELSE 1 END,
+       0,
+       ROUND(CAST(t.weighted_sum / t.total_weight - CASE WHEN s.attendance THEN 0 ELSE 1 END AS NUMERIC), 4)
+FROM evaluation_totals t
+JOIN students s ON s.id = t.student_id
+WHERE t.evaluation_count BETWEEN 1 AND 10 AND t.total_weight > 0;
+
+-- Rankings y filtros por umbral (mantenido también por la migración 0004)
+CREATE INDEX IF NOT EXISTS ix_final_grades_final_grade ON final_grades (final_grade);
+
+-- Versión de colecciones completas (p. ej. el listado de estudiantes), para ETags HTTP
+CREATE TABLE IF NOT EXISTS resource_versions (
+    name VARCHAR(50) PRIMARY KEY,
+    version INTEGER NOT NULL
+);
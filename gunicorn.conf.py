@@ -0,0 +1,80 @@
+# gunicorn.conf.py
+"""Production server: pre-fork gunicorn workers, each with its own engine and caches.
+
+  gunicorn -c gunicorn.conf.py src.infrastructure.adapters.api:app
+
+Workers share nothing: every worker builds its database engine and pool, grade and
+token caches, evaluation writer and read model in its own process. The schema is
+not touched here; run `alembic upgrade head` before starting (the compose file does
+it in the `migrate` service).
+
+Settings (environment):
+  PORT / BIND          listen address (default 0.0.0.0:5000)
+  WEB_CONCURRENCY      number of workers (default 2 x usable CPUs + 1)
+  GUNICORN_THREADS     threads per worker (default 1; > 1 switches to the gthread worker)
+  GUNICORN_PRELOAD     import the app once in the master before forking (default false;
+                       faster boots, but a reload with HUP keeps the old code)
+  GUNICORN_TIMEOUT, GUNICORN_GRACEFUL_TIMEOUT, GUNICORN_MAX_REQUESTS
+
+Per-process state is never shared between workers. The grade cache is safe with any
+number of them: entries are checked against students.version, so a write served by
+one worker is not hidden by another worker's cached grade. The read model is not:
+a worker only sees other workers' writes after its next catch-up, so its grades and
+ETags could lag by READ_MODEL_REFRESH_S. READ_MODEL=true therefore refuses to start
+with more than one worker; scale it with GUNICORN_THREADS instead.
+
+Each worker opens up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections, so size them
+with the number of workers in mind. `kill -HUP <master pid>` reloads gracefully:
+new workers are started and the old ones finish their in-flight requests first.
+"""
+import multiprocessing
+import os
+import sys
+
+
+def _usable_cpus() -> int:
+    # Honours CPU affinity (taskset, cpusets) where the platform exposes it
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return multiprocessing.cpu_count()
+
+
+def _flag(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '5000')}")
+workers = int(os.getenv("WEB_CONCURRENCY", "0")) or _usable_cpus() * 2 + 1
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+worker_class = "gthread" if threads > 1 else "sync"
+preload_app = _flag("GUNICORN_PRELOAD")
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+accesslog = "-"
+errorlog = "-"
+
+if _flag("READ_MODEL") and workers > 1:
+    sys.exit(f"READ_MODEL=true necesita un solo worker (WEB_CONCURRENCY=1, hay {workers}): "
+             "cada worker tendría su propio modelo de lectura y serviría notas y ETags atrasados; "
+             "use GUNICORN_THREADS para atender peticiones en paralelo")
+
+APP_MODULE = "src.infrastructure.adapters.api"
+
+
+def post_fork(server, worker):
+    # With preload_app the app was built in the master; a pool (if one was opened there)
+    # must not be shared with the workers, so each one drops it and builds its own.
+    api = sys.modules.get(APP_MODULE)
+    if api is not None:
+        api.app.extensions["database"].dispose(close=False)
+
+
+def worker_exit(server, worker):
+    # Commit the evaluations still queued by the write-behind writer before the worker exits
+    api = sys.modules.get(APP_MODULE)
+    if api is not None and api.app.extensions["evaluation_writer"] is not None:
+        api.app.extensions["evaluation_writer"].close(timeout=graceful_timeout)
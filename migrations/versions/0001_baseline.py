@@ -0,0 +1,54 @@
+"""Baseline schema: students, evaluations and evaluation_totals.
+
+Tables that already exist (e.g. created by db/init.sql) are left untouched, so
+this revision can be applied to databases created before migrations existed.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'students' not in existing:
+        op.create_table(
+            'students',
+            sa.Column('id', sa.Integer, primary_key=True),
+            sa.Column('code', sa.String(50), unique=True),
+            sa.Column('nombre', sa.String(150)),
+            sa.Column('attendance', sa.Boolean, default=True),
+        )
+    if 'evaluations' not in existing:
+        op.create_table(
+            'evaluations',
+            sa.Column('id', sa.Integer, primary_key=True),
+            sa.Column('student_id', sa.Integer, sa.ForeignKey('students.id')),
+            sa.Column('score', sa.Float),
+            sa.Column('weight', sa.Float),
+        )
+    if 'evaluation_totals' not in existing:
+        op.create_table(
+            'evaluation_totals',
+            sa.Column('student_id', sa.Integer, sa.ForeignKey('students.id'), primary_key=True),
+            sa.Column('evaluation_count', sa.Integer, nullable=False),
+            sa.Column('total_weight', sa.Float, nullable=False),
+            sa.Column('weighted_sum', sa.Float, nullable=False),
+        )
+        op.execute(
+            "INSERT INTO evaluation_totals (student_id, evaluation_count, total_weight, weighted_sum) "
+            "SELECT student_id, COUNT(*), SUM(weight), SUM(score * weight) FROM evaluations GROUP BY student_id"
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('evaluation_totals')
+    op.drop_table('evaluations')
+    op.drop_table('students')
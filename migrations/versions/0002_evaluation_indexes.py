@@ -0,0 +1,35 @@
+"""Covering index for the per-student evaluation lookups.
+
+Postgres does not index foreign keys, so `WHERE student_id = ?` was a sequential
+scan. The index includes score and weight so the grade path can be answered
+with an index-only scan. It is built CONCURRENTLY on Postgres to avoid locking
+writes on large tables.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'ix_evaluations_student_id_covering'
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX_NAME, 'evaluations', ['student_id'],
+            postgresql_include=['score', 'weight'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX_NAME, table_name='evaluations', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,66 @@
+"""Materialized final grades, backfilled from evaluation_totals.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+# GradeCalculator defaults, as used by the services: 1 point off without attendance,
+# no extra points, at most 10 evaluations. Kept here so the migration does not change
+# when the application does.
+ATTENDANCE_PENALTY = 1.0
+MAX_EVALUATIONS = 10
+CHUNK = 10000
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if 'final_grades' not in sa.inspect(bind).get_table_names():
+        op.create_table(
+            'final_grades',
+            sa.Column('student_id', sa.Integer, sa.ForeignKey('students.id'), primary_key=True),
+            sa.Column('weighted_average', sa.Float, nullable=False),
+            sa.Column('attendance_penalty', sa.Float, nullable=False),
+            sa.Column('extra_points', sa.Float, nullable=False),
+            sa.Column('final_grade', sa.Float, nullable=False),
+        )
+    _backfill(bind)
+
+
+def _backfill(bind) -> None:
+    # Grades every student that has evaluations but no stored grade yet, with the same
+    # arithmetic (and Python rounding) as GradeCalculator.calculate_from_totals
+    rows = bind.execute(sa.text(
+        "SELECT t.student_id, s.attendance, t.total_weight, t.weighted_sum "
+        "FROM evaluation_totals t JOIN students s ON s.id = t.student_id "
+        "WHERE t.evaluation_count BETWEEN 1 AND :max_evaluations AND t.total_weight > 0 "
+        "AND NOT EXISTS (SELECT 1 FROM final_grades f WHERE f.student_id = t.student_id)"
+    ), {"max_evaluations": MAX_EVALUATIONS}).all()
+    insert = sa.text(
+        "INSERT INTO final_grades (student_id, weighted_average, attendance_penalty, extra_points, final_grade) "
+        "VALUES (:student_id, :weighted_average, :attendance_penalty, :extra_points, :final_grade)"
+    )
+    grades = []
+    for student_id, attendance, total_weight, weighted_sum in rows:
+        weighted_average = float(weighted_sum) / float(total_weight)
+        penalty = 0.0 if attendance else ATTENDANCE_PENALTY
+        grades.append({
+            "student_id": student_id,
+            "weighted_average": round(weighted_average, 4),
+            "attendance_penalty": round(penalty, 4),
+            "extra_points": 0.0,
+            "final_grade": round(weighted_average - penalty, 4),
+        })
+    for lo in range(0, len(grades), CHUNK):
+        bind.execute(insert, grades[lo:lo + CHUNK])
+
+
+def downgrade() -> None:
+    op.drop_table('final_grades')
@@ -0,0 +1,31 @@
+"""Version counters for HTTP caching: students.version and resource_versions.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    insp = sa.inspect(op.get_bind())
+    if 'version' not in {c['name'] for c in insp.get_columns('students')}:
+        op.add_column('students', sa.Column('version', sa.Integer, nullable=False, server_default='1'))
+    if 'resource_versions' not in insp.get_table_names():
+        op.create_table(
+            'resource_versions',
+            sa.Column('name', sa.String(50), primary_key=True),
+            sa.Column('version', sa.Integer, nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('resource_versions')
+    with op.batch_alter_table('students') as batch:
+        batch.drop_column('version')
@@ -0,0 +1,88 @@
+# src/application/async_services.py
+
+from typing import List, Optional
+from src.domain.models import Student, Evaluation
+from src.domain.ports import AsyncStudentRepository, AsyncEvaluationRepository, GradeCache
+from src.application.services import calcular_nota, calcular_nota_desde_totales, calcular_notas
+
+
+class AsyncStudentService:
+    """Thin async façade over the same business rules as `StudentService`.
+
+    Only the repository calls are awaited; validation and grading reuse the
+    I/O-free helpers of `services`, so both adapters grade identically.
+    """
+
+    def __init__(
+        self,
+        student_repo: AsyncStudentRepository,
+        evaluation_repo: AsyncEvaluationRepository,
+        grade_cache: Optional[GradeCache] = None,
+    ):
+        self.student_repo = student_repo
+        self.evaluation_repo = evaluation_repo
+        self.grade_cache = grade_cache
+
+    async def listar_estudiantes(self) -> List[Student]:
+        return await self.student_repo.get_all()
+
+    async def crear_estudiante(self, code: str, nombre: str, attendance: bool = True) -> Student:
+        if not code or not nombre:
+            raise ValueError("El código y el nombre del estudiante no pueden estar vacíos.")
+        nuevo = Student(id=None, code=code, nombre=nombre, attendance=attendance)
+        return await self.student_repo.save(nuevo)
+
+    async def agregar_evaluacion(self, student_id: int, score: float, weight: float) -> Evaluation:
+        student = await self.student_repo.find_by_id(student_id)
+        if not student:
+            raise ValueError("El estudiante no existe.")
+        eval_obj = Evaluation(id=None, student_id=student_id, score=float(score), weight=float(weight))
+        saved = await self.evaluation_repo.save(eval_obj)
+        self._invalidar_nota(student_id)
+        return saved
+
+    async def set_attendance(self, student_id: int, reached: bool) -> Student:
+        student = await self.student_repo.find_by_id(student_id)
+        if not student:
+            raise ValueError("El estudiante no existe.")
+        student.attendance = bool(reached)
+        saved = await self.student_repo.save(student)
+        self._invalidar_nota(student_id)
+        return saved
+
+    async def calcular_nota_final(self, student_id: int, include_details: bool = True) -> dict:
+        version = None
+        if self.grade_cache is not None:
+            # Same version check as the sync service, so other processes' writes are seen
+            version = await self.student_repo.get_version(student_id)
+            cached = self.grade_cache.get(student_id, include_details, version)
+            if cached is not None:
+                return cached
+
+        student = await self.student_repo.find_by_id(student_id)
+        if not student:
+            raise ValueError("El estudiante no existe.")
+
+        if include_details:
+            result = calcular_nota(student, await self.evaluation_repo.find_by_student_id(student_id))
+        else:
+            result = calcular_nota_desde_totales(student, await self.evaluation_repo.get_totals(student_id))
+
+        if self.grade_cache is not None:
+            self.grade_cache.set(student_id, include_details, result, version)
+        return result
+
+    async def calcular_notas_finales(self, student_ids: Optional[List[int]] = None) -> List[dict]:
+        if student_ids is None:
+            students = await self.student_repo.get_all()
+            student_ids = [s.id for s in students]
+        else:
+            student_ids = list(dict.fromkeys(student_ids))
+            students = await self.student_repo.find_by_ids(student_ids)
+        by_id = {s.id: s for s in students}
+        evaluations = await self.evaluation_repo.find_by_student_ids(list(by_id))
+        return calcular_notas(student_ids, by_id, evaluations)
+
+    def _invalidar_nota(self, student_id: int) -> None:
+        if self.grade_cache is not None:
+            self.grade_cache.invalidate(student_id)
@@ -0,0 +1,106 @@
+# src/application/consistency.py
+"""Consistency check for the materialized `final_grades` table.
+
+Recomputes the grade of a random sample of students from their raw evaluations
+(the same path as `StudentService.calcular_nota_final` with details) and reports
+every student whose stored grade differs, is missing or should not exist.
+
+Usage:
+  python -m src.application.consistency [--sample 500] [--seed N] [--repair]
+
+Exits with status 1 when drift is found (and not repaired).
+"""
+import argparse
+import json
+import random
+import sys
+from typing import List, Optional
+
+from src.domain.models import FinalGrade
+from src.domain.ports import StudentRepository, EvaluationRepository, FinalGradeRepository
+from src.application.services import calcular_nota
+
+FIELDS = ("weighted_average", "attendance_penalty", "extra_points", "final_grade")
+
+
+def _sample_ids(student_repo: StudentRepository, size: int, rng: random.Random) -> List[int]:
+    # Reservoir sampling over the streamed ids, so the cohort is never held in memory
+    sample: List[int] = []
+    for n, student in enumerate(student_repo.iter_all()):
+        if n < size:
+            sample.append(student.id)
+        else:
+            j = rng.randint(0, n)
+            if j < size:
+                sample[j] = student.id
+    return sorted(sample)
+
+
+def check_final_grades(
+    student_repo: StudentRepository,
+    evaluation_repo: EvaluationRepository,
+    final_grade_repo: FinalGradeRepository,
+    *,
+    sample_size: int = 500,
+    seed: Optional[int] = None,
+    repair: bool = False,
+) -> dict:
+    """Compare stored and recomputed grades for a sample; returns {"checked", "drift": [...]}.
+
+    Each drift entry has the student id, the stored and the expected fields (None
+    when absent). With `repair=True` the expected grades are written back.
+    """
+    ids = _sample_ids(student_repo, sample_size, random.Random(seed))
+    by_id = {s.id: s for s in student_repo.find_by_ids(ids)}
+    evaluations = evaluation_repo.find_by_student_ids(list(by_id))
+    drift, fixes, stale = [], [], []
+    for sid in ids:
+        try:
+            result = calcular_nota(by_id[sid], evaluations.get(sid, []))
+            expected = {name: result[name] for name in FIELDS}
+        except ValueError:
+            expected = None
+        row = final_grade_repo.find_by_student_id(sid)
+        stored = {name: getattr(row, name) for name in FIELDS} if row is not None else None
+        if stored == expected:
+            continue
+        drift.append({"student_id": sid, "stored": stored, "expected": expected})
+        if expected is None:
+            stale.append(sid)
+        else:
+            fixes.append(FinalGrade(sid, **expected))
+    if repair:
+        final_grade_repo.save_many(fixes)
+        final_grade_repo.delete_many(stale)
+    return {"checked": len(ids), "drift": drift, "repaired": repair and bool(drift)}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Check final_grades against a recomputation.")
+    parser.add_argument("--sample", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--repair", action="store_true", help="write the recomputed grades back")
+    args = parser.parse_args(argv)
+
+    # Composition root for the check
+    from src.infrastructure.config import SessionLocal
+    from src.infrastructure.adapters.database import (
+        SQLAlchemyStudentRepository, SQLAlchemyEvaluationRepository, SQLAlchemyFinalGradeRepository,
+    )
+
+    session = SessionLocal()
+    try:
+        report = check_final_grades(
+            SQLAlchemyStudentRepository(session),
+            SQLAlchemyEvaluationRepository(session),
+            SQLAlchemyFinalGradeRepository(session),
+            sample_size=args.sample, seed=args.seed, repair=args.repair,
+        )
+    finally:
+        session.close()
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if report["drift"] and not report["repaired"] else 0)
+
+
+if __name__ == "__main__":
+    main()
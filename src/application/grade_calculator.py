@@ -10,15 +10,29 @@ Design notes:
 - Grades are assumed on a numeric scale (e.g., 0-20). The implementation is
   agnostic on the exact scale; extra/penalty points are applied additively.
 - Max evaluations per student is enforced (10).
+- Running `total_weight`/`weighted_sum` totals are kept per student, so the
+  final grade costs O(1) after each new evaluation; `calculate_from_totals`
+  finishes the calculation from totals aggregated elsewhere.
+- Evaluations are stored columnar: each student id maps to a slot, and every
+  score, weight and "next evaluation of the same student" link lives in three
+  calculator-wide arrays, so no per-evaluation or per-student container objects
+  are kept alive. That is 24 bytes per evaluation plus about 140 per student
+  (its id string and index entry included), below a dict of lists of objects
+  from one evaluation per student up (see benchmarks/bench_memory.py).
 - Methods are deterministic and fast (satisfying RNF03/RNF04).
+- `calculate_many` grades a whole cohort from columnar inputs using NumPy
+  segment reductions; NumPy is imported lazily so the single-student path
+  does not depend on it.
+- `grade_evaluations` and `grade_totals` grade a single student in one call;
+  every adapter (services, repositories, batch jobs) grades through them.
 """
-from typing import Dict, List, Optional
+from array import array
+from typing import Dict, Iterable, Iterator, Mapping, Optional, Sequence, Tuple
 
 
-class Evaluation:
-    def __init__(self, score: float, weight: float) -> None:
-        self.score = float(score)
-        self.weight = float(weight)
+def _key(student_id) -> str:
+    # Avoid a str() call for the common case of ids that already are strings
+    return student_id if type(student_id) is str else str(student_id)
 
 
 class GradeCalculator:
@@ -44,8 +58,18 @@ class GradeCalculator:
         self.attendance_penalty = float(attendance_penalty)
         self.default_extra_points = float(extra_points)
 
-        # Internal storage
-        self._evaluations: Dict[str, List[Evaluation]] = {}
+        # Internal storage: interned student id -> slot. Evaluations are appended to the
+        # shared columns and chained per slot (first/last position, next position or -1)
+        self._index: Dict[str, int] = {}
+        self._scores = array("d")
+        self._weights = array("d")
+        self._next = array("q")
+        self._first = array("q")
+        self._last = array("q")
+        self._count = array("q")
+        # Running totals per slot, updated on every add so calculate_final is O(1)
+        self._total_weight = array("d")
+        self._weighted_sum = array("d")
         self._attendance: Dict[str, bool] = {}
         # Global flag controlled by teachers (RF03)
         self.all_years_teachers: bool = False
@@ -58,16 +82,34 @@ class GradeCalculator:
         weight is expressed as a percentage (e.g., 40 for 40%). The method enforces
         the maximum number of evaluations per student (RNF01).
         """
-        sid = str(student_id)
-        if sid not in self._evaluations:
-            self._evaluations[sid] = []
-        if len(self._evaluations[sid]) >= self.max_evaluations:
+        sid = _key(student_id)
+        slot = self._index.get(sid)
+        if slot is None:
+            slot = self._index[sid] = len(self._first)
+            self._first.append(-1)
+            self._last.append(-1)
+            self._count.append(0)
+            self._total_weight.append(0.0)
+            self._weighted_sum.append(0.0)
+        if self._count[slot] >= self.max_evaluations:
             raise ValueError(f"Maximum number of evaluations ({self.max_evaluations}) exceeded for student {sid}")
-        self._evaluations[sid].append(Evaluation(score=score, weight=weight))
+        score, weight = float(score), float(weight)
+        position = len(self._scores)
+        self._scores.append(score)
+        self._weights.append(weight)
+        self._next.append(-1)
+        if self._last[slot] < 0:
+            self._first[slot] = position
+        else:
+            self._next[self._last[slot]] = position
+        self._last[slot] = position
+        self._count[slot] += 1
+        self._total_weight[slot] += weight
+        self._weighted_sum[slot] += score * weight
 
     def set_attendance(self, student_id: str, has_reached_minimum: bool) -> None:
         """Record whether the student met the minimum attendance requirement."""
-        self._attendance[str(student_id)] = bool(has_reached_minimum)
+        self._attendance[_key(student_id)] = bool(has_reached_minimum)
 
     def set_all_years_teachers(self, flag: bool) -> None:
         """Set the global policy that allows awarding extra points."""
@@ -75,29 +117,65 @@ class GradeCalculator:
 
     def set_extra_points_for_student(self, student_id: str, points: float) -> None:
         """Optionally set a custom extra-points value for a specific student."""
-        self._extra_per_student[str(student_id)] = float(points)
+        self._extra_per_student[_key(student_id)] = float(points)
 
     def _get_extra_points(self, student_id: str) -> float:
-        if str(student_id) in self._extra_per_student:
-            return self._extra_per_student[str(student_id)]
+        points = self._extra_per_student.get(_key(student_id))
+        if points is not None:
+            return points
         return self.default_extra_points if self.all_years_teachers else 0.0
 
     def calculate_final(self, student_id: str) -> Dict:
         """Calculate the final grade for `student_id` and return a detailed breakdown.
 
+        Uses the running totals kept by `add_evaluation`, so the cost does not grow
+        with the number of evaluations (only the `details` listing does).
         Raises ValueError when there are no evaluations registered or weights sum to 0.
         """
-        sid = str(student_id)
-        evals = self._evaluations.get(sid, [])
-        if not evals:
+        sid = _key(student_id)
+        slot = self._index.get(sid)
+        if slot is None or not self._count[slot]:
             raise ValueError(f"No evaluations registered for student {sid}")
 
-        total_weight = sum(ev.weight for ev in evals)
+        result = self._finish(sid, self._total_weight[slot], self._weighted_sum[slot])
+        # Build details for RF05
+        result["details"] = {
+            "evaluations": list(self._evaluations(slot)),
+            "total_weight": self._total_weight[slot],
+            "weighted_sum": self._weighted_sum[slot],
+        }
+        return result
+
+    def _evaluations(self, slot: int) -> Iterator[Dict]:
+        position = self._first[slot]
+        while position >= 0:
+            yield {"score": self._scores[position], "weight": self._weights[position]}
+            position = self._next[position]
+
+    def calculate_from_totals(
+        self, student_id: str, total_weight: float, weighted_sum: float, evaluation_count: int
+    ) -> Dict:
+        """Finish the calculation from pre-aggregated totals (e.g. persisted or computed in SQL).
+
+        `total_weight` is the sum of weights and `weighted_sum` the sum of score * weight.
+        The result matches `calculate_final` except that `details` carries the evaluation
+        count instead of the individual evaluations.
+        """
+        sid = _key(student_id)
+        if evaluation_count <= 0:
+            raise ValueError(f"No evaluations registered for student {sid}")
+        if evaluation_count > self.max_evaluations:
+            raise ValueError(f"Maximum number of evaluations ({self.max_evaluations}) exceeded for student {sid}")
+
+        result = self._finish(sid, float(total_weight), float(weighted_sum))
+        result["details"] = totals_details(total_weight, weighted_sum, evaluation_count)
+        return result
+
+    def _finish(self, sid: str, total_weight: float, weighted_sum: float) -> Dict:
         if total_weight <= 0:
             raise ValueError("Total weight must be greater than 0")
 
         # Weighted average (normalize weights so they sum to 100 if they don't)
-        weighted_sum = sum(ev.score * ev.weight for ev in evals)
         weighted_average = weighted_sum / total_weight
 
         # Attendance penalty
@@ -110,22 +188,128 @@ class GradeCalculator:
         final_grade = weighted_average - attendance_penalty + extra_points
 
         # For determinism, round results to a sensible number of decimals
-        weighted_average = round(weighted_average, 4)
-        attendance_penalty = round(attendance_penalty, 4)
-        extra_points = round(extra_points, 4)
-        final_grade = round(final_grade, 4)
-
-        # Build details for RF05
-        details = {
-            "evaluations": [{"score": ev.score, "weight": ev.weight} for ev in evals],
-            "total_weight": total_weight,
-            "weighted_sum": weighted_sum,
-        }
-
         return {
-            "weighted_average": weighted_average,
-            "attendance_penalty": attendance_penalty,
-            "extra_points": extra_points,
-            "final_grade": final_grade,
-            "details": details,
+            "weighted_average": round(weighted_average, 4),
+            "attendance_penalty": round(attendance_penalty, 4),
+            "extra_points": round(extra_points, 4),
+            "final_grade": round(final_grade, 4),
         }
+
+    def calculate_many(
+        self,
+        student_ids: Sequence,
+        scores: Sequence[float],
+        weights: Sequence[float],
+        attendance: Optional[Mapping[str, bool]] = None,
+        *,
+        include_details: bool = True,
+    ) -> Dict[str, Dict]:
+        """Calculate final grades for many students at once from columnar inputs.
+
+        `student_ids`, `scores` and `weights` are parallel sequences with one entry per
+        evaluation. `attendance` maps student id to the attendance flag; students missing
+        from it fall back to `set_attendance` and then to True, as in `calculate_final`.
+
+        Returns a dict keyed by student id (as str) whose values are identical to what
+        `calculate_final` returns for the same evaluations. Raises ValueError when there are
+        no evaluations, a student exceeds `max_evaluations` or a student's weights sum to 0.
+        """
+        import numpy as np
+
+        ids = np.asarray(student_ids)
+        score_arr = np.asarray(scores, dtype=np.float64)
+        weight_arr = np.asarray(weights, dtype=np.float64)
+        if not (ids.shape == score_arr.shape == weight_arr.shape) or ids.ndim != 1:
+            raise ValueError("student_ids, scores and weights must be 1-D sequences of the same length")
+        if ids.size == 0:
+            raise ValueError("No evaluations registered")
+
+        keys, inverse, counts = np.unique(ids, return_inverse=True, return_counts=True)
+        sids = [str(k) for k in keys.tolist()]
+
+        too_many = np.flatnonzero(counts > self.max_evaluations)
+        if too_many.size:
+            raise ValueError(
+                f"Maximum number of evaluations ({self.max_evaluations}) exceeded for student {sids[too_many[0]]}"
+            )
+
+        # bincount accumulates in input order, exactly like the sequential sum() in calculate_final
+        total_weight = np.bincount(inverse, weights=weight_arr, minlength=len(sids))
+        weighted_sum = np.bincount(inverse, weights=score_arr * weight_arr, minlength=len(sids))
+        empty = np.flatnonzero(total_weight <= 0)
+        if empty.size:
+            raise ValueError(f"Total weight must be greater than 0 for student {sids[empty[0]]}")
+        weighted_average = weighted_sum / total_weight
+
+        attendance = attendance or {}
+        attended = np.array([attendance.get(sid, self._attendance.get(sid, True)) for sid in sids], dtype=bool)
+        penalty = np.where(attended, 0.0, float(self.attendance_penalty))
+        extra = np.array([float(self._get_extra_points(sid)) for sid in sids], dtype=np.float64)
+        final_grade = weighted_average - penalty + extra
+
+        if include_details:
+            order = np.argsort(inverse, kind="stable")
+            sorted_scores = score_arr[order].tolist()
+            sorted_weights = weight_arr[order].tolist()
+            bounds = np.concatenate(([0], np.cumsum(counts))).tolist()
+
+        results: Dict[str, Dict] = {}
+        columns = zip(
+            sids, weighted_average.tolist(), penalty.tolist(), extra.tolist(), final_grade.tolist(),
+            total_weight.tolist(), weighted_sum.tolist(),
+        )
+        for i, (sid, avg, pen, ext, fin, tw, ws) in enumerate(columns):
+            details = {"total_weight": tw, "weighted_sum": ws}
+            if include_details:
+                lo, hi = bounds[i], bounds[i + 1]
+                details = {
+                    "evaluations": [
+                        {"score": sc, "weight": w} for sc, w in zip(sorted_scores[lo:hi], sorted_weights[lo:hi])
+                    ],
+                    **details,
+                }
+            # Python's round() is used instead of np.round to keep the exact same results
+            results[sid] = {
+                "weighted_average": round(avg, 4),
+                "attendance_penalty": round(pen, 4),
+                "extra_points": round(ext, 4),
+                "final_grade": round(fin, 4),
+                "details": details,
+            }
+        return results
+
+
+def totals_details(total_weight: float, weighted_sum: float, evaluation_count: int) -> Dict:
+    """The `details` of a grade finished from totals (see `calculate_from_totals`)."""
+    return {
+        "evaluation_count": int(evaluation_count),
+        "total_weight": float(total_weight),
+        "weighted_sum": float(weighted_sum),
+    }
+
+
+def grade_evaluations(
+    student_id, attended: bool, evaluations: Iterable[Tuple[float, float]],
+    calculator: Optional[GradeCalculator] = None,
+) -> Dict:
+    """Final grade of one student from its (score, weight) pairs, as `calculate_final` returns it.
+
+    A shared `calculator` keeps the evaluations it is given, so pass one only when
+    each student is graded once with it. Raises ValueError like `calculate_final`.
+    """
+    calc = calculator if calculator is not None else GradeCalculator()
+    sid = _key(student_id)
+    for score, weight in evaluations:
+        calc.add_evaluation(sid, score, weight)
+    calc.set_attendance(sid, attended)
+    return calc.calculate_final(sid)
+
+
+def grade_totals(
+    student_id, attended: bool, total_weight: float, weighted_sum: float, evaluation_count: int,
+    calculator: Optional[GradeCalculator] = None,
+) -> Dict:
+    """Final grade of one student from its aggregated totals, as `calculate_from_totals` returns it."""
+    calc = calculator if calculator is not None else GradeCalculator()
+    calc.set_attendance(student_id, attended)
+    return calc.calculate_from_totals(student_id, total_weight, weighted_sum, evaluation_count)
@@ -0,0 +1,205 @@
+# src/application/recompute.py
+"""Term-end batch job: recompute every final grade and store it in `final_grades`.
+
+Students are split into keyset partitions of `partition_size` ids. The main
+process reads one partition at a time (students plus their evaluations) and hands
+it to a process pool that grades it with the same rules as `StudentService`; the
+results are written back in bulk, one transaction per partition. The student
+versions are read before the partition, and students written to since then are
+skipped: their grade was already refreshed by that write and is newer.
+
+Progress is checkpointed as the highest student id up to which every partition
+has been written, so an interrupted run resumes after it. Rewriting a partition
+is harmless (grades are upserted), so partitions that finished out of order are
+simply recomputed.
+
+Usage:
+  python -m src.application.recompute [--workers N] [--partition-size 5000]
+                                      [--checkpoint recompute.checkpoint.json] [--restart]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.domain.models import FinalGrade
+from src.domain.ports import StudentRepository, EvaluationRepository, FinalGradeRepository
+from src.application.grade_calculator import GradeCalculator, grade_evaluations
+
+# Compact, cheap-to-pickle partition payload: (id, attendance) and (student_id, score, weight)
+StudentRow = Tuple[int, bool]
+EvaluationRow = Tuple[int, float, float]
+
+
+def grade_partition(students: List[StudentRow], evaluations: List[EvaluationRow]) -> Tuple[List[FinalGrade], List[int]]:
+    """Grade one partition; returns the grades and the ids that could not be graded.
+
+    Runs in the worker processes, so it only takes and returns plain data.
+    """
+    grouped: Dict[int, List[Tuple[float, float]]] = {}
+    for sid, score, weight in evaluations:
+        grouped.setdefault(sid, []).append((score, weight))
+    calc = GradeCalculator()
+    grades, failed = [], []
+    for sid, attendance in students:
+        try:
+            result = grade_evaluations(sid, attendance, grouped.get(sid, ()), calc)
+        except ValueError:
+            failed.append(sid)
+            continue
+        grades.append(FinalGrade(
+            sid, result["weighted_average"], result["attendance_penalty"], result["extra_points"], result["final_grade"],
+        ))
+    return grades, failed
+
+
+def _read_checkpoint(path: Optional[str]) -> Optional[int]:
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["after_id"]
+
+
+def _write_checkpoint(path: Optional[str], after_id: int) -> None:
+    if not path:
+        return
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"after_id": after_id}, f)
+    os.replace(tmp, path)
+
+
+def _run_inline(fn, *args) -> Future:
+    future: Future = Future()
+    future.set_result(fn(*args))
+    return future
+
+
+def recompute_final_grades(
+    student_repo: StudentRepository,
+    evaluation_repo: EvaluationRepository,
+    final_grade_repo: FinalGradeRepository,
+    *,
+    workers: int = 1,
+    partition_size: int = 5000,
+    checkpoint: Optional[str] = None,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """Recompute and store the final grade of every student.
+
+    `workers` <= 1 grades in this process. Students that cannot be graded (e.g.
+    without evaluations) have their stored grade removed. Returns a summary with
+    the number of partitions, graded and failed students, and of students skipped
+    because they were written to while the partition was being graded.
+    """
+    if partition_size <= 0:
+        raise ValueError("partition_size debe ser positivo.")
+    after_id = _read_checkpoint(checkpoint)
+    started = time.perf_counter()
+    summary = {"partitions": 0, "graded": 0, "failed": 0, "skipped": 0, "resumed_after": after_id}
+    # Partitions in submission order as [first_id - 1 (cursor), last_id, done, versions read]
+    order: deque = deque()
+    pending: Dict[Future, list] = {}
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    exhausted = False
+
+    def submit_next() -> None:
+        nonlocal after_id, exhausted
+        page = student_repo.find_page(after_id, partition_size)
+        if not page:
+            exhausted = True
+            return
+        ids = [s.id for s in page]
+        # Read before the evaluations: a write in between shows up as a newer version
+        versions = student_repo.get_versions(ids)
+        grouped = evaluation_repo.find_by_student_ids(ids)
+        students = [(s.id, s.attendance) for s in page]
+        rows = [(ev.student_id, ev.score, ev.weight) for sid in ids for ev in grouped.get(sid, [])]
+        entry = [after_id, ids[-1], False, versions]
+        order.append(entry)
+        future = pool.submit(grade_partition, students, rows) if pool else _run_inline(grade_partition, students, rows)
+        pending[future] = entry
+        after_id = ids[-1]
+
+    try:
+        while True:
+            # Keep every worker busy with one partition queued behind it
+            while not exhausted and len(pending) < max(workers, 1) * 2:
+                submit_next()
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                entry = pending.pop(future)
+                grades, failed = future.result()
+                skipped = final_grade_repo.save_recomputed(grades, failed, entry[3])
+                entry[2] = True
+                summary["skipped"] += len(skipped)
+                summary["partitions"] += 1
+                summary["graded"] += len(grades)
+                summary["failed"] += len(failed)
+            watermark = None
+            while order and order[0][2]:
+                watermark = order.popleft()[1]
+            if watermark is not None:
+                _write_checkpoint(checkpoint, watermark)
+            if progress is not None:
+                elapsed = time.perf_counter() - started
+                progress({**summary, "elapsed_s": round(elapsed, 3),
+                          "students_per_s": round((summary["graded"] + summary["failed"]) / elapsed, 1)})
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    summary["elapsed_s"] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Recompute and store every final grade.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--partition-size", type=int, default=5000)
+    parser.add_argument("--checkpoint", default="recompute.checkpoint.json",
+                        help="progress file; an existing one resumes the previous run")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args(argv)
+    if args.restart and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+    # Composition root for the batch job
+    from src.infrastructure.config import SessionLocal
+    from src.infrastructure.adapters.database import (
+        SQLAlchemyStudentRepository, SQLAlchemyEvaluationRepository, SQLAlchemyFinalGradeRepository,
+    )
+
+    def report(stats: dict) -> None:
+        print(
+            f"[recompute] {stats['partitions']} partitions, {stats['graded']} graded, "
+            f"{stats['failed']} without grade, {stats['students_per_s']} students/s",
+            file=sys.stderr,
+        )
+
+    session = SessionLocal()
+    try:
+        summary = recompute_final_grades(
+            SQLAlchemyStudentRepository(session),
+            SQLAlchemyEvaluationRepository(session),
+            SQLAlchemyFinalGradeRepository(session),
+            workers=args.workers,
+            partition_size=args.partition_size,
+            checkpoint=args.checkpoint,
+            progress=report,
+        )
+    finally:
+        session.close()
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,61 @@
 # src/application/services.py
 
-from typing import List
-from src.domain.models import Student, Evaluation
-from src.domain.ports import StudentRepository, EvaluationRepository
-from src.application.grade_calculator import GradeCalculator
+import bisect
+import math
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from src.domain.models import Student, Evaluation, EvaluationTotals, FinalGrade, RankedGrade
+from src.domain.ports import StudentRepository, EvaluationRepository, FinalGradeRepository, GradeCache
+from src.application.grade_calculator import GradeCalculator, grade_evaluations, grade_totals, totals_details
 
+# Bounds for the histogram of `distribucion_notas`
+MIN_BUCKET_WIDTH = 0.01
+MAX_BUCKETS = 1000
 
 class StudentService:
-    def __init__(self, student_repo: StudentRepository, evaluation_repo: EvaluationRepository):
+    def __init__(
+        self,
+        student_repo: StudentRepository,
+        evaluation_repo: EvaluationRepository,
+        grade_cache: Optional[GradeCache] = None,
+        final_grade_repo: Optional[FinalGradeRepository] = None,
+    ):
         self.student_repo = student_repo
         self.evaluation_repo = evaluation_repo
+        # Optional cache of grade results; every write that affects a grade invalidates it
+        self.grade_cache = grade_cache
+        # Optional materialized grades, kept current by the repositories on every write
+        self.final_grade_repo = final_grade_repo
         # Use the grade calculator for business rules (defaults from implementation)
         self.calculator = GradeCalculator()
 
     def listar_estudiantes(self) -> List[Student]:
         return self.student_repo.get_all()
 
+    def listar_estudiantes_pagina(
+        self, after_id: Optional[int] = None, limit: int = 100
+    ) -> Tuple[List[Student], Optional[int]]:
+        """Keyset-paginated listing ordered by id.
+
+        Returns the page and the cursor for the next one (None on the last page).
+        """
+        if limit <= 0:
+            raise ValueError("El límite debe ser mayor que 0.")
+        page = self.student_repo.find_page(after_id, limit + 1)
+        if len(page) > limit:
+            page = page[:limit]
+            return page, page[-1].id
+        return page, None
+
+    def iterar_estudiantes(self, batch_size: int = 1000) -> Iterator[Student]:
+        """Stream every student without materializing the whole listing."""
+        return self.student_repo.iter_all(batch_size)
+
+    def version_estudiante(self, student_id: int) -> Optional[int]:
+        return self.student_repo.get_version(student_id)
+
+    def version_estudiantes(self) -> Optional[int]:
+        return self.student_repo.get_collection_version()
+
     def crear_estudiante(self, code: str, nombre: str, attendance: bool = True) -> Student:
         if not code or not nombre:
             raise ValueError("El código y el nombre del estudiante no pueden estar vacíos.")
@@ -28,33 +68,247 @@ class StudentService:
         if not student:
             raise ValueError("El estudiante no existe.")
         eval_obj = Evaluation(id=None, student_id=student_id, score=float(score), weight=float(weight))
-        return self.evaluation_repo.save(eval_obj)
+        saved = self.evaluation_repo.save(eval_obj)
+        self._invalidar_nota(student_id)
+        return saved
+
+    def importar_evaluaciones(self, rows: Iterable[Dict[str, Any]]) -> dict:
+        """Bulk-import evaluations from dicts with `student_id`, `score` and `weight`.
+
+        Students are validated with one set-based lookup, the per-student maximum of
+        evaluations is enforced against the existing counts, and all valid rows are
+        inserted in a single transaction. Invalid rows are reported, not inserted.
+        Returns {"created": [Evaluation], "errors": [{"row": i, "error": msg}]}.
+        """
+        errors = []
+        parsed = []
+        for i, row in enumerate(rows):
+            try:
+                parsed.append((i, int(row['student_id']), float(row['score']), float(row['weight'])))
+            except KeyError as e:
+                errors.append({"row": i, "error": f"Falta el campo {e}."})
+            except (TypeError, ValueError):
+                errors.append({"row": i, "error": "student_id, score y weight deben ser numéricos."})
+
+        ids = list({sid for _, sid, _, _ in parsed})
+        existing = {s.id for s in self.student_repo.find_by_ids(ids)}
+        counts = self.evaluation_repo.count_by_student_ids(list(existing))
+        max_evaluations = self.calculator.max_evaluations
+
+        accepted = []
+        for i, sid, score, weight in parsed:
+            if sid not in existing:
+                errors.append({"row": i, "error": "El estudiante no existe."})
+            elif counts[sid] >= max_evaluations:
+                errors.append({"row": i, "error": f"Máximo de evaluaciones ({max_evaluations}) alcanzado."})
+            else:
+                counts[sid] += 1
+                accepted.append(Evaluation(id=None, student_id=sid, score=score, weight=weight))
+
+        created = self.evaluation_repo.save_many(accepted)
+        for sid in {ev.student_id for ev in created}:
+            self._invalidar_nota(sid)
+        errors.sort(key=lambda e: e["row"])
+        return {"created": created, "errors": errors}
 
     def set_attendance(self, student_id: int, reached: bool) -> Student:
         student = self.student_repo.find_by_id(student_id)
         if not student:
             raise ValueError("El estudiante no existe.")
         student.attendance = bool(reached)
-        return self.student_repo.save(student)
+        saved = self.student_repo.save(student)
+        self._invalidar_nota(student_id)
+        return saved
 
-    def calcular_nota_final(self, student_id: int) -> dict:
-        student = self.student_repo.find_by_id(student_id)
-        if not student:
-            raise ValueError("El estudiante no existe.")
+    def calcular_nota_final(
+        self, student_id: int, include_details: bool = True, version: Optional[int] = None
+    ) -> dict:
+        """Final grade breakdown of a student.
+
+        With `include_details=False` the stored grade of `final_grade_repo` is returned
+        when there is one (a single primary-key read); otherwise the grade is finished
+        from the persisted running totals. Either way `details` carries the totals
+        instead of the individual evaluations. Results are served from `grade_cache` when one is configured,
+        as long as they were computed at the student's current version. A caller that has
+        just read that version (e.g. for an ETag) passes it as `version` to skip the lookup.
+        """
+        if self.grade_cache is not None:
+            # Read before computing: a concurrent write can only make the entry look older
+            if version is None:
+                version = self.student_repo.get_version(student_id)
+            cached = self.grade_cache.get(student_id, include_details, version)
+            if cached is not None:
+                return cached
+
+        stored = None
+        if not include_details and self.final_grade_repo is not None:
+            stored = self.final_grade_repo.find_with_totals(student_id)
+        if stored is not None:
+            grade, totals = stored
+            result = {
+                "weighted_average": grade.weighted_average,
+                "attendance_penalty": grade.attendance_penalty,
+                "extra_points": grade.extra_points,
+                "final_grade": grade.final_grade,
+                "details": totals_details(totals.total_weight, totals.weighted_sum, totals.evaluation_count),
+            }
+        else:
+            student = self.student_repo.find_by_id(student_id)
+            if not student:
+                raise ValueError("El estudiante no existe.")
+            if include_details:
+                result = calcular_nota(student, self.evaluation_repo.find_by_student_id(student_id))
+            else:
+                result = calcular_nota_desde_totales(student, self.evaluation_repo.get_totals(student_id))
+
+        if self.grade_cache is not None:
+            self.grade_cache.set(student_id, include_details, result, version)
+        return result
+
+    def calcular_notas_finales(
+        self, student_ids: Optional[List[int]] = None, include_details: bool = True
+    ) -> List[dict]:
+        """Compute the grade breakdown of many students with a constant number of queries.
+
+        When `student_ids` is None the whole cohort is graded. Unknown students and
+        students whose grade cannot be computed get an `error` entry instead.
+        With `include_details=False` the aggregation is pushed down to the repository
+        (`aggregate_by_student`) and no evaluation rows are loaded.
+        """
+        if student_ids is None:
+            students = self.student_repo.get_all()
+            student_ids = [s.id for s in students]
+        else:
+            # A shared calculator accumulates per student, so each id is graded once
+            student_ids = list(dict.fromkeys(student_ids))
+            students = self.student_repo.find_by_ids(student_ids)
+        by_id = {s.id: s for s in students}
+        if not include_details:
+            totals = self.evaluation_repo.aggregate_by_student(list(by_id))
+            return calcular_notas_desde_totales(student_ids, by_id, totals)
+        evaluations = self.evaluation_repo.find_by_student_ids(list(by_id))
+        return calcular_notas(student_ids, by_id, evaluations)
 
-        evaluations = self.evaluation_repo.find_by_student_id(student_id)
-        # Configure calculator for this student
-        # Clear calculator internal state by creating a temporary one to ensure determinism
-        calc = GradeCalculator()
-        calc.set_all_years_teachers(False)
+    # Cohort statistics. They read the materialized grades, which the repositories keep
+    # in line with GradeCalculator's rules (penalties and extra points included).
 
-        # Add evaluations to calculator
-        sid = str(student_id)
-        for ev in evaluations:
-            calc.add_evaluation(sid, ev.score, ev.weight)
+    def ranking(self, limit: int = 10) -> List[RankedGrade]:
+        """The `limit` best final grades, best first."""
+        if limit <= 0:
+            raise ValueError("limit debe ser positivo.")
+        return self._notas_materializadas().top(limit)
 
-        # Set attendance in calculator
-        calc.set_attendance(sid, student.attendance)
+    def posicion_estudiante(self, student_id: int) -> RankedGrade:
+        ranked = self._notas_materializadas().rank_of(student_id)
+        if ranked is None:
+            raise ValueError("El estudiante no tiene nota final.")
+        return ranked
 
-        # Compute and return result
-        return calc.calculate_final(sid)
\ No newline at end of file
+    def estudiantes_bajo_nota(self, umbral: float) -> List[FinalGrade]:
+        """Students whose final grade is strictly below `umbral`, lowest first."""
+        return self._notas_materializadas().below(umbral)
+
+    def distribucion_notas(
+        self, ancho: float = 1.0, percentiles: Iterable[float] = (25, 50, 75, 90)
+    ) -> dict:
+        """Summary, percentiles (linear interpolation) and histogram of the cohort's final grades.
+
+        Histogram buckets are half-open [from, to) of width `ancho`, aligned to multiples of it.
+        The width must be at least MIN_BUCKET_WIDTH and yield at most MAX_BUCKETS buckets.
+        """
+        if not math.isfinite(ancho) or ancho < MIN_BUCKET_WIDTH:
+            raise ValueError(f"El ancho de los intervalos debe ser al menos {MIN_BUCKET_WIDTH:g}.")
+        percentiles = list(percentiles)
+        if any(not 0 <= p <= 100 for p in percentiles):
+            raise ValueError("Los percentiles deben estar entre 0 y 100.")
+        grades = self._notas_materializadas().sorted_grades()
+        if not grades:
+            return {"count": 0, "min": None, "max": None, "mean": None, "percentiles": {}, "histogram": []}
+
+        def percentile(p: float) -> float:
+            pos = (len(grades) - 1) * p / 100
+            lo = math.floor(pos)
+            hi = min(lo + 1, len(grades) - 1)
+            return round(grades[lo] + (grades[hi] - grades[lo]) * (pos - lo), 2)
+
+        # Edges are first * ancho, (first + 1) * ancho, ... so rounding errors do not accumulate
+        first = math.floor(grades[0] / ancho)
+        buckets = math.floor(grades[-1] / ancho) - first + 1
+        if buckets > MAX_BUCKETS:
+            raise ValueError(f"El ancho {ancho:g} genera más de {MAX_BUCKETS} intervalos.")
+        histogram = []
+        lo = 0
+        for k in range(first, first + buckets):
+            start, end = k * ancho, (k + 1) * ancho
+            hi = bisect.bisect_left(grades, end, lo) if k < first + buckets - 1 else len(grades)
+            histogram.append({"from": round(start, 6), "to": round(end, 6), "count": hi - lo})
+            lo = hi
+        return {
+            "count": len(grades),
+            "min": grades[0],
+            "max": grades[-1],
+            "mean": round(math.fsum(grades) / len(grades), 2),
+            "percentiles": {f"p{p:g}": percentile(p) for p in percentiles},
+            "histogram": histogram,
+        }
+
+    def _notas_materializadas(self) -> FinalGradeRepository:
+        if self.final_grade_repo is None:
+            raise ValueError("Las notas finales materializadas no están configuradas.")
+        return self.final_grade_repo
+
+    def _invalidar_nota(self, student_id: int) -> None:
+        if self.grade_cache is not None:
+            self.grade_cache.invalidate(student_id)
+
+
+# Grading of domain objects without any I/O, shared by every façade over the same rules
+# (e.g. the async one); the arithmetic itself lives in `grade_calculator`.
+
+def calcular_nota(student: Student, evaluations: List[Evaluation], calc: Optional[GradeCalculator] = None) -> dict:
+    return grade_evaluations(student.id, student.attendance, ((ev.score, ev.weight) for ev in evaluations), calc)
+
+
+def calcular_nota_desde_totales(
+    student: Student, totals: Optional[EvaluationTotals], calc: Optional[GradeCalculator] = None
+) -> dict:
+    if totals is None:
+        return grade_totals(student.id, student.attendance, 0.0, 0.0, 0, calc)
+    return grade_totals(
+        student.id, student.attendance, totals.total_weight, totals.weighted_sum, totals.evaluation_count, calc
+    )
+
+
+def calcular_notas(
+    student_ids: List[int], by_id: Dict[int, Student], evaluations: Dict[int, List[Evaluation]]
+) -> List[dict]:
+    """Grade `student_ids` in order; unknown or ungradable students get an `error` entry."""
+    # A shared calculator accumulates per student, so callers pass each id once
+    calc = GradeCalculator()
+    return _calcular_lote(student_ids, by_id, lambda st: calcular_nota(st, evaluations.get(st.id, []), calc))
+
+
+def calcular_notas_desde_totales(
+    student_ids: List[int], by_id: Dict[int, Student], totals: Dict[int, EvaluationTotals]
+) -> List[dict]:
+    """Like `calcular_notas`, finishing each grade from its aggregated totals."""
+    calc = GradeCalculator()
+    return _calcular_lote(student_ids, by_id, lambda st: calcular_nota_desde_totales(st, totals.get(st.id), calc))
+
+
+def _calcular_lote(
+    student_ids: List[int], by_id: Dict[int, Student], calcular: Callable[[Student], dict]
+) -> List[dict]:
+    results = []
+    for sid in student_ids:
+        student = by_id.get(sid)
+        if not student:
+            results.append({"student_id": sid, "error": "El estudiante no existe."})
+            continue
+        try:
+            result = calcular(student)
+        except ValueError as e:
+            results.append({"student_id": sid, "error": str(e)})
+            continue
+        results.append({"student_id": sid, **result})
+    return results
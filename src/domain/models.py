@@ -15,4 +15,32 @@ class Evaluation:
     id: int
     student_id: int
     score: float
-    weight: float
\ No newline at end of file
+    weight: float
+
+@dataclass
+class EvaluationTotals:
+    # Aggregates of a student's evaluations, enough to compute the final grade
+    student_id: int
+    evaluation_count: int
+    total_weight: float
+    weighted_sum: float
+
+@dataclass
+class FinalGrade:
+    # Materialized result of GradeCalculator.calculate_final for a student
+    student_id: int
+    weighted_average: float
+    attendance_penalty: float
+    extra_points: float
+    final_grade: float
+
+
+@dataclass
+class RankedGrade:
+    # Position of a student's final grade within the cohort
+    rank: int             # 1 = best grade; ties share the rank
+    # SQL percent_rank() x 100: % of the *other* graded students with a strictly lower grade,
+    # i.e. (students below) / (graded - 1); 100 for a sole best grade, 0 for the lowest or a lone student
+    percentile: float
+    student_id: int
+    final_grade: float
@@ -1,8 +1,8 @@
 # src/domain/ports.py
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from .models import Student, Evaluation
+from typing import Dict, Iterator, List, Optional, Tuple
+from .models import Student, Evaluation, EvaluationTotals, FinalGrade, RankedGrade
 
 
 # Repository port for Students
@@ -20,6 +20,38 @@ class StudentRepository(ABC):
     def save(self, student: Student) -> Student:
         pass
 
+    def find_by_ids(self, student_ids: List[int]) -> List[Student]:
+        # Default fallback; adapters should override it with a single set-based query.
+        found = (self.find_by_id(sid) for sid in student_ids)
+        return [s for s in found if s is not None]
+
+    def find_by_code(self, code: str) -> Optional[Student]:
+        # Default fallback; adapters should look the (unique) code up directly.
+        return next((s for s in self.get_all() if s.code == code), None)
+
+    def find_page(self, after_id: Optional[int], limit: int) -> List[Student]:
+        """Keyset page: up to `limit` students with id > `after_id`, ordered by id."""
+        students = sorted(self.get_all(), key=lambda s: s.id)
+        return [s for s in students if after_id is None or s.id > after_id][:limit]
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[Student]:
+        """Iterate over every student ordered by id; adapters should stream in batches."""
+        return iter(sorted(self.get_all(), key=lambda s: s.id))
+
+    # Change counters for HTTP caching. None means "not tracked" (no ETag is emitted).
+
+    def get_version(self, student_id: int) -> Optional[int]:
+        """Version of the student, bumped on every change to it or to its evaluations."""
+        return None
+
+    def get_collection_version(self) -> Optional[int]:
+        """Version of the student listing, bumped whenever a student is created or updated."""
+        return None
+
+    def get_versions(self, student_ids: List[int]) -> Dict[int, Optional[int]]:
+        # Default fallback; adapters should read every version with one query.
+        return {sid: self.get_version(sid) for sid in student_ids}
+
 
 # Repository port for Evaluations
 class EvaluationRepository(ABC):
@@ -30,4 +62,159 @@ class EvaluationRepository(ABC):
 
     @abstractmethod
     def save(self, evaluation: Evaluation) -> Evaluation:
-        pass
\ No newline at end of file
+        pass
+
+    def find_by_student_ids(self, student_ids: List[int]) -> Dict[int, List[Evaluation]]:
+        # Default fallback; adapters should override it with a single set-based query.
+        return {sid: self.find_by_student_id(sid) for sid in student_ids}
+
+    def count_by_student_ids(self, student_ids: List[int]) -> Dict[int, int]:
+        # Default fallback; adapters should answer this with a single set-based query.
+        return {sid: len(evs) for sid, evs in self.find_by_student_ids(student_ids).items()}
+
+    def save_many(self, evaluations: List[Evaluation]) -> List[Evaluation]:
+        # Default fallback; adapters should insert everything in one transaction.
+        return [self.save(ev) for ev in evaluations]
+
+    def get_totals(self, student_id: int) -> Optional[EvaluationTotals]:
+        # Default fallback; adapters should read persisted aggregates instead of scanning.
+        return _totals(student_id, self.find_by_student_id(student_id))
+
+    def aggregate_by_student(self, student_ids: List[int]) -> Dict[int, EvaluationTotals]:
+        """Per-student COUNT, SUM(weight) and SUM(score * weight), computed where the data lives.
+
+        Students without evaluations are left out of the result.
+        """
+        grouped = self.find_by_student_ids(student_ids)
+        aggregated = {sid: _totals(sid, evs) for sid, evs in grouped.items()}
+        return {sid: totals for sid, totals in aggregated.items() if totals is not None}
+
+
+def _totals(student_id: int, evaluations: List[Evaluation]) -> Optional[EvaluationTotals]:
+    # Sums in evaluation order, like GradeCalculator's running totals
+    if not evaluations:
+        return None
+    total_weight = weighted_sum = 0.0
+    for ev in evaluations:
+        total_weight += ev.weight
+        weighted_sum += ev.score * ev.weight
+    return EvaluationTotals(student_id, len(evaluations), total_weight, weighted_sum)
+
+
+# Repository port for materialized final grades
+class FinalGradeRepository(ABC):
+
+    @abstractmethod
+    def find_by_student_id(self, student_id: int) -> Optional[FinalGrade]:
+        pass
+
+    @abstractmethod
+    def find_with_totals(self, student_id: int) -> Optional[Tuple[FinalGrade, EvaluationTotals]]:
+        """The stored grade together with the evaluation totals it was computed from."""
+
+    @abstractmethod
+    def save_many(self, grades: List[FinalGrade]) -> None:
+        """Insert or replace the grades of the given students."""
+
+    @abstractmethod
+    def delete_many(self, student_ids: List[int]) -> None:
+        """Drop the grades of students that can no longer be graded."""
+
+    @abstractmethod
+    def save_recomputed(
+        self, grades: List[FinalGrade], removed: List[int], versions: Dict[int, Optional[int]]
+    ) -> List[int]:
+        """Store a batch recomputation in one transaction: upsert `grades`, drop `removed`.
+
+        `versions` are the student versions the recomputation read. Students whose
+        version changed since (their grade was refreshed by a later write) are left
+        untouched; their ids are returned.
+        """
+
+    @abstractmethod
+    def top(self, limit: int) -> List[RankedGrade]:
+        """The `limit` best grades, best first (ties ordered by student id)."""
+
+    @abstractmethod
+    def rank_of(self, student_id: int) -> Optional[RankedGrade]:
+        pass
+
+    @abstractmethod
+    def below(self, threshold: float) -> List[FinalGrade]:
+        """Grades strictly below `threshold`, lowest first."""
+
+    @abstractmethod
+    def sorted_grades(self) -> List[float]:
+        """Every final grade of the cohort in ascending order."""
+
+
+# Async counterparts of the repository ports, for asyncio-based adapters
+class AsyncStudentRepository(ABC):
+
+    @abstractmethod
+    async def find_by_id(self, student_id: int) -> Optional[Student]:
+        pass
+
+    @abstractmethod
+    async def find_by_ids(self, student_ids: List[int]) -> List[Student]:
+        pass
+
+    @abstractmethod
+    async def get_all(self) -> List[Student]:
+        pass
+
+    @abstractmethod
+    async def save(self, student: Student) -> Student:
+        pass
+
+    async def get_version(self, student_id: int) -> Optional[int]:
+        """Version of the student, bumped on every change to it or to its evaluations."""
+        return None
+
+    async def get_collection_version(self) -> Optional[int]:
+        """Version of the student listing, bumped whenever a student is created or updated."""
+        return None
+
+
+class AsyncEvaluationRepository(ABC):
+
+    @abstractmethod
+    async def find_by_student_id(self, student_id: int) -> List[Evaluation]:
+        pass
+
+    @abstractmethod
+    async def find_by_student_ids(self, student_ids: List[int]) -> Dict[int, List[Evaluation]]:
+        pass
+
+    @abstractmethod
+    async def get_totals(self, student_id: int) -> Optional[EvaluationTotals]:
+        pass
+
+    @abstractmethod
+    async def save(self, evaluation: Evaluation) -> Evaluation:
+        pass
+
+
+# Port for caching computed grade breakdowns. An in-process implementation lives in the
+# infrastructure layer; a shared cache (e.g. Redis) can implement the same interface.
+class GradeCache(ABC):
+
+    @abstractmethod
+    def get(self, student_id: int, detailed: bool, version: Optional[int] = None) -> Optional[dict]:
+        """The cached result, unless it was stored for a different student `version`."""
+
+    @abstractmethod
+    def set(self, student_id: int, detailed: bool, result: dict, version: Optional[int] = None) -> None:
+        """Store `result`, computed when the student was at `version`."""
+
+    @abstractmethod
+    def invalidate(self, student_id: int) -> None:
+        """Drop every cached variant of the student's grade."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Counters such as hits, misses and evictions, for exporting as metrics."""
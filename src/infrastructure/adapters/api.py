@@ -1,39 +1,323 @@
 # src/infrastructure/adapters/api.py
+"""Flask inbound adapter.
+
+`create_app(config)` builds an application; `config` overrides the settings of
+`src.infrastructure.config` by name (e.g. {"DATABASE_URL": ..., "GRADE_CACHE_SIZE": 0}).
+The database engine is only created when the first request needs a session.
+`app` is the application built from the environment, for `python api.py` and WSGI servers.
+"""
+import atexit
+import csv
+import hashlib
+import io
 import os
-from flask import Flask, jsonify, request
+from functools import wraps
+from typing import Any, Callable, Mapping, Optional
+from flask import Blueprint, Flask, Response, current_app, g, jsonify, request, stream_with_context
 from flask_cors import CORS
-from flask_jwt_extended import create_access_token, jwt_required, JWTManager
+from flask_jwt_extended import create_access_token, verify_jwt_in_request, JWTManager
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 from src.application.services import StudentService
-from src.application.mappers import StudentMapper, EvaluationMapper
-from src.infrastructure.adapters.database import SQLAlchemyStudentRepository, SQLAlchemyEvaluationRepository
-from src.infrastructure.config import SessionLocal
+from src.infrastructure.adapters.database import (
+    SQLAlchemyStudentRepository, SQLAlchemyEvaluationRepository, SQLAlchemyFinalGradeRepository,
+)
+from src.infrastructure.adapters.cache import InMemoryGradeCache
+from src.infrastructure.adapters.group_commit import GroupCommitEvaluationRepository, GroupCommitWriter
+from src.infrastructure.adapters.read_model import (
+    GradebookReadModel, ReadModelEvaluationRepository, ReadModelFinalGradeRepository, ReadModelLoader,
+    ReadModelStudentRepository,
+)
+from src.infrastructure.adapters.json_provider import FastJSONProvider, TimedJSONProvider
+from src.infrastructure.adapters.token_cache import VerifiedTokenCache
+from src.infrastructure import config as settings
+from src.infrastructure.metrics import REGISTRY, PROMETHEUS_CONTENT_TYPE
+from src.infrastructure.pool_metrics import checkout_connection, pool_status
+from src.infrastructure.instrumentation import (
+    Timed, current_request, finish_request, span, start_request,
+)
+
+# Settings read from src.infrastructure.config into app.config; create_app's `config` overrides them
+SETTINGS = (
+    "DATABASE_URL", "JWT_SECRET_KEY", "JWT_CACHE_SIZE", "JWT_CACHE_TTL", "GRADE_CACHE_SIZE", "GRADE_CACHE_TTL",
+    "N_PLUS_ONE_THRESHOLD", "FAST_JSON", "PASSING_GRADE", "EVALUATION_WRITE_BEHIND", "GROUP_COMMIT_MAX_BATCH",
+    "GROUP_COMMIT_MAX_DELAY_MS", "EVALUATION_DURABILITY", "READ_MODEL", "READ_MODEL_SNAPSHOT", "READ_MODEL_REFRESH_S",
+)
+
+bp = Blueprint('gradebook', __name__)
+
+
+def create_app(config: Optional[Mapping[str, Any]] = None) -> Flask:
+    app = Flask(__name__)
+    app.config.from_mapping({name: getattr(settings, name) for name in SETTINGS})
+    app.config.update(config or {})
+
+    # Responses are built straight from the domain dataclasses; FAST_JSON picks orjson when installed
+    app.json = FastJSONProvider(app) if app.config["FAST_JSON"] else TimedJSONProvider(app)
+    # Allow CORS for API endpoints and include Authorization header for JWT
+    CORS(app, resources={r"/api/*": {"origins": "*"}}, allow_headers=["Content-Type", "Authorization"])
+    JWTManager(app)
+
+    # --- Composition Root ---
+    # Aquí es donde "unimos" las piezas: creamos instancias concretas y las inyectamos.
+    # La base de datos por defecto se comparte; otra URL tiene su propio motor (perezoso).
+    url = app.config["DATABASE_URL"]
+    app.extensions["database"] = settings.database if url == settings.DATABASE_URL else settings.Database(url)
+    # La caché de notas vive lo que vive la aplicación y se comparte entre peticiones.
+    cache_size = app.config["GRADE_CACHE_SIZE"]
+    grade_cache = InMemoryGradeCache(cache_size, app.config["GRADE_CACHE_TTL"]) if cache_size > 0 else None
+    app.extensions["grade_cache"] = grade_cache
+    if grade_cache is not None:
+        for name in ("hits", "misses", "evictions", "expirations", "invalidations", "stale"):
+            REGISTRY.counter(
+                f"grade_cache_{name}_total", f"Grade cache {name}",
+                callback=lambda name=name: grade_cache.stats()[name],
+            )
+        REGISTRY.gauge("grade_cache_size", "Students in the grade cache", callback=lambda: grade_cache.stats()["size"])
+    # Tokens ya verificados: evita comprobar la firma HMAC en cada petición del mismo token
+    token_cache = (
+        VerifiedTokenCache(app.config["JWT_CACHE_SIZE"], app.config["JWT_CACHE_TTL"])
+        if app.config["JWT_CACHE_SIZE"] > 0 else None
+    )
+    app.extensions["token_cache"] = token_cache
+    if token_cache is not None:
+        for name in ("hits", "misses", "evictions", "expirations"):
+            REGISTRY.counter(
+                f"jwt_cache_{name}_total", f"Verified token cache {name}",
+                callback=lambda name=name: token_cache.stats()[name],
+            )
+    # Inserciones de evaluaciones agrupadas en un hilo de fondo; lo pendiente se confirma al salir
+    writer = None
+    if app.config["EVALUATION_WRITE_BEHIND"]:
+        writer = GroupCommitWriter(
+            app.extensions["database"].session,
+            max_batch=app.config["GROUP_COMMIT_MAX_BATCH"],
+            max_delay=app.config["GROUP_COMMIT_MAX_DELAY_MS"] / 1000,
+            durability=app.config["EVALUATION_DURABILITY"],
+        )
+        atexit.register(writer.close)
+    app.extensions["evaluation_writer"] = writer
+    # Lecturas de estudiantes y evaluaciones desde memoria; se carga con la primera petición
+    read_model = None
+    if app.config["READ_MODEL"]:
+        read_model = ReadModelLoader(
+            GradebookReadModel(), app.extensions["database"].session,
+            snapshot=app.config["READ_MODEL_SNAPSHOT"], refresh_interval=app.config["READ_MODEL_REFRESH_S"],
+        )
+        REGISTRY.gauge("read_model_students", "Students in the read model",
+                       callback=lambda: read_model.model.stats()["students"])
+        REGISTRY.gauge("read_model_evaluations", "Evaluations in the read model",
+                       callback=lambda: read_model.model.stats()["evaluations"])
+    app.extensions["read_model"] = read_model
+
+    # Per-request timing: total latency, spans per layer and SQL statements (see instrumentation.py)
+    app.before_request(start_request_stats)
+    app.after_request(record_response_status)
+    app.teardown_request(finish_request_stats)
+    app.teardown_appcontext(close_db_session)
+    app.register_blueprint(bp)
+    return app
+
+
+def start_request_stats():
+    start_request(request.url_rule.rule if request.url_rule else '<unmatched>', request.method)
+
+
+def record_response_status(response):
+    stats = current_request()
+    if stats is not None:
+        stats.status = response.status_code
+    return response
+
 
-app = Flask(__name__)
-# Allow CORS for API endpoints and include Authorization header for JWT
-CORS(app, resources={r"/api/*": {"origins": "*"}}, allow_headers=["Content-Type", "Authorization"]) 
+def finish_request_stats(exc):
+    # Runs after streamed bodies are exhausted, so their queries are counted as well
+    finish_request(current_app.config["N_PLUS_ONE_THRESHOLD"])
+
+
+# Where flask_jwt_extended keeps the verified token of the request (read by get_jwt() & co.)
+_JWT_CONTEXT = ("_jwt_extended_jwt_header", "_jwt_extended_jwt", "_jwt_extended_jwt_user", "_jwt_extended_jwt_location")
+
+
+def verify_jwt():
+    """flask_jwt_extended's verification, skipped for bearer tokens found in the token cache.
+
+    A hit restores the request context flask_jwt_extended would have set, so get_jwt()
+    and friends behave the same either way.
+    """
+    token_cache = current_app.extensions["token_cache"]
+    header = request.headers.get("Authorization", "")
+    if token_cache is None or not header.startswith("Bearer "):
+        verify_jwt_in_request()
+        return
+    token = header[len("Bearer "):]
+    verified = token_cache.get(token)
+    if verified is not None:
+        for name, value in zip(_JWT_CONTEXT, verified):
+            setattr(g, name, value)
+        return
+    verify_jwt_in_request()
+    token_cache.set(token, g._jwt_extended_jwt.get("exp"), tuple(g.get(name) for name in _JWT_CONTEXT))
+
+
+def jwt_required():
+    """Token check (through the verified token cache), timed as the `jwt` span of the request."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span("jwt"):
+                verify_jwt()
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_grade_cache():
+    return current_app.extensions["grade_cache"]
+
+
+def get_db_session(checkout: bool = True):
+    """One session per request, created lazily and closed by `close_db_session`.
+
+    With `checkout` the pooled connection is acquired right away (and the wait
+    recorded); without it the session only takes one when it first runs a statement.
+    """
+    session = g.get('db_session')
+    if session is None:
+        with span("session"):
+            session = g.db_session = current_app.extensions["database"].session()
+            if checkout:
+                checkout_connection(session)
+    return session
+
+
+def close_db_session(exc):
+    session = g.pop('db_session', None)
+    if session is not None:
+        session.close()
 
-app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", "super-secret-key-for-dev") # Una clave por defecto para desarrollo
-jwt = JWTManager(app)
 
-# --- Composition Root ---
-# Aquí es donde "unimos" las piezas: creamos instancias concretas y las inyectamos.
 def get_student_service():
-    session = SessionLocal()
+    read_model = current_app.extensions["read_model"]
+    # Reads served from the read model never touch the pool; writes and fallbacks connect on first use
+    session = get_db_session(checkout=read_model is None)
+    grade_cache = get_grade_cache()
     student_repo = SQLAlchemyStudentRepository(session)
     evaluation_repo = SQLAlchemyEvaluationRepository(session)
-    return StudentService(student_repo, evaluation_repo)
+    final_grade_repo = SQLAlchemyFinalGradeRepository(session)
+    writer = current_app.extensions["evaluation_writer"]
+    if writer is not None:
+        evaluation_repo = GroupCommitEvaluationRepository(evaluation_repo, writer)
+    if read_model is not None:
+        model = read_model.ensure_current()
+        evaluation_repo = ReadModelEvaluationRepository(model, evaluation_repo, student_repo)
+        student_repo = ReadModelStudentRepository(model, student_repo)
+        final_grade_repo = ReadModelFinalGradeRepository(model, final_grade_repo)
+    # The proxies time each port call; the calculator's share is what is left of the service span
+    student_repo = Timed(student_repo, "student_repo")
+    evaluation_repo = Timed(evaluation_repo, "evaluation_repo")
+    final_grade_repo = Timed(final_grade_repo, "final_grade_repo")
+    cache = Timed(grade_cache, "grade_cache") if grade_cache is not None else None
+    return Timed(StudentService(student_repo, evaluation_repo, cache, final_grade_repo), "service")
 # --- Fin Composition Root ---
 
 
-@app.route('/api/students', methods=['GET'])
+def etag_cached(make_etag: Callable[..., Optional[str]]):
+    """Conditional GET: answer a matching If-None-Match with 304 before the view runs.
+
+    `make_etag(service, **view_args)` returns the strong ETag of the representation from
+    the version counters (a cheap lookup), or None when the resource is not versioned.
+    The view's 200 responses are tagged with it.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            etag = make_etag(get_student_service(), **kwargs)
+            if etag is not None and request.if_none_match.contains(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(fn(*args, **kwargs))
+                if etag is None or response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            # Clients may keep the body but must revalidate it on every use
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
+
+
+def _wants_ndjson() -> bool:
+    return request.args.get('format') == 'ndjson' or request.accept_mimetypes.best == 'application/x-ndjson'
+
+
+def _students_etag(service) -> Optional[str]:
+    version = service.version_estudiantes()
+    if version is None:
+        return None
+    variant = b'ndjson' if _wants_ndjson() else request.query_string
+    return f"students-v{version}-{hashlib.blake2b(variant, digest_size=6).hexdigest()}"
+
+
+def _evaluations_etag(service, student_id: int) -> Optional[str]:
+    version = service.version_estudiante(student_id)
+    return f"evaluations-{student_id}-v{version}" if version is not None else None
+
+
+def _grade_etag(service, student_id: int) -> Optional[str]:
+    # Kept for the view, whose grade cache checks the same version
+    version = g.student_version = service.version_estudiante(student_id)
+    if version is None:
+        return None
+    return f"grade-{student_id}-v{version}-{'full' if _include_details(default=False) else 'summary'}"
+
+
+def _include_details(default: bool) -> bool:
+    # ?details=true/false, parsed like the ASGI adapter; each route picks its own default
+    raw = request.args.get('details')
+    if raw is None:
+        return default
+    return raw.lower() not in ('0', 'false', 'no')
+
+
+# Tamaño máximo de página para los listados paginados por cursor
+MAX_PAGE_SIZE = 1000
+
+
+@bp.route('/api/students', methods=['GET'])
 @jwt_required()
+@etag_cached(_students_etag)
 def listar_students_endpoint():
+    """List students.
+
+    - default: the whole listing as a JSON array
+    - `?limit=N[&after=<id>]`: keyset page as {"items": [...], "next_cursor": <id|null>}
+    - `?format=ndjson` (or Accept: application/x-ndjson): one JSON object per line,
+      streamed from the database with flat memory usage
+    """
     service = get_student_service()
+    if _wants_ndjson():
+        def generate():
+            for student in service.iterar_estudiantes():
+                yield current_app.json.dumps(student) + '\n'
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    if 'limit' in request.args:
+        try:
+            limit = min(int(request.args['limit']), MAX_PAGE_SIZE)
+            after = request.args.get('after')
+            students, next_cursor = service.listar_estudiantes_pagina(
+                after_id=int(after) if after else None, limit=limit
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({"items": students, "next_cursor": next_cursor})
+
     students = service.listar_estudiantes()
-    return jsonify(StudentMapper.to_list(students))
+    return jsonify(students)
 
 
-@app.route('/api/students', methods=['POST'])
+@bp.route('/api/students', methods=['POST'])
 @jwt_required()
 def crear_student_endpoint():
     datos = request.json
@@ -44,12 +328,13 @@ def crear_student_endpoint():
             nombre=datos['nombre'],
             attendance=datos.get('attendance', True)
         )
-        return jsonify(StudentMapper.to_dict(nuevo)), 201
+        return jsonify(nuevo), 201
     except (ValueError, KeyError) as e:
         return jsonify({"error": str(e)}), 400
 
 
-@app.route('/api/evaluations', methods=['POST'])
+@bp.route('/api/evaluations', methods=['POST'])
+@jwt_required()
 def agregar_evaluation_endpoint():
     datos = request.json
     service = get_student_service()
@@ -59,39 +344,180 @@ def agregar_evaluation_endpoint():
             score=float(datos['score']),
             weight=float(datos['weight'])
         )
-        return jsonify(EvaluationMapper.to_dict(nuevo)), 201
+        return jsonify(nuevo), 201
     except (ValueError, KeyError) as e:
         return jsonify({"error": str(e)}), 400
 
 
-@app.route('/api/students/<int:student_id>/evaluations', methods=['GET'])
+def _import_response(report):
+    body = {
+        "created": report["created"],
+        "errors": report["errors"],
+    }
+    status = 201 if report["created"] or not report["errors"] else 400
+    return jsonify(body), status
+
+
+@bp.route('/api/evaluations/bulk', methods=['POST'])
+@jwt_required()
+def importar_evaluations_endpoint():
+    """Bulk import from a JSON array of {student_id, score, weight} objects."""
+    datos = request.get_json(silent=True)
+    if not isinstance(datos, list) or not all(isinstance(row, dict) for row in datos):
+        return jsonify({"error": "Se esperaba un arreglo JSON de evaluaciones."}), 400
+    service = get_student_service()
+    return _import_response(service.importar_evaluaciones(datos))
+
+
+@bp.route('/api/evaluations/import', methods=['POST'])
+@jwt_required()
+def importar_evaluations_csv_endpoint():
+    """Bulk import from a CSV body with a student_id,score,weight header.
+
+    The body is parsed as it streams in instead of being buffered as a whole.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(request.stream, encoding='utf-8-sig', newline=''))
+    service = get_student_service()
+    return _import_response(service.importar_evaluaciones(reader))
+
+
+@bp.route('/api/students/<int:student_id>/evaluations', methods=['GET'])
+@jwt_required()
+@etag_cached(_evaluations_etag)
 def ver_evaluaciones_endpoint(student_id):
     service = get_student_service()
     evaluations = service.evaluation_repo.find_by_student_id(student_id)
-    return jsonify(EvaluationMapper.to_list(evaluations))
+    return jsonify(evaluations)
 
 
-@app.route('/api/students/<int:student_id>/attendance', methods=['POST'])
+@bp.route('/api/students/<int:student_id>/attendance', methods=['POST'])
+@jwt_required()
 def set_attendance_endpoint(student_id):
     datos = request.json
     service = get_student_service()
     try:
         student = service.set_attendance(student_id, bool(datos.get('attendance')))
-        return jsonify(StudentMapper.to_dict(student)), 200
+        return jsonify(student), 200
     except (ValueError, KeyError) as e:
         return jsonify({"error": str(e)}), 400
 
 
-@app.route('/api/students/<int:student_id>/grade', methods=['GET'])
+@bp.route('/api/students/<int:student_id>/grade', methods=['GET'])
+@jwt_required()
+@etag_cached(_grade_etag)
 def ver_nota_final_endpoint(student_id):
+    # By default a single read of the stored grade in final_grades; ?details=true recomputes the breakdown
     service = get_student_service()
     try:
-        result = service.calcular_nota_final(student_id)
+        result = service.calcular_nota_final(
+            student_id, include_details=_include_details(default=False), version=g.get('student_version'),
+        )
         return jsonify(result), 200
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
 
-@app.route('/api/login', methods=['POST'])
+
+@bp.route('/api/grades', methods=['GET'])
+@jwt_required()
+def ver_notas_finales_endpoint():
+    """Grade breakdowns for `?student_ids=1,2,3`, or for the whole cohort when omitted.
+
+    `?details=false` aggregates in SQL and omits the individual evaluations.
+    """
+    raw_ids = request.args.get('student_ids')
+    include_details = _include_details(default=True)
+    try:
+        student_ids = [int(x) for x in raw_ids.split(',') if x.strip()] if raw_ids else None
+    except ValueError:
+        return jsonify({"error": "student_ids debe ser una lista de enteros separados por comas."}), 400
+    service = get_student_service()
+    return jsonify(service.calcular_notas_finales(student_ids, include_details=include_details)), 200
+
+
+@bp.route('/api/grades/ranking', methods=['GET'])
+@jwt_required()
+def ranking_endpoint():
+    """Top `?limit=N` (default 10) final grades, with rank and percentile."""
+    service = get_student_service()
+    try:
+        limit = min(int(request.args.get('limit', 10)), MAX_PAGE_SIZE)
+        return jsonify(service.ranking(limit)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@bp.route('/api/grades/below', methods=['GET'])
+@jwt_required()
+def below_threshold_endpoint():
+    """Students below `?threshold=` (default: PASSING_GRADE), lowest grade first."""
+    service = get_student_service()
+    try:
+        threshold = float(request.args.get('threshold', current_app.config['PASSING_GRADE']))
+        return jsonify(service.estudiantes_bajo_nota(threshold)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@bp.route('/api/grades/stats', methods=['GET'])
+@jwt_required()
+def grade_stats_endpoint():
+    """Distribution of the cohort: `?bucket=1.0` histogram width, `?percentiles=25,50,75,90`."""
+    service = get_student_service()
+    try:
+        bucket = float(request.args.get('bucket', 1.0))
+        raw = request.args.get('percentiles')
+        percentiles = [float(p) for p in raw.split(',') if p.strip()] if raw else (25, 50, 75, 90)
+        return jsonify(service.distribucion_notas(bucket, percentiles)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@bp.route('/api/students/<int:student_id>/rank', methods=['GET'])
+@jwt_required()
+def student_rank_endpoint(student_id):
+    service = get_student_service()
+    try:
+        return jsonify(service.posicion_estudiante(student_id)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+
+
+@bp.route('/api/cache/stats', methods=['GET'])
+@jwt_required()
+def cache_stats_endpoint():
+    grade_cache = get_grade_cache()
+    if grade_cache is None:
+        return jsonify({"enabled": False}), 200
+    return jsonify({"enabled": True, **grade_cache.stats()}), 200
+
+
+@bp.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(REGISTRY.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@bp.route('/healthz', methods=['GET'])
+def liveness_endpoint():
+    """Liveness: the worker is up and serving; never touches the database."""
+    return jsonify({"status": "ok", "pid": os.getpid()}), 200
+
+
+@bp.route('/readyz', methods=['GET'])
+def readiness_endpoint():
+    """Readiness: the worker's pool has room and hands out a connection that answers."""
+    engine = current_app.extensions["database"].engine
+    status = pool_status(engine)
+    limit = status.get("size", 0) + status.get("max_overflow", 0)
+    if limit > 0 and status["checked_out"] >= limit:
+        return jsonify({"status": "unavailable", "reason": "pool exhausted", "pool": status}), 503
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except SQLAlchemyError as e:
+        return jsonify({"status": "unavailable", "reason": type(e).__name__, "pool": status}), 503
+    return jsonify({"status": "ready", "pool": pool_status(engine)}), 200
+
+@bp.route('/api/login', methods=['POST'])
 def login():
     username = request.json.get("username", None)
     password = request.json.get("password", None)
@@ -105,7 +531,7 @@ def login():
     access_token = create_access_token(identity=username)
     return jsonify(access_token=access_token)
 
-@app.route('/api/seed', methods=['POST'])
+@bp.route('/api/seed', methods=['POST'])
 def seed_data():
     """Seed the database with example students and evaluations (development only).
 
@@ -130,10 +556,10 @@ def seed_data():
 
 
 
+app = create_app()
+
+
 if __name__ == '__main__':
-    # Creación de tablas al iniciar (solo para desarrollo, en producción se usan migraciones)
-    from src.infrastructure.adapters.database import metadata
-    from src.infrastructure.config import engine
-    metadata.create_all(bind=engine)
-    
-    app.run(host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Servidor de desarrollo (un proceso). El esquema se crea aparte con `alembic upgrade head`;
+    # en producción se usa gunicorn (ver gunicorn.conf.py).
+    app.run(host='0.0.0.0', port=5000)
@@ -0,0 +1,240 @@
+# src/infrastructure/adapters/asgi.py
+"""Asyncio (ASGI) inbound adapter, an alternative to the Flask app in `api.py`.
+
+Serves the same routes and JWT tokens on top of the async repositories, so no worker
+thread sits idle during database round trips. Run it with:
+
+  uvicorn --factory src.infrastructure.adapters.asgi:create_asgi_app
+"""
+import datetime
+import uuid
+from contextlib import asynccontextmanager
+from functools import wraps
+from typing import Optional
+
+import jwt
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from src.application.async_services import AsyncStudentService
+from src.application.mappers import StudentMapper, EvaluationMapper
+from src.infrastructure.adapters.async_database import (
+    async_database_url,
+    AsyncSQLAlchemyStudentRepository,
+    AsyncSQLAlchemyEvaluationRepository,
+)
+from src.infrastructure.adapters.cache import InMemoryGradeCache
+from src.infrastructure.adapters.token_cache import VerifiedTokenCache
+from src.infrastructure.config import (
+    DATABASE_URL,
+    GRADE_CACHE_SIZE,
+    GRADE_CACHE_TTL,
+    JWT_CACHE_SIZE,
+    JWT_CACHE_TTL,
+    JWT_SECRET_KEY,
+    engine_options,
+)
+
+JWT_ALGORITHM = "HS256"
+# Same lifetime as flask_jwt_extended's default, so tokens are interchangeable
+JWT_ACCESS_EXPIRES = datetime.timedelta(minutes=15)
+
+
+def _async_engine_options(url: str) -> dict:
+    options = engine_options(url)
+    connect_args = options.pop("connect_args", None)
+    if connect_args and url.startswith("postgresql"):
+        # asyncpg takes server settings instead of libpq's "-c" options
+        timeout = connect_args["options"].split("statement_timeout=", 1)[1]
+        options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+    return options
+
+
+def _error(message: str, status: int) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=status)
+
+
+def jwt_required(handler):
+    """Same contract as flask_jwt_extended: 401 when missing or expired, 422 when malformed.
+
+    Verified tokens are remembered in the app's token cache until they expire.
+    """
+    @wraps(handler)
+    async def endpoint(request: Request, *args):
+        header = request.headers.get("Authorization", "")
+        if not header.startswith("Bearer "):
+            return JSONResponse({"msg": "Missing Authorization Header"}, status_code=401)
+        token = header[len("Bearer "):]
+        token_cache = request.app.state.token_cache
+        claims = token_cache.get(token) if token_cache is not None else None
+        if claims is None:
+            try:
+                claims = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+            except jwt.ExpiredSignatureError:
+                return JSONResponse({"msg": "Token has expired"}, status_code=401)
+            except jwt.InvalidTokenError as e:
+                return JSONResponse({"msg": str(e)}, status_code=422)
+            if claims.get("type") != "access":
+                return JSONResponse({"msg": "Only non-refresh tokens are allowed"}, status_code=422)
+            if token_cache is not None:
+                token_cache.set(token, claims.get("exp"), claims)
+        request.state.jwt = claims
+        return await handler(request, *args)
+    return endpoint
+
+
+def with_service(handler):
+    """Open one AsyncSession per request and hand the handler a service bound to it."""
+    @wraps(handler)
+    async def endpoint(request: Request):
+        state = request.app.state
+        async with state.sessionmaker() as session:
+            service = AsyncStudentService(
+                AsyncSQLAlchemyStudentRepository(session),
+                AsyncSQLAlchemyEvaluationRepository(session),
+                state.grade_cache,
+            )
+            return await handler(request, service)
+    return endpoint
+
+
+async def _json_body(request: Request):
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+
+@jwt_required
+@with_service
+async def listar_students(request: Request, service: AsyncStudentService):
+    students = await service.listar_estudiantes()
+    return JSONResponse(StudentMapper.to_list(students))
+
+
+@jwt_required
+@with_service
+async def crear_student(request: Request, service: AsyncStudentService):
+    datos = await _json_body(request) or {}
+    try:
+        nuevo = await service.crear_estudiante(
+            code=datos['code'],
+            nombre=datos['nombre'],
+            attendance=datos.get('attendance', True)
+        )
+    except (ValueError, KeyError) as e:
+        return _error(str(e), 400)
+    return JSONResponse(StudentMapper.to_dict(nuevo), status_code=201)
+
+
+@jwt_required
+@with_service
+async def agregar_evaluation(request: Request, service: AsyncStudentService):
+    datos = await _json_body(request) or {}
+    try:
+        nuevo = await service.agregar_evaluacion(
+            student_id=int(datos['student_id']),
+            score=float(datos['score']),
+            weight=float(datos['weight'])
+        )
+    except (ValueError, KeyError) as e:
+        return _error(str(e), 400)
+    return JSONResponse(EvaluationMapper.to_dict(nuevo), status_code=201)
+
+
+@jwt_required
+@with_service
+async def ver_evaluaciones(request: Request, service: AsyncStudentService):
+    evaluations = await service.evaluation_repo.find_by_student_id(request.path_params['student_id'])
+    return JSONResponse(EvaluationMapper.to_list(evaluations))
+
+
+@jwt_required
+@with_service
+async def set_attendance(request: Request, service: AsyncStudentService):
+    datos = await _json_body(request) or {}
+    try:
+        student = await service.set_attendance(request.path_params['student_id'], bool(datos.get('attendance')))
+    except ValueError as e:
+        return _error(str(e), 400)
+    return JSONResponse(StudentMapper.to_dict(student))
+
+
+@jwt_required
+@with_service
+async def ver_nota_final(request: Request, service: AsyncStudentService):
+    # Same default as the Flask adapter: the summary unless ?details=true
+    include_details = request.query_params.get('details', 'false').lower() not in ('0', 'false', 'no')
+    try:
+        result = await service.calcular_nota_final(request.path_params['student_id'], include_details)
+    except ValueError as e:
+        return _error(str(e), 400)
+    return JSONResponse(result)
+
+
+@jwt_required
+@with_service
+async def ver_notas_finales(request: Request, service: AsyncStudentService):
+    raw_ids = request.query_params.get('student_ids')
+    try:
+        student_ids = [int(x) for x in raw_ids.split(',') if x.strip()] if raw_ids else None
+    except ValueError:
+        return _error("student_ids debe ser una lista de enteros separados por comas.", 400)
+    return JSONResponse(await service.calcular_notas_finales(student_ids))
+
+
+async def login(request: Request):
+    datos = await _json_body(request) or {}
+    # Mismas credenciales fijas que el adaptador Flask
+    if datos.get("username") != "admin" or datos.get("password") != "admin":
+        return JSONResponse({"msg": "Bad username or password"}, status_code=401)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    claims = {
+        "fresh": False,
+        "iat": now,
+        "jti": str(uuid.uuid4()),
+        "type": "access",
+        "sub": datos["username"],
+        "nbf": now,
+        "exp": now + JWT_ACCESS_EXPIRES,
+    }
+    return JSONResponse({"access_token": jwt.encode(claims, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)})
+
+
+def create_asgi_app(database_url: Optional[str] = None) -> Starlette:
+    """Application factory; each app owns its async engine and grade cache."""
+    url = async_database_url(database_url or DATABASE_URL)
+    engine = create_async_engine(url, **_async_engine_options(url))
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        yield
+        await engine.dispose()
+
+    routes = [
+        Route('/api/students', listar_students, methods=['GET']),
+        Route('/api/students', crear_student, methods=['POST']),
+        Route('/api/evaluations', agregar_evaluation, methods=['POST']),
+        Route('/api/students/{student_id:int}/evaluations', ver_evaluaciones, methods=['GET']),
+        Route('/api/students/{student_id:int}/attendance', set_attendance, methods=['POST']),
+        Route('/api/students/{student_id:int}/grade', ver_nota_final, methods=['GET']),
+        Route('/api/grades', ver_notas_finales, methods=['GET']),
+        Route('/api/login', login, methods=['POST']),
+    ]
+    middleware = [
+        Middleware(
+            CORSMiddleware, allow_origins=["*"], allow_methods=["*"],
+            allow_headers=["Content-Type", "Authorization"],
+        )
+    ]
+    app = Starlette(routes=routes, middleware=middleware, lifespan=lifespan)
+    app.state.engine = engine
+    app.state.sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    app.state.grade_cache = InMemoryGradeCache(GRADE_CACHE_SIZE, GRADE_CACHE_TTL) if GRADE_CACHE_SIZE > 0 else None
+    app.state.token_cache = VerifiedTokenCache(JWT_CACHE_SIZE, JWT_CACHE_TTL) if JWT_CACHE_SIZE > 0 else None
+    return app
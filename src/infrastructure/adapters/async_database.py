@@ -0,0 +1,131 @@
+# src/infrastructure/adapters/async_database.py
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.domain.models import Student as DomainStudent, Evaluation as DomainEvaluation, EvaluationTotals
+from src.domain.ports import AsyncStudentRepository, AsyncEvaluationRepository
+from src.infrastructure.adapters.database import (
+    STUDENTS_COLLECTION,
+    students_table,
+    student_columns,
+    evaluations_table,
+    evaluation_totals_table,
+    final_grades_table,
+    totals_upsert,
+    final_grades_source,
+    FINAL_GRADES_UPSERT,
+    final_grade_changes,
+    bump_resource_version,
+    bump_student_versions,
+    resource_version_query,
+    student_version_query,
+)
+
+
+def async_database_url(url: str) -> str:
+    """Map a sync SQLAlchemy URL to its asyncio driver (asyncpg / aiosqlite)."""
+    for sync_prefix, async_prefix in (
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+
+async def refresh_final_grades(session: AsyncSession, student_ids: list[int]) -> None:
+    """Async twin of `database.refresh_final_grades`; runs inside the caller's transaction."""
+    upserts, removed = final_grade_changes(await session.execute(final_grades_source(student_ids)))
+    await FINAL_GRADES_UPSERT.execute_async(session, upserts)
+    if removed:
+        await session.execute(final_grades_table.delete().where(final_grades_table.c.student_id.in_(removed)))
+
+
+class AsyncSQLAlchemyStudentRepository(AsyncStudentRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_all(self) -> list[DomainStudent]:
+        rows = (await self.session.execute(select(*student_columns))).all()
+        return [DomainStudent(**row._asdict()) for row in rows]
+
+    async def find_by_id(self, student_id: int) -> Optional[DomainStudent]:
+        stmt = select(*student_columns).where(students_table.c.id == student_id)
+        row = (await self.session.execute(stmt)).first()
+        return DomainStudent(**row._asdict()) if row else None
+
+    async def find_by_ids(self, student_ids: list[int]) -> list[DomainStudent]:
+        if not student_ids:
+            return []
+        stmt = select(*student_columns).where(students_table.c.id.in_(student_ids))
+        rows = (await self.session.execute(stmt)).all()
+        return [DomainStudent(**row._asdict()) for row in rows]
+
+    async def get_version(self, student_id: int) -> Optional[int]:
+        return (await self.session.execute(student_version_query(student_id))).scalar()
+
+    async def get_collection_version(self) -> Optional[int]:
+        return (await self.session.execute(resource_version_query(STUDENTS_COLLECTION))).scalar() or 0
+
+    async def save(self, student: DomainStudent) -> DomainStudent:
+        values = dict(code=student.code, nombre=student.nombre, attendance=student.attendance)
+        bump, rows = bump_resource_version(STUDENTS_COLLECTION)
+        if getattr(student, 'id', None) is None:
+            result = await self.session.execute(students_table.insert().values(**values))
+            await bump.execute_async(self.session, rows)
+            await self.session.commit()
+            student.id = result.inserted_primary_key[0]
+        else:
+            stmt = students_table.update().where(students_table.c.id == student.id).values(
+                **values, version=students_table.c.version + 1
+            )
+            await self.session.execute(stmt)
+            await bump.execute_async(self.session, rows)
+            await refresh_final_grades(self.session, [student.id])
+            await self.session.commit()
+        return student
+
+
+class AsyncSQLAlchemyEvaluationRepository(AsyncEvaluationRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def find_by_student_id(self, student_id: int) -> list[DomainEvaluation]:
+        stmt = select(evaluations_table).where(evaluations_table.c.student_id == student_id)
+        rows = (await self.session.execute(stmt)).all()
+        return [DomainEvaluation(**row._asdict()) for row in rows]
+
+    async def find_by_student_ids(self, student_ids: list[int]) -> dict[int, list[DomainEvaluation]]:
+        grouped: dict[int, list[DomainEvaluation]] = {sid: [] for sid in student_ids}
+        if not student_ids:
+            return grouped
+        stmt = (
+            select(evaluations_table)
+            .where(evaluations_table.c.student_id.in_(student_ids))
+            .order_by(evaluations_table.c.id)
+        )
+        for row in await self.session.execute(stmt):
+            grouped[row.student_id].append(DomainEvaluation(**row._asdict()))
+        return grouped
+
+    async def get_totals(self, student_id: int) -> Optional[EvaluationTotals]:
+        stmt = select(evaluation_totals_table).where(evaluation_totals_table.c.student_id == student_id)
+        row = (await self.session.execute(stmt)).first()
+        return EvaluationTotals(**row._asdict()) if row else None
+
+    async def save(self, evaluation: DomainEvaluation) -> DomainEvaluation:
+        stmt = evaluations_table.insert().values(
+            student_id=evaluation.student_id,
+            score=evaluation.score,
+            weight=evaluation.weight
+        )
+        result = await self.session.execute(stmt)
+        totals, rows = totals_upsert([evaluation])
+        await totals.execute_async(self.session, rows)
+        await refresh_final_grades(self.session, [evaluation.student_id])
+        await self.session.execute(bump_student_versions([evaluation.student_id]))
+        await self.session.commit()
+        evaluation.id = result.inserted_primary_key[0]
+        return evaluation
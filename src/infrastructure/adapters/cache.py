@@ -0,0 +1,74 @@
+# src/infrastructure/adapters/cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from src.domain.ports import GradeCache
+
+
+class InMemoryGradeCache(GradeCache):
+    """Thread-safe, in-process LRU cache of grade results with optional TTL.
+
+    Entries are kept per student (both the detailed and the summary variant), so
+    `max_size` bounds the number of students and `invalidate` drops a student in O(1).
+    Each entry remembers the student version it was computed at; a lookup with a
+    different version drops it, so writes made by other processes (which cannot call
+    `invalidate` here) are not served stale.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None, clock=time.monotonic):
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than 0")
+        self.max_size = int(max_size)
+        self.ttl = float(ttl) if ttl else None
+        self._clock = clock
+        self._lock = threading.Lock()
+        # student_id -> {detailed: (expires_at, version, result)}
+        self._entries: "OrderedDict[int, Dict[bool, tuple]]" = OrderedDict()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0, "stale": 0}
+
+    def get(self, student_id: int, detailed: bool, version: Optional[int] = None) -> Optional[dict]:
+        with self._lock:
+            variants = self._entries.get(student_id)
+            entry = variants.get(detailed) if variants else None
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            expires_at, cached_version, result = entry
+            expired = expires_at is not None and expires_at <= self._clock()
+            if expired or cached_version != version:
+                del variants[detailed]
+                if not variants:
+                    del self._entries[student_id]
+                self._counters["expirations" if expired else "stale"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(student_id)
+            self._counters["hits"] += 1
+            return result
+
+    def set(self, student_id: int, detailed: bool, result: dict, version: Optional[int] = None) -> None:
+        expires_at = self._clock() + self.ttl if self.ttl else None
+        with self._lock:
+            variants = self._entries.get(student_id)
+            if variants is None:
+                variants = self._entries[student_id] = {}
+            variants[detailed] = (expires_at, version, result)
+            self._entries.move_to_end(student_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, student_id: int) -> None:
+        with self._lock:
+            if self._entries.pop(student_id, None) is not None:
+                self._counters["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._counters, "size": len(self._entries)}
@@ -1,10 +1,16 @@
 # src/infrastructure/adapters/database.py
-from typing import Optional
+from typing import Any, Callable, Iterator, Mapping, Optional
 
 from sqlalchemy.orm import Session
-from sqlalchemy import Table, Column, Integer, String, Float, MetaData, select, Boolean, ForeignKey
-from src.domain.models import Student as DomainStudent, Evaluation as DomainEvaluation
-from src.domain.ports import StudentRepository, EvaluationRepository
+from sqlalchemy import (
+    Table, Column, Index, Integer, String, Float, MetaData, select, func, Boolean, ForeignKey, bindparam,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from src.domain.models import (
+    Student as DomainStudent, Evaluation as DomainEvaluation, EvaluationTotals, FinalGrade, RankedGrade,
+)
+from src.domain.ports import StudentRepository, EvaluationRepository, FinalGradeRepository
+from src.application.grade_calculator import GradeCalculator, grade_totals
 
 # Database table mappings
 metadata = MetaData()
@@ -14,24 +20,227 @@ students_table = Table(
     Column('id', Integer, primary_key=True),
     Column('code', String(50), unique=True),
     Column('nombre', String(150)),
-    Column('attendance', Boolean, default=True)
+    Column('attendance', Boolean, default=True),
+    # Bumped whenever the student or its evaluations change (HTTP ETags)
+    Column('version', Integer, nullable=False, default=1, server_default='1')
 )
+# Columns of the Student domain model (`version` is bookkeeping only)
+student_columns = [students_table.c[name] for name in ('id', 'code', 'nombre', 'attendance')]
 
 evaluations_table = Table(
     'evaluations', metadata,
     Column('id', Integer, primary_key=True),
     Column('student_id', Integer, ForeignKey('students.id')),
     Column('score', Float),
-    Column('weight', Float)
+    Column('weight', Float),
+    # Covers the per-student lookups and grade aggregation (index-only scans on Postgres)
+    Index('ix_evaluations_student_id_covering', 'student_id', postgresql_include=['score', 'weight'])
+)
+
+# Running aggregates per student, maintained in the same transaction as each evaluation insert
+evaluation_totals_table = Table(
+    'evaluation_totals', metadata,
+    Column('student_id', Integer, ForeignKey('students.id'), primary_key=True),
+    Column('evaluation_count', Integer, nullable=False),
+    Column('total_weight', Float, nullable=False),
+    Column('weighted_sum', Float, nullable=False)
+)
+
+# Version counters of whole collections (e.g. the student listing), bumped on every change
+resource_versions_table = Table(
+    'resource_versions', metadata,
+    Column('name', String(50), primary_key=True),
+    Column('version', Integer, nullable=False)
+)
+
+# Materialized final grades (same fields as GradeCalculator.calculate_final)
+final_grades_table = Table(
+    'final_grades', metadata,
+    Column('student_id', Integer, ForeignKey('students.id'), primary_key=True),
+    Column('weighted_average', Float, nullable=False),
+    Column('attendance_penalty', Float, nullable=False),
+    Column('extra_points', Float, nullable=False),
+    Column('final_grade', Float, nullable=False),
+    # Top-k and threshold queries walk this index instead of sorting the table
+    Index('ix_final_grades_final_grade', 'final_grade')
+)
+
+
+class Upsert:
+    """Insert-or-update of rows of `table`, keyed by its primary key column `key`, on any dialect.
+
+    `update(columns, new)` returns the SET clause for a row that already exists: column
+    name to expression, where `columns` are the table's columns and `new[name]` the value
+    being written. PostgreSQL and SQLite run a native INSERT ... ON CONFLICT DO UPDATE
+    (one executemany for all the rows); other dialects fall back to an UPDATE per row
+    followed by an INSERT when it matched nothing. Both run inside the caller's
+    transaction, sync (`execute`) or async (`execute_async`), and apply the rows in order.
+    """
+
+    def __init__(self, table: Table, key: str, update: Callable[[Any, Mapping[str, Any]], dict]):
+        self.table = table
+        self.key = key
+        self._update = update
+        self._native = {}
+
+    def native(self, dialect: str):
+        """The ON CONFLICT statement for `dialect`, or None where it has no such syntax."""
+        if dialect not in self._native:
+            module = {'postgresql': postgresql, 'sqlite': sqlite}.get(dialect)
+            stmt = None
+            if module is not None:
+                insert = module.insert(self.table)
+                stmt = insert.on_conflict_do_update(
+                    index_elements=[self.table.c[self.key]], set_=self._update(self.table.c, insert.excluded),
+                )
+            self._native[dialect] = stmt
+        return self._native[dialect]
+
+    def fallback(self):
+        """(UPDATE, INSERT) pair for dialects without ON CONFLICT; see `fallback_params`."""
+        new = {c.name: bindparam(f"new_{c.name}") for c in self.table.c}
+        update = (
+            self.table.update()
+            .where(self.table.c[self.key] == bindparam(f"key_{self.key}"))
+            .values(self._update(self.table.c, new))
+        )
+        return update, self.table.insert()
+
+    def fallback_params(self, row: Mapping[str, Any]) -> dict:
+        """Parameters of the fallback UPDATE for `row` (the INSERT takes `row` as is)."""
+        params = {f"new_{name}": row.get(name) for name in self.table.c.keys()}
+        params[f"key_{self.key}"] = row[self.key]
+        return params
+
+    def execute(self, session: Session, rows: list[dict]) -> None:
+        if not rows:
+            return
+        stmt = self.native(session.get_bind().dialect.name)
+        if stmt is not None:
+            session.execute(stmt, rows)
+            return
+        update, insert = self.fallback()
+        for row in rows:
+            if session.execute(update, self.fallback_params(row)).rowcount == 0:
+                session.execute(insert, row)
+
+    async def execute_async(self, session, rows: list[dict]) -> None:
+        if not rows:
+            return
+        stmt = self.native(session.bind.dialect.name)
+        if stmt is not None:
+            await session.execute(stmt, rows)
+            return
+        update, insert = self.fallback()
+        for row in rows:
+            if (await session.execute(update, self.fallback_params(row))).rowcount == 0:
+                await session.execute(insert, row)
+
+
+EVALUATION_TOTALS_UPSERT = Upsert(evaluation_totals_table, 'student_id', lambda t, new: {
+    'evaluation_count': t.evaluation_count + 1,
+    'total_weight': t.total_weight + new['total_weight'],
+    'weighted_sum': t.weighted_sum + new['weighted_sum'],
+})
+
+
+def totals_upsert(evaluations: list[DomainEvaluation]) -> tuple[Upsert, list[dict]]:
+    """Upsert and rows that add `evaluations` to evaluation_totals.
+
+    One row per evaluation, applied in order, so the sums match adding them one by one.
+    Shared by the sync and async repositories; runs inside the caller's transaction.
+    """
+    params = [
+        {
+            "student_id": ev.student_id,
+            "evaluation_count": 1,
+            "total_weight": ev.weight,
+            "weighted_sum": ev.score * ev.weight,
+        }
+        for ev in evaluations
+    ]
+    return EVALUATION_TOTALS_UPSERT, params
+
+
+STUDENTS_COLLECTION = 'students'
+
+
+def bump_student_versions(student_ids: list[int]):
+    return (
+        students_table.update()
+        .where(students_table.c.id.in_(student_ids))
+        .values(version=students_table.c.version + 1)
+    )
+
+
+RESOURCE_VERSIONS_UPSERT = Upsert(resource_versions_table, 'name', lambda t, new: {'version': t.version + 1})
+
+
+def bump_resource_version(name: str) -> tuple[Upsert, list[dict]]:
+    return RESOURCE_VERSIONS_UPSERT, [{"name": name, "version": 1}]
+
+
+def student_version_query(student_id: int):
+    return select(students_table.c.version).where(students_table.c.id == student_id)
+
+
+def resource_version_query(name: str):
+    return select(resource_versions_table.c.version).where(resource_versions_table.c.name == name)
+
+
+FINAL_GRADE_FIELDS = ('weighted_average', 'attendance_penalty', 'extra_points', 'final_grade')
+
+
+FINAL_GRADES_UPSERT = Upsert(
+    final_grades_table, 'student_id', lambda t, new: {name: new[name] for name in FINAL_GRADE_FIELDS},
 )
 
 
+def final_grades_source(student_ids: list[int]):
+    """Attendance and running totals of `student_ids`: everything their final grade depends on."""
+    s, t = students_table.c, evaluation_totals_table.c
+    return (
+        select(s.id, s.attendance, t.evaluation_count, t.total_weight, t.weighted_sum)
+        .select_from(students_table.outerjoin(evaluation_totals_table, t.student_id == s.id))
+        .where(s.id.in_(student_ids))
+    )
+
+
+def final_grade_changes(rows) -> tuple[list[dict], list[int]]:
+    """Grade the rows of `final_grades_source`: (rows to upsert, ids whose grade must be removed).
+
+    Grades with the same `grade_totals` as `StudentService`, so the stored grade always
+    matches the computed one.
+    """
+    calc = GradeCalculator()
+    upserts, removed = [], []
+    for row in rows:
+        try:
+            result = grade_totals(
+                row.id, row.attendance, row.total_weight or 0.0, row.weighted_sum or 0.0, row.evaluation_count or 0,
+                calc,
+            )
+        except ValueError:
+            removed.append(row.id)
+            continue
+        upserts.append({"student_id": row.id, **{name: result[name] for name in FINAL_GRADE_FIELDS}})
+    return upserts, removed
+
+
+def refresh_final_grades(session: Session, student_ids: list[int]) -> None:
+    """Bring the final_grades rows of `student_ids` up to date, inside the caller's transaction."""
+    upserts, removed = final_grade_changes(session.execute(final_grades_source(student_ids)))
+    FINAL_GRADES_UPSERT.execute(session, upserts)
+    if removed:
+        session.execute(final_grades_table.delete().where(final_grades_table.c.student_id.in_(removed)))
+
+
 class SQLAlchemyStudentRepository(StudentRepository):
     def __init__(self, session: Session):
         self.session = session
 
     def get_all(self) -> list[DomainStudent]:
-        stmt = select(students_table)
+        stmt = select(*student_columns)
         rows = self.session.execute(stmt).all()
         return [DomainStudent(**row._asdict()) for row in rows]
 
@@ -44,6 +253,7 @@ class SQLAlchemyStudentRepository(StudentRepository):
                 attendance=student.attendance
             )
             result = self.session.execute(stmt)
+            self._bump_collection()
             self.session.commit()
             student.id = result.inserted_primary_key[0]
             return student
@@ -51,17 +261,64 @@ class SQLAlchemyStudentRepository(StudentRepository):
             stmt = students_table.update().where(students_table.c.id == student.id).values(
                 code=student.code,
                 nombre=student.nombre,
-                attendance=student.attendance
+                attendance=student.attendance,
+                version=students_table.c.version + 1
             )
             self.session.execute(stmt)
+            self._bump_collection()
+            # Attendance feeds the final grade
+            refresh_final_grades(self.session, [student.id])
             self.session.commit()
             return student
 
+    def _bump_collection(self) -> None:
+        upsert, rows = bump_resource_version(STUDENTS_COLLECTION)
+        upsert.execute(self.session, rows)
+
+    def get_version(self, student_id: int) -> Optional[int]:
+        return self.session.execute(student_version_query(student_id)).scalar()
+
+    def get_versions(self, student_ids: list[int]) -> dict[int, Optional[int]]:
+        versions = dict.fromkeys(student_ids)
+        if student_ids:
+            stmt = select(students_table.c.id, students_table.c.version).where(students_table.c.id.in_(student_ids))
+            versions.update(self.session.execute(stmt).all())
+        return versions
+
+    def get_collection_version(self) -> Optional[int]:
+        return self.session.execute(resource_version_query(STUDENTS_COLLECTION)).scalar() or 0
+
     def find_by_id(self, student_id: int) -> Optional[DomainStudent]:
-        stmt = select(students_table).where(students_table.c.id == student_id)
+        stmt = select(*student_columns).where(students_table.c.id == student_id)
+        row = self.session.execute(stmt).first()
+        return DomainStudent(**row._asdict()) if row else None
+
+    def find_by_code(self, code: str) -> Optional[DomainStudent]:
+        stmt = select(*student_columns).where(students_table.c.code == code)
         row = self.session.execute(stmt).first()
         return DomainStudent(**row._asdict()) if row else None
 
+    def find_page(self, after_id: Optional[int], limit: int) -> list[DomainStudent]:
+        stmt = select(*student_columns).order_by(students_table.c.id).limit(limit)
+        if after_id is not None:
+            stmt = stmt.where(students_table.c.id > after_id)
+        rows = self.session.execute(stmt).all()
+        return [DomainStudent(**row._asdict()) for row in rows]
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[DomainStudent]:
+        # yield_per uses a server-side cursor where the driver supports it, so only
+        # `batch_size` rows are buffered at a time
+        stmt = select(*student_columns).order_by(students_table.c.id).execution_options(yield_per=batch_size)
+        for row in self.session.execute(stmt):
+            yield DomainStudent(**row._asdict())
+
+    def find_by_ids(self, student_ids: list[int]) -> list[DomainStudent]:
+        if not student_ids:
+            return []
+        stmt = select(*student_columns).where(students_table.c.id.in_(student_ids))
+        rows = self.session.execute(stmt).all()
+        return [DomainStudent(**row._asdict()) for row in rows]
+
 
 class SQLAlchemyEvaluationRepository(EvaluationRepository):
     def __init__(self, session: Session):
@@ -72,6 +329,29 @@ class SQLAlchemyEvaluationRepository(EvaluationRepository):
         rows = self.session.execute(stmt).all()
         return [DomainEvaluation(**row._asdict()) for row in rows]
 
+    def find_by_student_ids(self, student_ids: list[int]) -> dict[int, list[DomainEvaluation]]:
+        grouped: dict[int, list[DomainEvaluation]] = {sid: [] for sid in student_ids}
+        if not student_ids:
+            return grouped
+        stmt = (
+            select(evaluations_table)
+            .where(evaluations_table.c.student_id.in_(student_ids))
+            .order_by(evaluations_table.c.id)
+        )
+        for row in self.session.execute(stmt):
+            grouped[row.student_id].append(DomainEvaluation(**row._asdict()))
+        return grouped
+
+    def count_by_student_ids(self, student_ids: list[int]) -> dict[int, int]:
+        counts = {sid: 0 for sid in student_ids}
+        if not student_ids:
+            return counts
+        t = evaluation_totals_table.c
+        stmt = select(t.student_id, t.evaluation_count).where(t.student_id.in_(student_ids))
+        for row in self.session.execute(stmt):
+            counts[row.student_id] = row.evaluation_count
+        return counts
+
     def save(self, evaluation: DomainEvaluation) -> DomainEvaluation:
         stmt = evaluations_table.insert().values(
             student_id=evaluation.student_id,
@@ -79,6 +359,147 @@ class SQLAlchemyEvaluationRepository(EvaluationRepository):
             weight=evaluation.weight
         )
         result = self.session.execute(stmt)
+        self._add_to_totals([evaluation])
+        refresh_final_grades(self.session, [evaluation.student_id])
+        self.session.execute(bump_student_versions([evaluation.student_id]))
         self.session.commit()
         evaluation.id = result.inserted_primary_key[0]
-        return evaluation
\ No newline at end of file
+        return evaluation
+
+    def save_many(self, evaluations: list[DomainEvaluation]) -> list[DomainEvaluation]:
+        """Insert all evaluations with one multi-row INSERT ... RETURNING and a single commit."""
+        if not evaluations:
+            return []
+        params = [
+            {"student_id": ev.student_id, "score": ev.score, "weight": ev.weight}
+            for ev in evaluations
+        ]
+        stmt = evaluations_table.insert().returning(evaluations_table.c.id, sort_by_parameter_order=True)
+        ids = self.session.execute(stmt, params).scalars().all()
+        self._add_to_totals(evaluations)
+        student_ids = list({ev.student_id for ev in evaluations})
+        refresh_final_grades(self.session, student_ids)
+        self.session.execute(bump_student_versions(student_ids))
+        self.session.commit()
+        for ev, new_id in zip(evaluations, ids):
+            ev.id = new_id
+        return evaluations
+
+    def get_totals(self, student_id: int) -> Optional[EvaluationTotals]:
+        stmt = select(evaluation_totals_table).where(evaluation_totals_table.c.student_id == student_id)
+        row = self.session.execute(stmt).first()
+        return EvaluationTotals(**row._asdict()) if row else None
+
+    def aggregate_by_student(self, student_ids: list[int]) -> dict[int, EvaluationTotals]:
+        # Only one aggregate row per student crosses the wire
+        if not student_ids:
+            return {}
+        e = evaluations_table.c
+        stmt = (
+            select(
+                e.student_id,
+                func.count().label('evaluation_count'),
+                func.sum(e.weight).label('total_weight'),
+                func.sum(e.score * e.weight).label('weighted_sum'),
+            )
+            .where(e.student_id.in_(student_ids))
+            .group_by(e.student_id)
+        )
+        return {row.student_id: EvaluationTotals(**row._asdict()) for row in self.session.execute(stmt)}
+
+    def _add_to_totals(self, evaluations: list[DomainEvaluation]) -> None:
+        # Incremental update (no re-scan)
+        upsert, rows = totals_upsert(evaluations)
+        upsert.execute(self.session, rows)
+
+
+class SQLAlchemyFinalGradeRepository(FinalGradeRepository):
+    def __init__(self, session: Session):
+        self.session = session
+
+    def find_by_student_id(self, student_id: int) -> Optional[FinalGrade]:
+        stmt = select(final_grades_table).where(final_grades_table.c.student_id == student_id)
+        row = self.session.execute(stmt).first()
+        return FinalGrade(**row._asdict()) if row else None
+
+    def find_with_totals(self, student_id: int) -> Optional[tuple[FinalGrade, EvaluationTotals]]:
+        stmt = (
+            select(final_grades_table, evaluation_totals_table)
+            .join(evaluation_totals_table, evaluation_totals_table.c.student_id == final_grades_table.c.student_id)
+            .where(final_grades_table.c.student_id == student_id)
+        )
+        row = self.session.execute(stmt).first()
+        if row is None:
+            return None
+        grade = FinalGrade(**{c.name: row._mapping[c] for c in final_grades_table.c})
+        return grade, EvaluationTotals(**{c.name: row._mapping[c] for c in evaluation_totals_table.c})
+
+    def save_many(self, grades: list[FinalGrade]) -> None:
+        if not grades:
+            return
+        FINAL_GRADES_UPSERT.execute(self.session, [vars(g) for g in grades])
+        self.session.commit()
+
+    def delete_many(self, student_ids: list[int]) -> None:
+        if not student_ids:
+            return
+        self.session.execute(final_grades_table.delete().where(final_grades_table.c.student_id.in_(student_ids)))
+        self.session.commit()
+
+    def save_recomputed(
+        self, grades: list[FinalGrade], removed: list[int], versions: dict[int, Optional[int]]
+    ) -> list[int]:
+        ids = [g.student_id for g in grades] + list(removed)
+        if not ids:
+            return []
+        dialect = self.session.get_bind().dialect.name
+        stmt = select(students_table.c.id, students_table.c.version).where(students_table.c.id.in_(ids))
+        if dialect == 'postgresql':
+            # Writers bump students.version, so locking the rows holds them off until the commit
+            stmt = stmt.with_for_update()
+        current = dict(self.session.execute(stmt).all())
+        stale = [sid for sid in ids if current.get(sid) != versions.get(sid)]
+        skip = set(stale)
+        upserts = [vars(g) for g in grades if g.student_id not in skip]
+        deletes = [sid for sid in removed if sid not in skip]
+        FINAL_GRADES_UPSERT.execute(self.session, upserts)
+        if deletes:
+            self.session.execute(final_grades_table.delete().where(final_grades_table.c.student_id.in_(deletes)))
+        self.session.commit()
+        return stale
+
+    def _ranked(self):
+        fg = final_grades_table.c
+        return select(
+            func.rank().over(order_by=fg.final_grade.desc()).label('rank'),
+            (func.percent_rank(type_=Float).over(order_by=fg.final_grade) * 100).label('percentile'),
+            fg.student_id,
+            fg.final_grade,
+        ).subquery()
+
+    def top(self, limit: int) -> list[RankedGrade]:
+        ranked = self._ranked()
+        stmt = select(ranked).order_by(ranked.c.rank, ranked.c.student_id).limit(limit)
+        return [self._to_ranked(row) for row in self.session.execute(stmt)]
+
+    def rank_of(self, student_id: int) -> Optional[RankedGrade]:
+        ranked = self._ranked()
+        row = self.session.execute(select(ranked).where(ranked.c.student_id == student_id)).first()
+        return self._to_ranked(row) if row else None
+
+    @staticmethod
+    def _to_ranked(row) -> RankedGrade:
+        return RankedGrade(row.rank, round(row.percentile, 2), row.student_id, row.final_grade)
+
+    def below(self, threshold: float) -> list[FinalGrade]:
+        fg = final_grades_table.c
+        stmt = (
+            select(final_grades_table)
+            .where(fg.final_grade < threshold)
+            .order_by(fg.final_grade, fg.student_id)
+        )
+        return [FinalGrade(**row._asdict()) for row in self.session.execute(stmt)]
+
+    def sorted_grades(self) -> list[float]:
+        fg = final_grades_table.c
+        return list(self.session.execute(select(fg.final_grade).order_by(fg.final_grade)).scalars())
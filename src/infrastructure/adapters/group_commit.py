@@ -0,0 +1,219 @@
+# src/infrastructure/adapters/group_commit.py
+"""Write-behind buffering of evaluation inserts with group commit.
+
+Concurrent `save` calls are queued and written by one background thread in
+batches (up to `max_batch` rows or `max_delay` seconds after the first one), each
+batch with a single multi-row INSERT and a single commit, so the WAL flush is paid
+once per batch instead of once per row. Callers still block until their row is
+committed and get its id back, or the error that row caused.
+
+Callers never wait forever: `save` gives up after `timeout` seconds (cancelling the
+row if it was not picked up yet), an error that escapes a flush is set on every row
+of that batch, and a writer thread that died is restarted on the next `submit`.
+
+Durability levels:
+  - "full": every batch is flushed to disk before the callers are answered.
+  - "relaxed": on PostgreSQL batches commit with `synchronous_commit = off`; a crash
+    may lose the last few hundred milliseconds of acknowledged rows, but never
+    corrupts data. Other databases treat it as "full".
+
+`close()` flushes everything queued before returning; the Flask app registers it
+to run at interpreter exit.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.domain.models import Evaluation
+from src.domain.ports import EvaluationRepository
+from src.infrastructure.adapters.database import SQLAlchemyEvaluationRepository
+from src.infrastructure.metrics import REGISTRY, MetricsRegistry
+
+DURABILITY_LEVELS = ("full", "relaxed")
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """Background writer shared by all requests of a process.
+
+    The thread starts on the first `submit`, in the process that uses it, so a
+    writer created before a pre-fork server forks its workers keeps working.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        max_batch: int = 256,
+        max_delay: float = 0.005,
+        durability: str = "full",
+        timeout: float = 30.0,
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"durability must be one of {DURABILITY_LEVELS}")
+        if max_batch <= 0:
+            raise ValueError("max_batch must be greater than 0")
+        self._session_factory = session_factory
+        self.max_batch = int(max_batch)
+        self.max_delay = float(max_delay)
+        self.durability = durability
+        self.timeout = float(timeout)
+        self._lock = threading.Lock()
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._closed = False
+        self._batch_sizes = registry.histogram(
+            "evaluation_group_commit_batch_size", "Evaluations written per group commit",
+            buckets=BATCH_SIZE_BUCKETS,
+        )
+
+    def submit(self, evaluation: Evaluation) -> "Future[Evaluation]":
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The evaluation writer is closed.")
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._start()
+            self._queue.put((evaluation, future))
+        return future
+
+    def save(self, evaluation: Evaluation, timeout: Optional[float] = None) -> Evaluation:
+        """Submit and wait for the commit, at most `timeout` seconds (default: the writer's)."""
+        future = self.submit(evaluation)
+        try:
+            return future.result(self.timeout if timeout is None else timeout)
+        except FutureTimeoutError:
+            # Not written if it was still queued; otherwise its batch is being committed
+            written = "" if future.cancel() else " (it may still be committed)"
+            raise TimeoutError(f"The evaluation was not committed in time{written}.") from None
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting rows and wait until everything queued has been committed."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread is None or self._pid != os.getpid():
+                return
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            # Rows left behind by a thread that died are failed rather than left waiting
+            self._fail_pending(RuntimeError("The evaluation writer stopped before writing the row."))
+
+    def _start(self) -> None:
+        # A forked child does not inherit the parent's thread (nor its queue); a thread
+        # that died in this process is replaced and the new one drains the same queue.
+        if self._pid != os.getpid():
+            self._queue = queue.Queue()
+            self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name="evaluation-group-commit", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            # Rows whose caller gave up (cancelled futures) are dropped
+            batch = [(evaluation, future) for evaluation, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                self._flush(batch)
+            except Exception as e:
+                # e.g. no session could be opened: every caller of the batch gets the error
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _fail_pending(self, error: Exception) -> None:
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(error)
+
+    def _flush(self, batch: List[tuple]) -> None:
+        self._batch_sizes.observe(len(batch))
+        session = self._session_factory()
+        try:
+            try:
+                self._write(session, [evaluation for evaluation, _ in batch])
+            except Exception:
+                session.rollback()
+                # Retry row by row so only the offending callers get an error
+                for evaluation, future in batch:
+                    try:
+                        self._write(session, [evaluation])
+                    except Exception as e:
+                        session.rollback()
+                        future.set_exception(e)
+                    else:
+                        future.set_result(evaluation)
+            else:
+                for evaluation, future in batch:
+                    future.set_result(evaluation)
+        finally:
+            session.close()
+
+    def _write(self, session: Session, evaluations: List[Evaluation]) -> None:
+        if self.durability == "relaxed" and session.get_bind().dialect.name == "postgresql":
+            session.execute(text("SET LOCAL synchronous_commit = off"))
+        SQLAlchemyEvaluationRepository(session).save_many(evaluations)
+
+
+class GroupCommitEvaluationRepository(EvaluationRepository):
+    """EvaluationRepository whose single-row `save` goes through a `GroupCommitWriter`.
+
+    Every other operation is delegated to the request's repository.
+    """
+
+    def __init__(self, repository: EvaluationRepository, writer: GroupCommitWriter):
+        self._repository = repository
+        self._writer = writer
+
+    def save(self, evaluation: Evaluation) -> Evaluation:
+        return self._writer.save(evaluation)
+
+    def find_by_student_id(self, student_id):
+        return self._repository.find_by_student_id(student_id)
+
+    def find_by_student_ids(self, student_ids):
+        return self._repository.find_by_student_ids(student_ids)
+
+    def count_by_student_ids(self, student_ids):
+        return self._repository.count_by_student_ids(student_ids)
+
+    def save_many(self, evaluations):
+        return self._repository.save_many(evaluations)
+
+    def get_totals(self, student_id):
+        return self._repository.get_totals(student_id)
+
+    def aggregate_by_student(self, student_ids):
+        return self._repository.aggregate_by_student(student_ids)
@@ -0,0 +1,64 @@
+# src/infrastructure/adapters/json_provider.py
+"""Flask JSON providers that encode the domain dataclasses directly.
+
+Endpoints can hand `Student`/`Evaluation` objects (and grade breakdown dicts) to
+`jsonify` without going through the mappers first. `FastJSONProvider` uses orjson,
+which serializes dataclasses natively, when it is installed and falls back to the
+standard library encoder otherwise.
+"""
+import dataclasses
+
+from flask.json.provider import DefaultJSONProvider
+
+from src.infrastructure.instrumentation import span
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(obj):
+    # Shallow: nested dataclasses come back through here, so no asdict() deep copy is needed
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return obj.__dict__
+    return DefaultJSONProvider.default(obj)
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Standard library encoder; reports encoding time as the `serialization` span."""
+
+    default = staticmethod(_default)
+
+    def dumps(self, obj, **kwargs):
+        with span("serialization"):
+            return super().dumps(obj, **kwargs)
+
+
+class FastJSONProvider(TimedJSONProvider):
+    """orjson-backed provider; identical to `TimedJSONProvider` when orjson is missing.
+
+    Keys are not sorted and non-ASCII text is emitted as UTF-8 rather than escaped.
+    """
+
+    option = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        with span("serialization"):
+            return orjson.dumps(obj, default=_default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        # Hand the encoded bytes straight to the response, skipping the str round trip
+        with span("serialization"):
+            body = orjson.dumps(obj, default=_default, option=self.option)
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,535 @@
+# src/infrastructure/adapters/read_model.py
+"""In-process read model of the gradebook: every student and evaluation, indexed in RAM.
+
+`GradebookReadModel` holds a dict of students by id with a sorted index of their
+ids, a dict of ids by `code`, the version counters of each student and of the
+listing, and per student its evaluations (in id order) plus their running totals.
+It is bulk loaded from the database (or rebuilt from a columnar snapshot, see
+`snapshot.py`, and caught up), and the `ReadModel*Repository` wrappers keep it
+current: reads, versions for ETags and single final grades are answered from
+memory, writes go to the wrapped SQLAlchemy repository first and the rows they
+touched are read back into the model once committed (write-through).
+
+The model lives in one process. Writes made by other processes (other server
+workers, scripts) are picked up by `catch_up`, which reloads the students and the
+evaluations inserted since the previous catch-ups; the app runs it in a background
+thread every `READ_MODEL_REFRESH_S` seconds while requests keep reading the current
+content. Evaluations are never updated or deleted, so new ids are all there is to
+fetch for them. Ids are assigned before commit, though, so a lower id can become
+visible after a higher one: each catch-up rescans the ids of the last
+`catch_up_overlap` catch-ups (12 by default, a minute at the default interval). An
+evaluation whose transaction commits later than that after a higher id was read is
+only seen by the next full load.
+
+Versions are always read before the rows they describe, so the model may briefly
+hold rows newer than their version (until the next catch-up reads the newer one),
+never the other way around. A version never moves backwards.
+
+For faster startups READ_MODEL_SNAPSHOT points at a snapshot directory written by
+`python -m src.infrastructure.adapters.snapshot export <dir>`.
+"""
+import bisect
+import collections
+import dataclasses
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.domain.models import Student, Evaluation, EvaluationTotals, FinalGrade, RankedGrade
+from src.domain.ports import StudentRepository, EvaluationRepository, FinalGradeRepository
+from src.application.grade_calculator import grade_totals
+from src.infrastructure.adapters.database import (
+    FINAL_GRADE_FIELDS,
+    STUDENTS_COLLECTION,
+    students_table,
+    student_columns,
+    evaluations_table,
+    resource_version_query,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class GradebookReadModel:
+    """Thread-safe, in-memory copy of the students and evaluations tables.
+
+    Students are handed out as copies (callers such as `set_attendance` mutate them
+    before saving); evaluation lists are new lists of the shared, never-modified rows.
+    """
+
+    def __init__(self, catch_up_overlap: int = 12):
+        self._lock = threading.RLock()
+        self._students: Dict[int, Student] = {}
+        # Student ids in ascending order, for keyset pages without sorting
+        self._ids: List[int] = []
+        self._by_code: Dict[str, int] = {}
+        self._versions: Dict[int, int] = {}
+        self._collection_version: Optional[int] = None
+        self._evaluations: Dict[int, List[Evaluation]] = {}
+        self._totals: Dict[int, EvaluationTotals] = {}
+        self._evaluation_ids: set = set()
+        # The highest evaluation id read from the database by the load and each catch-up
+        # since, oldest first; catch_up fetches the ids above the oldest one. Write-through
+        # ids never move them, since lower ids written by other processes may still be
+        # uncommitted.
+        self._watermarks = collections.deque([0], maxlen=catch_up_overlap + 1)
+        self.loaded = False
+
+    # --- Loading ---
+
+    def load(
+        self,
+        students: Iterable[Student],
+        evaluations: Iterable[Evaluation],
+        versions: Optional[Dict[int, int]] = None,
+        collection_version: Optional[int] = None,
+    ) -> None:
+        """Replace the whole content; evaluations are expected in id order.
+
+        Without `versions` (e.g. from a snapshot) the versions are unknown until `catch_up`.
+        """
+        versions = versions or {}
+        with self._lock:
+            self._students, self._ids, self._by_code = {}, [], {}
+            self._versions, self._collection_version = {}, collection_version
+            self._evaluations, self._totals, self._evaluation_ids = {}, {}, set()
+            for student in students:
+                self._put_student(student, versions.get(student.id))
+            max_read_id = 0
+            for ev in self._add_evaluations(evaluations):
+                max_read_id = max(max_read_id, ev.id)
+            self._watermarks.clear()
+            self._watermarks.append(max_read_id)
+            self.loaded = True
+
+    def load_from_database(self, session: Session, batch_size: int = 10000) -> None:
+        collection_version, students, versions = self._read_students(session, batch_size)
+        evaluations = session.execute(
+            select(evaluations_table).order_by(evaluations_table.c.id).execution_options(yield_per=batch_size)
+        )
+        self.load(
+            students,
+            (Evaluation(row.id, row.student_id, row.score, row.weight) for row in evaluations),
+            versions,
+            collection_version,
+        )
+
+    @staticmethod
+    def _read_students(session: Session, batch_size: int) -> Tuple[int, List[Student], Dict[int, int]]:
+        collection_version = session.execute(resource_version_query(STUDENTS_COLLECTION)).scalar() or 0
+        rows = session.execute(
+            select(*student_columns, students_table.c.version).order_by(students_table.c.id)
+            .execution_options(yield_per=batch_size)
+        )
+        students, versions = [], {}
+        for row in rows:
+            students.append(Student(row.id, row.code, row.nombre, row.attendance))
+            versions[row.id] = row.version
+        return collection_version, students, versions
+
+    def catch_up(self, session: Session, batch_size: int = 10000) -> int:
+        """Apply the writes other processes made since the last load or catch-up.
+
+        Reloads every student (attendance may have changed) and fetches the evaluations
+        above the highest id read from the database `catch_up_overlap` catch-ups ago,
+        skipping the ones already known: the overlap covers rows whose transaction
+        committed after a row with a higher id. Returns the number of evaluations added.
+        """
+        with self._lock:
+            scan_from = self._watermarks[0]
+        collection_version, students, versions = self._read_students(session, batch_size)
+        rows = session.execute(
+            select(evaluations_table).where(evaluations_table.c.id > scan_from)
+            .order_by(evaluations_table.c.id).execution_options(yield_per=batch_size)
+        )
+        evaluations = [Evaluation(row.id, row.student_id, row.score, row.weight) for row in rows]
+        with self._lock:
+            self._set_collection_version(collection_version)
+            for student in students:
+                self._put_student(student, versions[student.id])
+            self._watermarks.append(max(self._watermarks[-1], evaluations[-1].id if evaluations else 0))
+            return len(self._add_evaluations(evaluations))
+
+    # --- Snapshots ---
+
+    def save_snapshot(self, path: str) -> dict:
+        """Write the content to the directory `path` in the columnar format of `snapshot.py`."""
+        import numpy as np
+        from src.infrastructure.adapters.snapshot import GradebookSnapshot, StringColumn, save_snapshot
+
+        with self._lock:
+            students = [self._students[sid] for sid in self._ids]
+            evaluations = sorted((ev for evs in self._evaluations.values() for ev in evs), key=lambda ev: ev.id)
+        snapshot = GradebookSnapshot(
+            student_id=np.array([s.id for s in students], dtype=np.int64),
+            code=StringColumn.from_strings(s.code for s in students),
+            nombre=StringColumn.from_strings(s.nombre for s in students),
+            attendance=np.array([s.attendance is not False for s in students], dtype=bool),
+            evaluation_id=np.array([ev.id for ev in evaluations], dtype=np.int64),
+            evaluation_student_id=np.array([ev.student_id for ev in evaluations], dtype=np.int64),
+            score=np.array([ev.score for ev in evaluations], dtype=np.float64),
+            weight=np.array([ev.weight for ev in evaluations], dtype=np.float64),
+        )
+        return save_snapshot(snapshot, path)
+
+    def load_snapshot(self, path: str) -> None:
+        """Replace the content with the snapshot in the directory `path`; versions come with `catch_up`."""
+        from src.infrastructure.adapters.snapshot import load_snapshot
+
+        snap = load_snapshot(path)
+        self.load(
+            (
+                Student(sid, code, nombre, attendance)
+                for sid, code, nombre, attendance in zip(
+                    snap.student_id.tolist(), snap.code, snap.nombre, snap.attendance.tolist()
+                )
+            ),
+            (
+                Evaluation(*row)
+                for row in zip(
+                    snap.evaluation_id.tolist(), snap.evaluation_student_id.tolist(),
+                    snap.score.tolist(), snap.weight.tolist(),
+                )
+            ),
+        )
+
+    # --- Write-through ---
+
+    def put_student(self, student: Student, version: Optional[int] = None) -> None:
+        """Store `student`, read from the database at `version` or later."""
+        with self._lock:
+            self._put_student(dataclasses.replace(student), version)
+
+    def add_evaluations(
+        self, evaluations: Iterable[Evaluation], versions: Optional[Dict[int, Optional[int]]] = None
+    ) -> None:
+        """Add the evaluations not known yet; `versions` are those of their students, read before them."""
+        with self._lock:
+            self._add_evaluations(dataclasses.replace(ev) for ev in evaluations)
+            for sid, version in (versions or {}).items():
+                self._set_version(sid, version)
+
+    def set_collection_version(self, version: Optional[int]) -> None:
+        with self._lock:
+            self._set_collection_version(version)
+
+    def _put_student(self, student: Student, version: Optional[int] = None) -> None:
+        current = self._versions.get(student.id)
+        if version is not None and current is not None and version < current:
+            return  # read before a newer write-through of the same student
+        previous = self._students.get(student.id)
+        if previous is None:
+            if not self._ids or self._ids[-1] < student.id:
+                self._ids.append(student.id)
+            else:
+                bisect.insort(self._ids, student.id)
+        elif previous.code != student.code:
+            self._by_code.pop(previous.code, None)
+        self._students[student.id] = student
+        self._by_code[student.code] = student.id
+        self._set_version(student.id, version)
+
+    def _set_version(self, student_id: int, version: Optional[int]) -> None:
+        if version is not None and version > self._versions.get(student_id, version - 1):
+            self._versions[student_id] = version
+
+    def _set_collection_version(self, version: Optional[int]) -> None:
+        if version is not None and (self._collection_version is None or version > self._collection_version):
+            self._collection_version = version
+
+    def _add_evaluations(self, evaluations: Iterable[Evaluation]) -> List[Evaluation]:
+        added = []
+        for ev in evaluations:
+            if ev.id in self._evaluation_ids:
+                continue
+            self._evaluation_ids.add(ev.id)
+            evaluations = self._evaluations.setdefault(ev.student_id, [])
+            if evaluations and evaluations[-1].id > ev.id:
+                # Caught up after a newer write-through row: keep the list in id order
+                ids = [e.id for e in evaluations]
+                evaluations.insert(bisect.bisect(ids, ev.id), ev)
+            else:
+                evaluations.append(ev)
+            totals = self._totals.get(ev.student_id)
+            if totals is None:
+                totals = self._totals[ev.student_id] = EvaluationTotals(ev.student_id, 0, 0.0, 0.0)
+            totals.evaluation_count += 1
+            totals.total_weight += ev.weight
+            totals.weighted_sum += ev.score * ev.weight
+            added.append(ev)
+        return added
+
+    # --- Reads ---
+
+    def student(self, student_id: int) -> Optional[Student]:
+        with self._lock:
+            student = self._students.get(student_id)
+            return dataclasses.replace(student) if student is not None else None
+
+    def student_by_code(self, code: str) -> Optional[Student]:
+        with self._lock:
+            student_id = self._by_code.get(code)
+            return self.student(student_id) if student_id is not None else None
+
+    def students(self, student_ids: Optional[Iterable[int]] = None) -> List[Student]:
+        with self._lock:
+            if student_ids is None:
+                found = self._students.values()
+            else:
+                found = (self._students.get(sid) for sid in student_ids)
+            return [dataclasses.replace(s) for s in found if s is not None]
+
+    def page(self, after_id: Optional[int], limit: int) -> List[Student]:
+        """Up to `limit` students with id > `after_id`, in id order."""
+        with self._lock:
+            start = 0 if after_id is None else bisect.bisect_right(self._ids, after_id)
+            return [dataclasses.replace(self._students[sid]) for sid in self._ids[start:start + limit]]
+
+    def version(self, student_id: int) -> Optional[int]:
+        with self._lock:
+            return self._versions.get(student_id)
+
+    def collection_version(self) -> Optional[int]:
+        with self._lock:
+            return self._collection_version
+
+    def evaluations(self, student_id: int) -> List[Evaluation]:
+        with self._lock:
+            return list(self._evaluations.get(student_id, ()))
+
+    def totals(self, student_id: int) -> Optional[EvaluationTotals]:
+        with self._lock:
+            totals = self._totals.get(student_id)
+            return dataclasses.replace(totals) if totals is not None else None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"students": len(self._students), "evaluations": len(self._evaluation_ids)}
+
+
+class ReadModelStudentRepository(StudentRepository):
+    """Students read from a `GradebookReadModel`; saves go through `repository` first."""
+
+    def __init__(self, model: GradebookReadModel, repository: StudentRepository):
+        self.model = model
+        self._repository = repository
+
+    def find_by_id(self, student_id: int) -> Optional[Student]:
+        return self.model.student(student_id)
+
+    def find_by_code(self, code: str) -> Optional[Student]:
+        return self.model.student_by_code(code)
+
+    def find_by_ids(self, student_ids: List[int]) -> List[Student]:
+        return self.model.students(student_ids)
+
+    def get_all(self) -> List[Student]:
+        return self.model.students()
+
+    def find_page(self, after_id: Optional[int], limit: int) -> List[Student]:
+        return self.model.page(after_id, limit)
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[Student]:
+        after_id = None
+        while True:
+            page = self.model.page(after_id, batch_size)
+            yield from page
+            if len(page) < batch_size:
+                return
+            after_id = page[-1].id
+
+    def save(self, student: Student) -> Student:
+        saved = self._repository.save(student)
+        # Read back after the commit, versions first (see the module docstring)
+        self.model.set_collection_version(self._repository.get_collection_version())
+        version = self._repository.get_version(saved.id)
+        self.model.put_student(self._repository.find_by_id(saved.id) or saved, version)
+        return saved
+
+    def get_version(self, student_id: int) -> Optional[int]:
+        return self.model.version(student_id)
+
+    def get_collection_version(self) -> Optional[int]:
+        return self.model.collection_version()
+
+    def get_versions(self, student_ids: List[int]) -> Dict[int, Optional[int]]:
+        return {sid: self.model.version(sid) for sid in student_ids}
+
+
+class ReadModelEvaluationRepository(EvaluationRepository):
+    """Evaluations read from a `GradebookReadModel`; inserts go through `repository` first.
+
+    After an insert the student's evaluations and version are read back through
+    `repository` and `students` (the database repositories), so rows other processes
+    added to the same students in the meantime come in with the version that covers them.
+    """
+
+    def __init__(self, model: GradebookReadModel, repository: EvaluationRepository, students: StudentRepository):
+        self.model = model
+        self._repository = repository
+        self._students = students
+
+    def find_by_student_id(self, student_id: int) -> List[Evaluation]:
+        return self.model.evaluations(student_id)
+
+    def find_by_student_ids(self, student_ids: List[int]) -> Dict[int, List[Evaluation]]:
+        return {sid: self.model.evaluations(sid) for sid in student_ids}
+
+    def count_by_student_ids(self, student_ids: List[int]) -> Dict[int, int]:
+        counts = {}
+        for sid in student_ids:
+            totals = self.model.totals(sid)
+            counts[sid] = totals.evaluation_count if totals is not None else 0
+        return counts
+
+    def get_totals(self, student_id: int) -> Optional[EvaluationTotals]:
+        return self.model.totals(student_id)
+
+    def aggregate_by_student(self, student_ids: List[int]) -> Dict[int, EvaluationTotals]:
+        found = ((sid, self.model.totals(sid)) for sid in student_ids)
+        return {sid: totals for sid, totals in found if totals is not None}
+
+    def save(self, evaluation: Evaluation) -> Evaluation:
+        saved = self._repository.save(evaluation)
+        self._read_back([saved])
+        return saved
+
+    def save_many(self, evaluations: List[Evaluation]) -> List[Evaluation]:
+        saved = self._repository.save_many(evaluations)
+        self._read_back(saved)
+        return saved
+
+    def _read_back(self, saved: List[Evaluation]) -> None:
+        student_ids = list(dict.fromkeys(ev.student_id for ev in saved))
+        if not student_ids:
+            return
+        versions = self._students.get_versions(student_ids)
+        current = self._repository.find_by_student_ids(student_ids)
+        self.model.add_evaluations([*saved, *(ev for sid in student_ids for ev in current.get(sid, ()))], versions)
+
+
+class ReadModelFinalGradeRepository(FinalGradeRepository):
+    """Single final grades finished from the model's totals, with the same `grade_totals`
+    the write path stores them with; cohort queries and writes go to `repository`."""
+
+    def __init__(self, model: GradebookReadModel, repository: FinalGradeRepository):
+        self.model = model
+        self._repository = repository
+
+    def find_by_student_id(self, student_id: int) -> Optional[FinalGrade]:
+        found = self.find_with_totals(student_id)
+        return found[0] if found is not None else None
+
+    def find_with_totals(self, student_id: int) -> Optional[Tuple[FinalGrade, EvaluationTotals]]:
+        student, totals = self.model.student(student_id), self.model.totals(student_id)
+        if student is None or totals is None:
+            return None
+        try:
+            result = grade_totals(
+                student_id, student.attendance, totals.total_weight, totals.weighted_sum, totals.evaluation_count
+            )
+        except ValueError:
+            return None
+        return FinalGrade(student_id, *(result[name] for name in FINAL_GRADE_FIELDS)), totals
+
+    def save_many(self, grades: List[FinalGrade]) -> None:
+        self._repository.save_many(grades)
+
+    def delete_many(self, student_ids: List[int]) -> None:
+        self._repository.delete_many(student_ids)
+
+    def save_recomputed(
+        self, grades: List[FinalGrade], removed: List[int], versions: Dict[int, Optional[int]]
+    ) -> List[int]:
+        return self._repository.save_recomputed(grades, removed, versions)
+
+    def top(self, limit: int) -> List[RankedGrade]:
+        return self._repository.top(limit)
+
+    def rank_of(self, student_id: int) -> Optional[RankedGrade]:
+        return self._repository.rank_of(student_id)
+
+    def below(self, threshold: float) -> List[FinalGrade]:
+        return self._repository.below(threshold)
+
+    def sorted_grades(self) -> List[float]:
+        return self._repository.sorted_grades()
+
+
+class ReadModelLoader:
+    """Loads a `GradebookReadModel` on first use and keeps it caught up.
+
+    The first `ensure_current` restores `snapshot` when the file exists (then catches
+    up from the database) and bulk loads from the database otherwise; concurrent first
+    requests wait for it. Later calls start a `catch_up` at most every
+    `refresh_interval` seconds (0 disables it) and return the current model right
+    away: with `background` the catch-up runs in its own thread, otherwise the calling
+    thread runs it while the others keep reading. A failed catch-up is logged and
+    retried at the next interval.
+    """
+
+    def __init__(
+        self,
+        model: GradebookReadModel,
+        session_factory: Callable[[], Session],
+        *,
+        snapshot: Optional[str] = None,
+        refresh_interval: float = 5.0,
+        background: bool = True,
+        clock=time.monotonic,
+    ):
+        self.model = model
+        self._session_factory = session_factory
+        self.snapshot = snapshot
+        self.refresh_interval = refresh_interval
+        self.background = background
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Held by the one catch-up in progress; never waited on by requests
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._next_refresh = None
+
+    def ensure_current(self) -> GradebookReadModel:
+        if not self.model.loaded:
+            with self._lock:
+                if not self.model.loaded:
+                    self._load()
+                    self._next_refresh = self._clock() + self.refresh_interval
+            return self.model
+        if self.refresh_interval and self._clock() >= self._next_refresh and self._refresh_lock.acquire(blocking=False):
+            self._next_refresh = self._clock() + self.refresh_interval
+            if self.background:
+                self._refresh_thread = threading.Thread(target=self._refresh, name="read-model-refresh", daemon=True)
+                self._refresh_thread.start()
+            else:
+                self._refresh()
+        return self.model
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Wait for the background catch-up in progress, if any."""
+        thread = self._refresh_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _load(self) -> None:
+        with self._session_factory() as session:
+            if self.snapshot and os.path.exists(self.snapshot):
+                self.model.load_snapshot(self.snapshot)
+                self.model.catch_up(session)
+            else:
+                self.model.load_from_database(session)
+
+    def _refresh(self) -> None:
+        try:
+            with self._session_factory() as session:
+                self.model.catch_up(session)
+        except Exception:
+            logger.exception("read model catch-up failed; retrying in %ss", self.refresh_interval)
+        finally:
+            self._refresh_lock.release()
@@ -0,0 +1,320 @@
+# src/infrastructure/adapters/snapshot.py
+"""Columnar snapshots of the gradebook: export, bulk import and database-free analytics.
+
+A snapshot is a directory of NumPy `.npy` files, one per column of `students` and
+`evaluations` (strings are stored as one UTF-8 byte buffer plus an offsets array),
+and a `manifest.json` written last. `load_snapshot` memory-maps the files, so
+opening a snapshot is instant and only the pages that are used are read.
+
+Importing writes the rows with PostgreSQL `COPY` (psycopg2) or multi-row INSERTs
+elsewhere, keeping the ids, then derives `evaluation_totals` and `final_grades`
+the same way the write path does. `grade_snapshot` grades the whole cohort straight
+from the mapped columns with `GradeCalculator.calculate_many`.
+
+Usage:
+  python -m src.infrastructure.adapters.snapshot export gradebook.snapshot
+  python -m src.infrastructure.adapters.snapshot import gradebook.snapshot [--replace]
+  python -m src.infrastructure.adapters.snapshot grades gradebook.snapshot [--output grades.json]
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from array import array
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from src.application.grade_calculator import GradeCalculator
+from src.infrastructure.adapters.database import (
+    students_table,
+    evaluations_table,
+    evaluation_totals_table,
+    final_grades_table,
+    STUDENTS_COLLECTION,
+    bump_resource_version,
+    refresh_final_grades,
+)
+
+SNAPSHOT_FORMAT = 1
+MANIFEST = "manifest.json"
+CHUNK = 50000
+
+
+class StringColumn:
+    """Strings packed into one UTF-8 buffer; string i is `data[offsets[i]:offsets[i + 1]]`."""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, values: Iterable[str]) -> "StringColumn":
+        data, offsets = bytearray(), array('q', [0])
+        for value in values:
+            data += value.encode()
+            offsets.append(len(data))
+        return cls(np.frombuffer(bytes(data), dtype=np.uint8), np.asarray(offsets, dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode()
+
+    def __iter__(self) -> Iterator[str]:
+        offsets = self.offsets.tolist()
+        buffer = self.data.tobytes()
+        return (buffer[lo:hi].decode() for lo, hi in zip(offsets, offsets[1:]))
+
+
+@dataclass
+class GradebookSnapshot:
+    # students, in id order
+    student_id: np.ndarray
+    code: StringColumn
+    nombre: StringColumn
+    attendance: np.ndarray
+    # evaluations, in id order
+    evaluation_id: np.ndarray
+    evaluation_student_id: np.ndarray
+    score: np.ndarray
+    weight: np.ndarray
+
+
+ARRAYS = ("student_id", "attendance", "evaluation_id", "evaluation_student_id", "score", "weight")
+STRINGS = ("code", "nombre")
+
+
+def save_snapshot(snapshot: GradebookSnapshot, path: str) -> dict:
+    """Write `snapshot` to the directory `path`; returns the manifest."""
+    os.makedirs(path, exist_ok=True)
+    manifest_path = os.path.join(path, MANIFEST)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    for name in ARRAYS:
+        np.save(os.path.join(path, f"{name}.npy"), getattr(snapshot, name))
+    for name in STRINGS:
+        column = getattr(snapshot, name)
+        np.save(os.path.join(path, f"{name}.data.npy"), column.data)
+        np.save(os.path.join(path, f"{name}.offsets.npy"), column.offsets)
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "students": len(snapshot.student_id),
+        "evaluations": len(snapshot.evaluation_id),
+    }
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    return manifest
+
+
+def load_snapshot(path: str, mmap: bool = True) -> GradebookSnapshot:
+    """Open the snapshot in `path`, memory-mapped unless `mmap` is False."""
+    manifest_path = os.path.join(path, MANIFEST)
+    if not os.path.exists(manifest_path):
+        raise ValueError(f"{path} is not a complete gradebook snapshot (missing {MANIFEST}).")
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported snapshot format: {manifest.get('format')}")
+    mode = "r" if mmap else None
+    columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode) for name in ARRAYS}
+    for name in STRINGS:
+        columns[name] = StringColumn(
+            np.load(os.path.join(path, f"{name}.data.npy"), mmap_mode=mode),
+            np.load(os.path.join(path, f"{name}.offsets.npy"), mmap_mode=mode),
+        )
+    return GradebookSnapshot(**columns)
+
+
+def export_snapshot(session: Session, path: str, batch_size: int = CHUNK) -> dict:
+    """Stream both tables out of the database into a snapshot; returns the manifest."""
+    s, e = students_table.c, evaluations_table.c
+    ids, attendance, codes, names = array('q'), array('b'), [], []
+    stmt = select(s.id, s.code, s.nombre, s.attendance).order_by(s.id).execution_options(yield_per=batch_size)
+    for row in session.execute(stmt):
+        ids.append(row.id)
+        codes.append(row.code)
+        names.append(row.nombre)
+        attendance.append(row.attendance is not False)
+    ev_ids, ev_students, scores, weights = array('q'), array('q'), array('d'), array('d')
+    stmt = select(e.id, e.student_id, e.score, e.weight).order_by(e.id).execution_options(yield_per=batch_size)
+    for row in session.execute(stmt):
+        ev_ids.append(row.id)
+        ev_students.append(row.student_id)
+        scores.append(row.score)
+        weights.append(row.weight)
+    snapshot = GradebookSnapshot(
+        student_id=np.asarray(ids, dtype=np.int64),
+        code=StringColumn.from_strings(codes),
+        nombre=StringColumn.from_strings(names),
+        attendance=np.asarray(attendance, dtype=bool),
+        evaluation_id=np.asarray(ev_ids, dtype=np.int64),
+        evaluation_student_id=np.asarray(ev_students, dtype=np.int64),
+        score=np.asarray(scores, dtype=np.float64),
+        weight=np.asarray(weights, dtype=np.float64),
+    )
+    return save_snapshot(snapshot, path)
+
+
+def _chunks(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _copy_rows(session: Session, table, columns: Sequence[str], rows: Iterable[tuple], chunk: int) -> None:
+    # One COPY per chunk, so a single CSV chunk is buffered at a time
+    cursor = session.connection().connection.dbapi_connection.cursor()
+    sql = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    for batch in _chunks(rows, chunk):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(batch)
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+
+
+def _insert_rows(session: Session, table, columns: Sequence[str], rows: Iterable[tuple], chunk: int) -> None:
+    for batch in _chunks(rows, chunk):
+        session.execute(table.insert(), [dict(zip(columns, row)) for row in batch])
+
+
+def _totals_rows(snapshot: GradebookSnapshot) -> Iterator[tuple]:
+    """Per-student evaluation totals, summed in id order like the incremental upserts."""
+    if len(snapshot.evaluation_id) == 0:
+        return iter(())
+    keys, inverse, counts = np.unique(snapshot.evaluation_student_id, return_inverse=True, return_counts=True)
+    weight = np.asarray(snapshot.weight)
+    total_weight = np.bincount(inverse, weights=weight)
+    weighted_sum = np.bincount(inverse, weights=np.asarray(snapshot.score) * weight)
+    return zip(keys.tolist(), counts.tolist(), total_weight.tolist(), weighted_sum.tolist())
+
+
+def import_snapshot(session: Session, snapshot: GradebookSnapshot, *, replace: bool = False, chunk: int = CHUNK) -> dict:
+    """Bulk load `snapshot` into the database in one transaction, keeping its ids.
+
+    The students table must be empty unless `replace` is set, in which case every
+    student, evaluation and derived row is deleted first. Imported students get a
+    version above any previous one, so no ETag handed out before can match again.
+    """
+    dialect = session.get_bind().dialect
+    previous = session.execute(select(func.count(), func.max(students_table.c.version))).one()
+    if previous[0]:
+        if not replace:
+            raise ValueError("The students table is not empty; import with replace (--replace) to overwrite it.")
+        for table in (final_grades_table, evaluation_totals_table, evaluations_table, students_table):
+            session.execute(table.delete())
+    version = (previous[1] or 0) + 1
+
+    started = time.perf_counter()
+    write = _copy_rows if dialect.name == "postgresql" and dialect.driver == "psycopg2" else _insert_rows
+    student_ids = snapshot.student_id.tolist()
+    write(session, students_table, ("id", "code", "nombre", "attendance", "version"), zip(
+        student_ids, snapshot.code, snapshot.nombre, snapshot.attendance.tolist(), [version] * len(student_ids),
+    ), chunk)
+    write(session, evaluations_table, ("id", "student_id", "score", "weight"), zip(
+        snapshot.evaluation_id.tolist(), snapshot.evaluation_student_id.tolist(),
+        snapshot.score.tolist(), snapshot.weight.tolist(),
+    ), chunk)
+    write(session, evaluation_totals_table, ("student_id", "evaluation_count", "total_weight", "weighted_sum"),
+          _totals_rows(snapshot), chunk)
+    if dialect.name == "postgresql":
+        # Explicit ids do not advance the SERIAL sequences
+        for table in (students_table, evaluations_table):
+            session.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table.name}), 0) + 1, false)"
+            ))
+    for lo in range(0, len(student_ids), chunk):
+        refresh_final_grades(session, student_ids[lo:lo + chunk])
+    upsert, rows = bump_resource_version(STUDENTS_COLLECTION)
+    upsert.execute(session, rows)
+    session.commit()
+    return {
+        "students": len(student_ids),
+        "evaluations": len(snapshot.evaluation_id),
+        "elapsed_s": round(time.perf_counter() - started, 3),
+    }
+
+
+def grade_snapshot(snapshot: GradebookSnapshot, include_details: bool = False) -> dict:
+    """Grade every student of the snapshot without a database.
+
+    Returns {"grades": {student_id: breakdown}, "failed": [student_id]}; the breakdowns
+    are those of `GradeCalculator.calculate_final`. Students without evaluations, over
+    the evaluation limit or with a total weight of 0 are listed in `failed`.
+    """
+    calc = GradeCalculator()
+    sids = np.asarray(snapshot.evaluation_student_id)
+    graded = np.empty(0, dtype=np.int64)
+    grades = {}
+    if sids.size:
+        keys, inverse, counts = np.unique(sids, return_inverse=True, return_counts=True)
+        total_weight = np.bincount(inverse, weights=np.asarray(snapshot.weight))
+        graded = keys[(counts <= calc.max_evaluations) & (total_weight > 0)]
+        rows = np.isin(sids, graded)
+        if rows.any():
+            attendance = dict(zip(map(str, snapshot.student_id.tolist()), snapshot.attendance.tolist()))
+            results = calc.calculate_many(
+                sids[rows], np.asarray(snapshot.score)[rows], np.asarray(snapshot.weight)[rows],
+                attendance, include_details=include_details,
+            )
+            grades = {int(sid): result for sid, result in results.items()}
+    failed = np.setdiff1d(np.asarray(snapshot.student_id), graded).tolist()
+    return {"grades": grades, "failed": failed}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Export, import or grade a columnar gradebook snapshot.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("export", help="dump students and evaluations").add_argument("path")
+    load = commands.add_parser("import", help="bulk load a snapshot into the database")
+    load.add_argument("path")
+    load.add_argument("--replace", action="store_true", help="delete the current students and evaluations first")
+    grades = commands.add_parser("grades", help="grade the cohort straight from the snapshot")
+    grades.add_argument("path")
+    grades.add_argument("--output", help="write every grade to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.command == "grades":
+        started = time.perf_counter()
+        report = grade_snapshot(load_snapshot(args.path))
+        finals = [g["final_grade"] for g in report["grades"].values()]
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(report, f)
+        print(json.dumps({
+            "graded": len(finals),
+            "failed": len(report["failed"]),
+            "mean": round(sum(finals) / len(finals), 4) if finals else None,
+            "elapsed_s": round(time.perf_counter() - started, 3),
+        }))
+        return
+
+    # Composition root for export/import
+    from src.infrastructure.config import SessionLocal
+
+    with SessionLocal() as session:
+        if args.command == "export":
+            summary = export_snapshot(session, args.path)
+        else:
+            try:
+                summary = import_snapshot(session, load_snapshot(args.path), replace=args.replace)
+            except ValueError as e:
+                print(str(e), file=sys.stderr)
+                sys.exit(1)
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
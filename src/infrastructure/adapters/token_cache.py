@@ -0,0 +1,68 @@
+# src/infrastructure/adapters/token_cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class VerifiedTokenCache:
+    """Thread-safe LRU of already verified JWTs, so a token's signature is checked once.
+
+    Entries are keyed by the SHA-256 digest of the token (the token itself is not kept)
+    and never outlive the token's `exp` claim nor `ttl` seconds, so a cached token stops
+    being accepted no later than a fresh verification would reject it.
+    """
+
+    def __init__(self, max_size: int = 4096, ttl: Optional[float] = 300.0, clock=time.time):
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than 0")
+        self.max_size = int(max_size)
+        self.ttl = float(ttl) if ttl else None
+        # Wall clock: `exp` claims are Unix timestamps
+        self._clock = clock
+        self._lock = threading.Lock()
+        # token digest -> (expires_at, verified value)
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Any]:
+        key = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._entries[key]
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return value
+
+    def set(self, token: str, exp: Optional[float], value: Any) -> None:
+        """Remember `value` for `token` until its `exp` (Unix time, None = no expiry) or the TTL."""
+        deadlines = [d for d in (exp, self._clock() + self.ttl if self.ttl else None) if d is not None]
+        expires_at = min(deadlines) if deadlines else None
+        key = self._digest(token)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._counters, "size": len(self._entries)}
@@ -1,7 +1,8 @@
 # src/infrastructure/config.py
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import threading
+from typing import Optional
+
 from dotenv import load_dotenv
 
 # Carga las variables de entorno desde el archivo .env
@@ -9,6 +10,137 @@ load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-# Creamos el motor de la base de datos y la sesión
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+# Clave para firmar los JWT, compartida por todos los adaptadores de entrada
+JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "super-secret-key-for-dev") # Una clave por defecto para desarrollo
+
+# Caché de tokens JWT ya verificados: número máximo (0 la desactiva) y vida máxima en segundos
+# (nunca más allá del `exp` del token)
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "4096"))
+JWT_CACHE_TTL = float(os.getenv("JWT_CACHE_TTL", "300"))
+
+# Pool de conexiones (ignorado en SQLite, que usa su propio pool)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# Tiempo máximo por sentencia en milisegundos (0 = sin límite; solo PostgreSQL)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+# Caché de notas en proceso: número máximo de estudiantes (0 la desactiva) y TTL en segundos (0 = sin expiración).
+# Cada entrada se valida contra students.version, así que sirve con varios workers de gunicorn
+GRADE_CACHE_SIZE = int(os.getenv("GRADE_CACHE_SIZE", "1024"))
+GRADE_CACHE_TTL = float(os.getenv("GRADE_CACHE_TTL", "300"))
+
+# Peticiones que ejecuten más sentencias SQL que este umbral se registran como posible N+1 (0 lo desactiva)
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "20"))
+
+# Serializa las respuestas JSON con orjson cuando está instalado (false fuerza el json de la stdlib)
+FAST_JSON = os.getenv("FAST_JSON", "true").lower() in ("1", "true", "yes")
+
+# Nota mínima aprobatoria (escala 0-20), umbral por defecto de /api/grades/below
+PASSING_GRADE = float(os.getenv("PASSING_GRADE", "10.5"))
+
+# Escritura diferida de evaluaciones: las inserciones individuales se agrupan y se confirman en lote
+# (group commit) al llegar a GROUP_COMMIT_MAX_BATCH filas o tras GROUP_COMMIT_MAX_DELAY_MS milisegundos.
+# EVALUATION_DURABILITY: "full" (cada lote se sincroniza a disco) o "relaxed" (synchronous_commit=off en
+# PostgreSQL: una caída puede perder los últimos lotes confirmados, nunca corromper datos)
+EVALUATION_WRITE_BEHIND = os.getenv("EVALUATION_WRITE_BEHIND", "false").lower() in ("1", "true", "yes")
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("GROUP_COMMIT_MAX_BATCH", "256"))
+GROUP_COMMIT_MAX_DELAY_MS = float(os.getenv("GROUP_COMMIT_MAX_DELAY_MS", "5"))
+EVALUATION_DURABILITY = os.getenv("EVALUATION_DURABILITY", "full")
+
+# Modelo de lectura en memoria: estudiantes y evaluaciones se leen de RAM en lugar de la base de datos.
+# Se carga al primer uso (desde la instantánea columnar READ_MODEL_SNAPSHOT si existe) y cada READ_MODEL_REFRESH_S
+# segundos incorpora lo escrito por otros procesos (0 lo desactiva). Es por proceso: gunicorn.conf.py exige un solo worker
+READ_MODEL = os.getenv("READ_MODEL", "false").lower() in ("1", "true", "yes")
+READ_MODEL_SNAPSHOT = os.getenv("READ_MODEL_SNAPSHOT") or None
+READ_MODEL_REFRESH_S = float(os.getenv("READ_MODEL_REFRESH_S", "5"))
+
+
+def engine_options(url: str) -> dict:
+    """Keyword arguments for create_engine derived from the DB_* settings."""
+    if url.startswith("sqlite"):
+        return {}
+    options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if DB_STATEMENT_TIMEOUT_MS > 0 and url.startswith("postgresql"):
+        options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+class Database:
+    """Engine and session factory for `url`, built on first use.
+
+    Importing this module stays cheap: SQLAlchemy is imported and the pool created only
+    when the engine or a session is first requested. The engine is instrumented
+    (pool and per-request SQL metrics) as it is created.
+    """
+
+    def __init__(self, url: Optional[str]):
+        self.url = url
+        self._engine = None
+        self._sessionmaker = None
+        self._lock = threading.Lock()
+
+    @property
+    def created(self) -> bool:
+        return self._engine is not None
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    self._create()
+        return self._engine
+
+    @property
+    def sessionmaker(self):
+        self.engine
+        return self._sessionmaker
+
+    def session(self):
+        return self.sessionmaker()
+
+    def dispose(self, close: bool = True) -> None:
+        """Drop the engine and its pool; the next use builds new ones.
+
+        In a freshly forked server worker call it with `close=False`: the inherited
+        connections belong to the parent process and must be neither used nor closed
+        from the child.
+        """
+        with self._lock:
+            engine, self._engine, self._sessionmaker = self._engine, None, None
+        if engine is not None:
+            engine.dispose(close=close)
+
+    def _create(self) -> None:
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from src.infrastructure.instrumentation import instrument_engine
+        from src.infrastructure.pool_metrics import instrument_pool
+
+        engine = create_engine(self.url, **engine_options(self.url or ""))
+        instrument_pool(engine)
+        instrument_engine(engine)
+        self._sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self._engine = engine
+
+
+# Base de datos por defecto (DATABASE_URL); el motor se crea la primera vez que se usa
+database = Database(DATABASE_URL)
+
+
+def __getattr__(name: str):
+    # `engine` y `SessionLocal` se siguen pudiendo importar, pero se resuelven de forma perezosa
+    if name == "engine":
+        return database.engine
+    if name == "SessionLocal":
+        return database.sessionmaker
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
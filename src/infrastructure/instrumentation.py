@@ -0,0 +1,149 @@
+# src/infrastructure/instrumentation.py
+"""Per-request timing across the layers: request totals, named spans and SQL queries.
+
+The adapter opens a `RequestStats` with `start_request` and closes it with
+`finish_request`; in between, `span()` blocks, `Timed` proxies and the engine hooks
+installed by `instrument_engine` report into it. Everything ends up in histograms of
+the metrics registry, labelled by endpoint. Outside a request all of it is a no-op.
+"""
+import contextvars
+import logging
+import time
+from collections import Counter as _Tally
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.infrastructure.metrics import REGISTRY, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250, 1000)
+SQL_DURATION_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class RequestStats:
+    """What happened while serving one request."""
+
+    __slots__ = ("endpoint", "method", "started", "status", "queries", "query_seconds", "statements")
+
+    def __init__(self, endpoint: str, method: str):
+        self.endpoint = endpoint
+        self.method = method
+        self.started = time.perf_counter()
+        self.status = 0
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.statements = _Tally()
+
+
+_current: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("request_stats", default=None)
+
+
+def current_request() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def start_request(endpoint: str, method: str) -> RequestStats:
+    stats = RequestStats(endpoint, method)
+    _current.set(stats)
+    return stats
+
+
+def finish_request(n_plus_one_threshold: int = 0, registry: MetricsRegistry = REGISTRY) -> Optional[RequestStats]:
+    """Record the request that is being served and flag it when it ran too many queries.
+
+    `n_plus_one_threshold` <= 0 disables the N+1 warning.
+    """
+    stats = _current.get()
+    if stats is None:
+        return None
+    _current.set(None)
+    registry.histogram(
+        "http_request_duration_seconds", "Request latency", ("method", "endpoint", "status"),
+    ).observe(time.perf_counter() - stats.started, method=stats.method, endpoint=stats.endpoint, status=stats.status)
+    registry.histogram(
+        "db_queries_per_request", "SQL statements executed per request", ("endpoint",), buckets=QUERY_COUNT_BUCKETS,
+    ).observe(stats.queries, endpoint=stats.endpoint)
+    if 0 < n_plus_one_threshold < stats.queries:
+        registry.counter(
+            "db_n_plus_one_requests_total", "Requests over the per-request query threshold", ("endpoint",),
+        ).inc(endpoint=stats.endpoint)
+        statement, repeats = stats.statements.most_common(1)[0]
+        logger.warning(
+            "Possible N+1: %s %s ran %d queries (%.1f ms in SQL); most repeated (%dx): %s",
+            stats.method, stats.endpoint, stats.queries, stats.query_seconds * 1000, repeats,
+            " ".join(statement.split())[:200],
+        )
+    return stats
+
+
+@contextmanager
+def span(name: str, registry: MetricsRegistry = REGISTRY):
+    """Time a block as stage `name` of the current request."""
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.histogram(
+            "http_request_span_seconds", "Time spent per stage of a request", ("endpoint", "span"),
+        ).observe(time.perf_counter() - start, endpoint=stats.endpoint, span=name)
+
+
+class Timed:
+    """Proxy that times every public method call of `target` as span `<prefix>.<method>`."""
+
+    def __init__(self, target: Any, prefix: str):
+        self._target = target
+        self._prefix = prefix
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._target, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        label = f"{self._prefix}.{name}"
+
+        def timed(*args, **kwargs):
+            with span(label):
+                return attr(*args, **kwargs)
+
+        return timed
+
+    def __setattr__(self, name, value):
+        if name in ("_target", "_prefix"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._target, name, value)
+
+
+def instrument_engine(engine: Engine, registry: MetricsRegistry = REGISTRY) -> None:
+    """Count and time every statement `engine` executes, per request and per SQL verb."""
+    duration = registry.histogram(
+        "db_query_duration_seconds", "SQL statement latency", ("operation",), buckets=SQL_DURATION_BUCKETS,
+    )
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+        duration.observe(elapsed, operation=operation)
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.query_seconds += elapsed
+            stats.statements[statement] += 1
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context):
+        if context.connection is not None and context.connection.info.get("query_start"):
+            context.connection.info["query_start"].pop()
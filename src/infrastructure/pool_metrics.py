@@ -0,0 +1,60 @@
+# src/infrastructure/pool_metrics.py
+"""Connection-pool metrics: connections in use, checkouts and checkout wait time."""
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.infrastructure.metrics import REGISTRY, MetricsRegistry
+
+CHECKOUT_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+def instrument_pool(engine: Engine, registry: MetricsRegistry = REGISTRY) -> None:
+    """Attach pool event listeners and export the pool state of `engine`."""
+    pool = engine.pool
+    in_use = registry.gauge("db_pool_connections_in_use", "Connections currently checked out of the pool")
+    checkouts = registry.counter("db_pool_checkouts_total", "Connections checked out of the pool")
+    connects = registry.counter("db_pool_connects_total", "New DBAPI connections opened by the pool")
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_conn, conn_record, conn_proxy):
+        in_use.inc()
+        checkouts.inc()
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_conn, conn_record):
+        in_use.dec()
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_conn, conn_record):
+        connects.inc()
+
+    # QueuePool exposes its sizing; other pools (e.g. SQLite's) do not
+    if hasattr(pool, "size") and hasattr(pool, "overflow"):
+        registry.gauge("db_pool_size", "Configured pool size", callback=pool.size)
+        registry.gauge("db_pool_overflow", "Connections open beyond the pool size", callback=pool.overflow)
+        registry.gauge("db_pool_checked_in", "Idle connections in the pool", callback=pool.checkedin)
+
+
+def checkout_connection(session: Session, registry: MetricsRegistry = REGISTRY) -> None:
+    """Acquire the session's connection now and record how long the pool made us wait."""
+    start = time.perf_counter()
+    session.connection()
+    registry.histogram(
+        "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+        buckets=CHECKOUT_WAIT_BUCKETS,
+    ).observe(time.perf_counter() - start)
+
+
+def pool_status(engine: Engine) -> dict:
+    """Snapshot of the pool of `engine`: connections checked out and, for QueuePool, its sizing."""
+    pool = engine.pool
+    status = {"class": type(pool).__name__}
+    if hasattr(pool, "checkedout"):
+        status["checked_out"] = pool.checkedout()
+    if hasattr(pool, "size") and hasattr(pool, "overflow"):
+        status.update(size=pool.size(), overflow=pool.overflow(), checked_in=pool.checkedin(),
+                      max_overflow=pool._max_overflow)
+    return status
@@ -0,0 +1,5 @@
+import os
+
+# Always an in-memory database, whatever DATABASE_URL the shell (or the container's env_file)
+# exports: the API tests create and drop every table of the default engine.
+os.environ["DATABASE_URL"] = "sqlite://"
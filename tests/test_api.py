@@ -0,0 +1,240 @@
+import os
+
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-with-at-least-32-bytes")
+
+import pytest
+from sqlalchemy import event
+
+from src.infrastructure.adapters import api
+from src.infrastructure.adapters.database import metadata
+from src.infrastructure.config import engine
+from src.infrastructure.metrics import REGISTRY
+
+
+@pytest.fixture
+def client():
+    assert str(engine.url) == "sqlite://", "the API tests only run against an in-memory database"
+    metadata.create_all(bind=engine)
+    grade_cache = api.app.extensions["grade_cache"]
+    if grade_cache is not None:
+        grade_cache.clear()
+    yield api.app.test_client()
+    metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def auth(client):
+    token = client.post('/api/login', json={"username": "admin", "password": "admin"}).json['access_token']
+    return {"Authorization": "Bearer " + token}
+
+
+def test_sessions_are_returned_to_the_pool_after_each_request(client, auth):
+    client.post('/api/seed')
+    for _ in range(3):
+        assert client.get('/api/students', headers=auth).status_code == 200
+    assert REGISTRY.gauge("db_pool_connections_in_use", "").value() == 0
+
+    body = client.get('/metrics').data.decode()
+    assert 'db_pool_checkout_wait_seconds_count' in body
+    assert 'grade_cache_hits_total' in body
+
+
+def test_bulk_grades_endpoint(client, auth):
+    client.post('/api/seed')
+    res = client.get('/api/grades?student_ids=1,3', headers=auth)
+    assert res.status_code == 200
+    assert [r['student_id'] for r in res.json] == [1, 3]
+    assert res.json[0]['final_grade'] == 15.0
+    assert 'error' in res.json[1]
+    assert client.get('/api/grades?student_ids=a', headers=auth).status_code == 400
+
+
+def test_grade_requests_are_timed_per_layer(client, auth):
+    client.post('/api/seed')
+    assert client.get('/api/students/1/grade', headers=auth).status_code == 200
+
+    body = client.get('/metrics').data.decode()
+    endpoint = 'endpoint="/api/students/<int:student_id>/grade"'
+    assert f'http_request_duration_seconds_count{{method="GET",{endpoint},status="200"}} 1' in body
+    assert f'db_queries_per_request_count{{{endpoint}}} 1' in body
+    for name in ("session", "service.calcular_nota_final", "final_grade_repo.find_with_totals", "serialization"):
+        assert f'http_request_span_seconds_count{{{endpoint},span="{name}"}}' in body
+
+
+def test_grade_endpoint_reads_the_materialized_grade(client, auth):
+    client.post('/api/seed')
+    assert client.get('/api/students/1/grade', headers=auth).json == {
+        "weighted_average": 15.0, "attendance_penalty": 0.0, "extra_points": 0.0, "final_grade": 15.0,
+        "details": {"evaluation_count": 2, "total_weight": 100.0, "weighted_sum": 1500.0},
+    }
+    client.post('/api/students/1/attendance', json={"attendance": False}, headers=auth)
+    client.post('/api/evaluations', json={"student_id": 3, "score": 12, "weight": 100}, headers=auth)
+
+    assert client.get('/api/students/1/grade', headers=auth).json['final_grade'] == 14.0
+    assert client.get('/api/students/3/grade', headers=auth).json['final_grade'] == 11.0
+    detailed = client.get('/api/students/1/grade?details=true', headers=auth).json
+    assert detailed['final_grade'] == 14.0 and len(detailed['details']['evaluations']) == 2
+    # ?details=true gives the same breakdown as the bulk route's default
+    bulk = client.get('/api/grades?student_ids=1', headers=auth).json[0]
+    assert detailed == {k: v for k, v in bulk.items() if k != 'student_id'}
+
+
+def test_cached_grade_reads_the_student_version_once(client, auth):
+    client.post('/api/seed')
+    client.get('/api/students/1/grade', headers=auth)
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert client.get('/api/students/1/grade', headers=auth).json['final_grade'] == 15.0
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    # The ETag's version read is also the grade cache check; the cache hit needs nothing else
+    assert len([q for q in statements if 'students.version' in q]) == 1 and len(statements) == 1
+
+
+def test_ranking_threshold_and_distribution_endpoints(client, auth):
+    client.post('/api/seed')  # final grades: 1 -> 15.0, 2 -> 18.0, 3 has no evaluations
+    client.post('/api/evaluations', json={"student_id": 3, "score": 9, "weight": 100}, headers=auth)  # 8.0 (penalty)
+
+    ranking = client.get('/api/grades/ranking?limit=2', headers=auth).json
+    assert [(r['rank'], r['student_id'], r['final_grade']) for r in ranking] == [(1, 2, 18.0), (2, 1, 15.0)]
+    # Share of the other graded students strictly below: 2 of 2, then 1 of 2
+    assert [r['percentile'] for r in ranking] == [100.0, 50.0]
+    assert client.get('/api/students/3/rank', headers=auth).json['rank'] == 3
+
+    below = client.get('/api/grades/below', headers=auth).json
+    assert [(g['student_id'], g['final_grade']) for g in below] == [(3, 8.0)]
+
+    stats = client.get('/api/grades/stats?bucket=5&percentiles=50', headers=auth).json
+    assert (stats['count'], stats['min'], stats['max']) == (3, 8.0, 18.0)
+    assert stats['percentiles'] == {"p50": 15.0}
+    assert [(b['from'], b['count']) for b in stats['histogram']] == [(5.0, 1), (10.0, 0), (15.0, 2)]
+    assert client.get('/api/grades/stats?bucket=0', headers=auth).status_code == 400
+    # Tiny widths are rejected instead of producing (or looping over) millions of buckets
+    for bucket in ('1e-300', '1e-4', 'nan', 'inf'):
+        assert client.get(f'/api/grades/stats?bucket={bucket}', headers=auth).status_code == 400
+    assert client.get('/api/grades/stats?bucket=0.01', headers=auth).status_code == 400
+    assert len(client.get('/api/grades/stats?bucket=0.1', headers=auth).json['histogram']) == 101
+
+
+def test_app_factory_with_its_own_database(tmp_path, auth):
+    other = api.create_app({"DATABASE_URL": f"sqlite:///{tmp_path / 'other.db'}", "GRADE_CACHE_SIZE": 0})
+    database = other.extensions["database"]
+    assert database is not api.app.extensions["database"] and not database.created
+    assert other.extensions["grade_cache"] is None
+
+    metadata.create_all(bind=database.engine)
+    c = other.test_client()
+    assert c.post('/api/seed').status_code == 201
+    assert c.get('/api/students/2/grade', headers=auth).json['final_grade'] == 18.0
+    database.engine.dispose()
+
+
+def test_evaluations_are_group_committed_in_write_behind_mode(tmp_path, auth):
+    other = api.create_app({"DATABASE_URL": f"sqlite:///{tmp_path / 'wb.db'}", "EVALUATION_WRITE_BEHIND": True})
+    writer = other.extensions["evaluation_writer"]
+    metadata.create_all(bind=other.extensions["database"].engine)
+    c = other.test_client()
+    c.post('/api/seed')
+
+    created = c.post('/api/evaluations', json={"student_id": 1, "score": 20, "weight": 10}, headers=auth)
+    assert created.status_code == 201 and created.json['id'] is not None
+    assert c.post('/api/evaluations', json={"student_id": 999, "score": 20, "weight": 10},
+                  headers=auth).status_code == 400
+    writer.close()
+    ids = [ev['id'] for ev in c.get('/api/students/1/evaluations', headers=auth).json]
+    assert created.json['id'] in ids
+    other.extensions["database"].engine.dispose()
+
+
+def test_read_model_serves_reads_and_sees_writes(tmp_path, auth):
+    other = api.create_app({"DATABASE_URL": f"sqlite:///{tmp_path / 'rm.db'}", "READ_MODEL": True,
+                            "GRADE_CACHE_SIZE": 0})
+    metadata.create_all(bind=other.extensions["database"].engine)
+    c = other.test_client()
+    c.post('/api/seed')
+    assert c.get('/api/students', headers=auth).json[0]['code'] == 'S001'
+    model = other.extensions["read_model"].model
+    assert model.stats()["students"] == 3
+
+    created = c.post('/api/evaluations', json={"student_id": 1, "score": 20, "weight": 10}, headers=auth)
+    assert created.json['id'] in [ev.id for ev in model.evaluations(1)]
+    ids = [ev['id'] for ev in c.get('/api/students/1/evaluations', headers=auth).json]
+    assert created.json['id'] in ids
+
+    # Reads served from memory do not even check out a pooled connection
+    checkouts = []
+    event.listen(other.extensions["database"].engine, "checkout", lambda *args: checkouts.append(1))
+    for path in ('/api/students', '/api/students/1/grade', '/api/students/2/grade?details=false',
+                 '/api/students/1/evaluations'):
+        assert c.get(path, headers=auth).status_code == 200
+    assert checkouts == []
+    other.extensions["database"].engine.dispose()
+
+
+def test_grade_cache_is_revalidated_against_writes_from_other_workers(tmp_path, auth):
+    url = f"sqlite:///{tmp_path / 'shared.db'}"
+    first, second = api.create_app({"DATABASE_URL": url}), api.create_app({"DATABASE_URL": url})
+    metadata.create_all(bind=first.extensions["database"].engine)
+    a, b = first.test_client(), second.test_client()
+    a.post('/api/seed')
+    assert a.get('/api/students/1/grade?details=true', headers=auth).json['final_grade'] == 15.0
+
+    # Written through the other app, whose invalidation cannot reach this cache
+    b.post('/api/evaluations', json={"student_id": 1, "score": 20, "weight": 100}, headers=auth)
+    fresh = a.get('/api/students/1/grade?details=true', headers=auth)
+    assert fresh.json['final_grade'] == b.get('/api/students/1/grade?details=true', headers=auth).json['final_grade']
+    assert len(fresh.json['details']['evaluations']) == 3
+    assert first.extensions["grade_cache"].stats()["stale"] == 1
+    for app in (first, second):
+        app.extensions["database"].engine.dispose()
+
+
+def test_liveness_and_readiness_probes(client, tmp_path):
+    live = client.get('/healthz')
+    assert live.status_code == 200 and live.json['status'] == 'ok'
+    ready = client.get('/readyz')
+    assert ready.status_code == 200 and ready.json['status'] == 'ready' and ready.json['pool']['class']
+
+    broken = api.create_app({"DATABASE_URL": f"sqlite:///{tmp_path / 'missing' / 'x.db'}"})
+    response = broken.test_client().get('/readyz')
+    assert response.status_code == 503 and response.json['reason'] == 'OperationalError'
+
+
+def test_flask_routes_reuse_verified_tokens():
+    app = api.create_app({"JWT_SECRET_KEY": "another-test-secret-key-of-32-bytes!"})
+    client = app.test_client()
+    token = client.post('/api/login', json={"username": "admin", "password": "admin"}).json['access_token']
+    for _ in range(3):
+        assert client.get('/api/cache/stats', headers={"Authorization": "Bearer " + token}).status_code == 200
+    assert client.get('/api/cache/stats', headers={"Authorization": "Bearer " + token[:-2]}).status_code == 422
+    assert client.post('/api/evaluations', json={}).status_code == 401
+    stats = app.extensions["token_cache"].stats()
+    assert (stats["hits"], stats["size"]) == (2, 1)
+
+
+def test_conditional_get_with_etags(client, auth):
+    client.post('/api/seed')
+    first = client.get('/api/students/1/grade', headers=auth)
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+
+    cached = client.get('/api/students/1/grade', headers={**auth, "If-None-Match": etag})
+    assert cached.status_code == 304 and cached.data == b'' and cached.headers['ETag'] == etag
+    detailed = client.get('/api/students/1/grade?details=true', headers={**auth, "If-None-Match": etag})
+    assert detailed.status_code == 200
+
+    listing = client.get('/api/students', headers=auth).headers['ETag']
+    evaluations = client.get('/api/students/1/evaluations', headers=auth).headers['ETag']
+    client.post('/api/evaluations', json={"student_id": 1, "score": 20, "weight": 0}, headers=auth)
+    assert client.get('/api/students/1/grade', headers={**auth, "If-None-Match": etag}).status_code == 200
+    assert client.get('/api/students/1/evaluations', headers={**auth, "If-None-Match": evaluations}).status_code == 200
+    assert client.get('/api/students', headers={**auth, "If-None-Match": listing}).status_code == 304
+
+    client.post('/api/students/2/attendance', json={"attendance": False}, headers=auth)
+    assert client.get('/api/students', headers={**auth, "If-None-Match": listing}).status_code == 200
+    assert 'ETag' not in client.get('/api/students/404/grade', headers=auth).headers
@@ -1,7 +1,7 @@
 import pytest
 from src.application.services import StudentService
 from src.application.mappers import StudentMapper, EvaluationMapper
-from src.domain.models import Student, Evaluation
+from src.domain.models import Student, Evaluation, EvaluationTotals
 from src.domain.ports import StudentRepository, EvaluationRepository
 
 
@@ -45,6 +45,16 @@ class FakeEvaluationRepository(EvaluationRepository):
             self._evaluations.append(evaluation)
         return evaluation
 
+    def aggregate_by_student(self, student_ids):
+        totals = {}
+        for e in self._evaluations:
+            if e.student_id in student_ids:
+                t = totals.setdefault(e.student_id, EvaluationTotals(e.student_id, 0, 0.0, 0.0))
+                t.evaluation_count += 1
+                t.total_weight += e.weight
+                t.weighted_sum += e.score * e.weight
+        return totals
+
 
 def test_student_lifecycle_and_grade():
     student_repo = FakeStudentRepository()
@@ -83,4 +93,42 @@ def test_mappers():
 
     e = Evaluation(id=1, student_id=1, score=14.0, weight=100)
     ed = EvaluationMapper.to_dict(e)
-    assert ed['score'] == 14.0
\ No newline at end of file
+    assert ed['score'] == 14.0
+
+def test_bulk_grades_for_selected_and_whole_cohort():
+    student_repo = FakeStudentRepository()
+    eval_repo = FakeEvaluationRepository()
+    service = StudentService(student_repo, eval_repo)
+
+    a = service.crear_estudiante('A1', 'Ana', attendance=True)
+    b = service.crear_estudiante('B1', 'Beto', attendance=False)
+    service.crear_estudiante('C1', 'Sin notas', attendance=True)
+    service.agregar_evaluacion(a.id, 12, 50)
+    service.agregar_evaluacion(a.id, 18, 50)
+    service.agregar_evaluacion(b.id, 14, 100)
+
+    res = service.calcular_notas_finales([b.id, 99, a.id, b.id])
+    assert [r['student_id'] for r in res] == [b.id, 99, a.id]
+    assert res[0]['final_grade'] == 13.0
+    assert 'error' in res[1]
+    assert res[2] == {"student_id": a.id, **service.calcular_nota_final(a.id)}
+
+    cohort = service.calcular_notas_finales()
+    assert len(cohort) == 3
+    assert 'error' in cohort[2]
+
+
+def test_bulk_grades_from_aggregates_match_row_by_row():
+    service = StudentService(FakeStudentRepository(), FakeEvaluationRepository())
+    a = service.crear_estudiante('A1', 'Ana', attendance=False)
+    b = service.crear_estudiante('B1', 'Beto')
+    service.crear_estudiante('C1', 'Sin notas')
+    for score, weight in ((11.3, 20), (14.9, 30), (17.7, 50)):
+        service.agregar_evaluacion(a.id, score, weight)
+    service.agregar_evaluacion(b.id, 19, 100)
+
+    strip = lambda r: {k: v for k, v in r.items() if k != 'details'}
+    rows = service.calcular_notas_finales()
+    aggregated = service.calcular_notas_finales(include_details=False)
+    assert [strip(r) for r in aggregated] == [strip(r) for r in rows]
+    assert aggregated[0]['details']['weighted_sum'] == rows[0]['details']['weighted_sum']
@@ -0,0 +1,60 @@
+import os
+
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-with-at-least-32-bytes")
+
+import pytest
+from sqlalchemy import create_engine, text
+from starlette.testclient import TestClient
+
+from src.infrastructure.adapters.asgi import create_asgi_app
+from src.infrastructure.adapters.database import metadata
+
+
+@pytest.fixture
+def client(tmp_path):
+    url = f"sqlite:///{tmp_path / 'asgi.db'}"
+    engine = create_engine(url)
+    metadata.create_all(bind=engine)
+    engine.dispose()
+    with TestClient(create_asgi_app(url)) as c:
+        c.url = url
+        yield c
+
+
+def test_async_adapter_serves_the_same_grades(client):
+    token = client.post('/api/login', json={"username": "admin", "password": "admin"}).json()['access_token']
+    auth = {"Authorization": "Bearer " + token}
+    assert client.get('/api/students').status_code == 401
+    assert client.get('/api/students/1/grade').status_code == 401
+
+    s = client.post('/api/students', json={"code": "A1", "nombre": "Ana"}, headers=auth).json()
+    assert client.post('/api/evaluations', json={"student_id": s['id'], "score": 12, "weight": 50}, headers=auth).status_code == 201
+    assert client.post('/api/evaluations', json={"student_id": s['id'], "score": 18, "weight": 50}, headers=auth).status_code == 201
+    assert client.post('/api/evaluations', json={"student_id": 99, "score": 1, "weight": 1}, headers=auth).status_code == 400
+    client.post(f"/api/students/{s['id']}/attendance", json={"attendance": False}, headers=auth)
+
+    grade = client.get(f"/api/students/{s['id']}/grade?details=true", headers=auth).json()
+    assert grade['final_grade'] == 14.0
+    assert len(grade['details']['evaluations']) == 2
+    fast = client.get(f"/api/students/{s['id']}/grade", headers=auth).json()
+    assert fast['final_grade'] == 14.0 and fast['details']['evaluation_count'] == 2
+
+    bulk = client.get(f"/api/grades?student_ids={s['id']},99", headers=auth).json()
+    assert bulk[0]['final_grade'] == 14.0 and 'error' in bulk[1]
+    assert [st['code'] for st in client.get('/api/students', headers=auth).json()] == ['A1']
+
+
+def test_async_grade_cache_is_revalidated_against_the_student_version(client):
+    token = client.post('/api/login', json={"username": "admin", "password": "admin"}).json()['access_token']
+    auth = {"Authorization": "Bearer " + token}
+    s = client.post('/api/students', json={"code": "B1", "nombre": "Beto"}, headers=auth).json()
+    client.post('/api/evaluations', json={"student_id": s['id'], "score": 12, "weight": 50}, headers=auth)
+    assert client.get(f"/api/students/{s['id']}/grade?details=true", headers=auth).json()['final_grade'] == 12.0
+
+    # A write made by another process: this app's cache is never told about it
+    engine = create_engine(client.url)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO evaluations (student_id, score, weight) VALUES (:sid, 18, 50)"), {"sid": s['id']})
+        conn.execute(text("UPDATE students SET version = version + 1 WHERE id = :sid"), {"sid": s['id']})
+    engine.dispose()
+    assert client.get(f"/api/students/{s['id']}/grade?details=true", headers=auth).json()['final_grade'] == 15.0
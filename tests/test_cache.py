@@ -0,0 +1,76 @@
+from src.application.services import StudentService
+from src.infrastructure.adapters.cache import InMemoryGradeCache
+from src.infrastructure.adapters.token_cache import VerifiedTokenCache
+from tests.test_application import FakeStudentRepository, FakeEvaluationRepository
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_and_ttl_expiration():
+    clock = FakeClock()
+    cache = InMemoryGradeCache(max_size=2, ttl=10, clock=clock)
+    cache.set(1, True, {"final_grade": 1})
+    cache.set(2, True, {"final_grade": 2})
+    assert cache.get(1, True) == {"final_grade": 1}
+    cache.set(3, True, {"final_grade": 3})  # evicts 2, the least recently used
+    assert cache.get(2, True) is None
+    assert cache.get(1, False) is None
+
+    clock.now = 11
+    assert cache.get(1, True) is None
+    assert cache.stats() == {
+        "hits": 1, "misses": 3, "evictions": 1, "expirations": 1, "invalidations": 0, "stale": 0, "size": 1,
+    }
+
+
+def test_entries_of_another_version_are_dropped():
+    cache = InMemoryGradeCache(max_size=2)
+    cache.set(1, True, {"final_grade": 1}, version=3)
+    assert cache.get(1, True, version=3) == {"final_grade": 1}
+    assert cache.get(1, True, version=4) is None
+    assert cache.get(1, True, version=3) is None
+    assert cache.stats()["stale"] == 1
+
+
+def test_service_invalidates_only_the_written_student():
+    cache = InMemoryGradeCache(max_size=10)
+    service = StudentService(FakeStudentRepository(), FakeEvaluationRepository(), cache)
+    a = service.crear_estudiante('A', 'Ana')
+    b = service.crear_estudiante('B', 'Beto')
+    service.agregar_evaluacion(a.id, 12, 100)
+    service.agregar_evaluacion(b.id, 16, 100)
+
+    assert service.calcular_nota_final(a.id)['final_grade'] == 12.0
+    service.calcular_nota_final(b.id)
+    service.calcular_nota_final(b.id)
+    assert cache.stats()['hits'] == 1
+
+    service.set_attendance(a.id, False)
+    assert cache.get(a.id, True) is None
+    assert cache.get(b.id, True) is not None
+    assert service.calcular_nota_final(a.id)['final_grade'] == 11.0
+
+    service.agregar_evaluacion(a.id, 20, 100)
+    assert service.calcular_nota_final(a.id)['final_grade'] == 15.0
+
+
+def test_verified_tokens_expire_with_their_exp_claim_or_the_ttl():
+    clock = FakeClock()
+    cache = VerifiedTokenCache(max_size=2, ttl=60, clock=clock)
+    cache.set("short", exp=5, value={"sub": "a"})
+    cache.set("long", exp=1000, value={"sub": "b"})
+    assert cache.get("short") == {"sub": "a"}
+
+    clock.now = 5
+    assert cache.get("short") is None  # exp reached before the TTL
+    assert cache.get("long") == {"sub": "b"}
+    clock.now = 61
+    assert cache.get("long") is None  # TTL reached before exp
+    assert cache.stats()["expirations"] == 2
+
@@ -0,0 +1,168 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.application.consistency import check_final_grades
+from src.application.services import StudentService
+from src.domain.models import Evaluation, FinalGrade
+from src.infrastructure.adapters.database import (
+    metadata,
+    Upsert,
+    SQLAlchemyStudentRepository,
+    SQLAlchemyEvaluationRepository,
+    SQLAlchemyFinalGradeRepository,
+)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    metadata.create_all(bind=engine)
+    s = sessionmaker(bind=engine)()
+    yield s
+    s.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def service(session):
+    return StudentService(SQLAlchemyStudentRepository(session), SQLAlchemyEvaluationRepository(session))
+
+
+def test_bulk_lookups_group_evaluations_by_student(service):
+    a = service.crear_estudiante('S1', 'Uno')
+    b = service.crear_estudiante('S2', 'Dos')
+    service.agregar_evaluacion(a.id, 10, 40)
+    service.agregar_evaluacion(b.id, 20, 100)
+    service.agregar_evaluacion(a.id, 15, 60)
+
+    students = service.student_repo.find_by_ids([b.id, a.id, 404])
+    assert sorted(s.id for s in students) == [a.id, b.id]
+
+    grouped = service.evaluation_repo.find_by_student_ids([a.id, b.id])
+    assert [e.score for e in grouped[a.id]] == [10.0, 15.0]
+    assert [e.score for e in grouped[b.id]] == [20.0]
+
+
+def test_bulk_grades_match_single_grade(service):
+    a = service.crear_estudiante('S1', 'Uno', attendance=False)
+    service.agregar_evaluacion(a.id, 11, 30)
+    service.agregar_evaluacion(a.id, 17, 70)
+
+    [res] = service.calcular_notas_finales([a.id])
+    assert res == {"student_id": a.id, **service.calcular_nota_final(a.id)}
+
+
+def test_totals_are_maintained_on_save_and_match_full_grade(service):
+    a = service.crear_estudiante('S1', 'Uno', attendance=False)
+    assert service.evaluation_repo.get_totals(a.id) is None
+    service.agregar_evaluacion(a.id, 13.3, 30)
+    service.agregar_evaluacion(a.id, 17.1, 70)
+
+    totals = service.evaluation_repo.get_totals(a.id)
+    assert totals.evaluation_count == 2
+    assert totals.total_weight == 100.0
+
+    full = service.calcular_nota_final(a.id)
+    fast = service.calcular_nota_final(a.id, include_details=False)
+    assert fast['details']['evaluation_count'] == 2
+    assert {k: v for k, v in fast.items() if k != 'details'} == {k: v for k, v in full.items() if k != 'details'}
+
+
+def test_bulk_import_validates_and_inserts_in_one_batch(service):
+    a = service.crear_estudiante('S1', 'Uno')
+    for _ in range(9):
+        service.agregar_evaluacion(a.id, 10, 10)
+
+    report = service.importar_evaluaciones([
+        {"student_id": a.id, "score": 20, "weight": 10},
+        {"student_id": a.id, "score": 20, "weight": 10},
+        {"student_id": 404, "score": 20, "weight": 10},
+        {"student_id": a.id, "score": "n/a", "weight": 10},
+    ])
+    assert [e.student_id for e in report["created"]] == [a.id]
+    assert report["created"][0].id is not None
+    assert [e["row"] for e in report["errors"]] == [1, 2, 3]
+
+    totals = service.evaluation_repo.get_totals(a.id)
+    assert totals.evaluation_count == 10
+    assert service.evaluation_repo.count_by_student_ids([a.id]) == {a.id: 10}
+    assert service.calcular_nota_final(a.id)['final_grade'] == 11.0
+
+
+def test_keyset_pages_and_streaming_iterate_in_id_order(service):
+    created = [service.crear_estudiante(f'S{i}', f'Alumno {i}') for i in range(5)]
+
+    page, cursor = service.listar_estudiantes_pagina(limit=2)
+    seen = [s.id for s in page]
+    while cursor is not None:
+        page, cursor = service.listar_estudiantes_pagina(after_id=cursor, limit=2)
+        seen += [s.id for s in page]
+    assert seen == [s.id for s in created]
+
+    assert [s.id for s in service.iterar_estudiantes(batch_size=2)] == seen
+
+
+def test_sql_aggregation_matches_row_by_row_grades(service):
+    a = service.crear_estudiante('S1', 'Uno', attendance=False)
+    b = service.crear_estudiante('S2', 'Dos')
+    for score, weight in ((12.1, 25), (15.35, 25), (18.05, 50)):
+        service.agregar_evaluacion(a.id, score, weight)
+    service.agregar_evaluacion(b.id, 9.5, 100)
+
+    aggregated = service.evaluation_repo.aggregate_by_student([a.id, b.id, 404])
+    assert set(aggregated) == {a.id, b.id}
+    assert aggregated[a.id] == service.evaluation_repo.get_totals(a.id)
+
+    strip = lambda r: {k: v for k, v in r.items() if k != 'details'}
+    rows = service.calcular_notas_finales([a.id, b.id])
+    assert [strip(r) for r in service.calcular_notas_finales([a.id, b.id], include_details=False)] == \
+        [strip(r) for r in rows]
+
+
+def test_final_grades_are_maintained_on_write_and_checked_for_drift(session, service):
+    final_grades = SQLAlchemyFinalGradeRepository(session)
+    service.final_grade_repo = final_grades
+    a = service.crear_estudiante('S1', 'Uno')
+    b = service.crear_estudiante('S2', 'Dos')
+    assert final_grades.find_by_student_id(a.id) is None
+    service.agregar_evaluacion(a.id, 14, 50)
+    service.agregar_evaluacion(a.id, 17, 50)
+    service.importar_evaluaciones([{"student_id": b.id, "score": 12, "weight": 100}])
+    service.set_attendance(a.id, False)
+
+    for sid in (a.id, b.id):
+        full = service.calcular_nota_final(sid)
+        stored = service.calcular_nota_final(sid, include_details=False)
+        assert {k: v for k, v in stored.items() if k != 'details'} == {k: v for k, v in full.items() if k != 'details'}
+        # Same shape as a grade finished from the totals
+        service.final_grade_repo = None
+        assert stored == service.calcular_nota_final(sid, include_details=False)
+        service.final_grade_repo = final_grades
+    assert final_grades.find_by_student_id(a.id).attendance_penalty == 1.0
+
+    repos = (service.student_repo, service.evaluation_repo, final_grades)
+    assert check_final_grades(*repos)["drift"] == []
+    final_grades.save_many([FinalGrade(b.id, 0.0, 0.0, 0.0, 0.0)])
+    report = check_final_grades(*repos, repair=True)
+    assert [d["student_id"] for d in report["drift"]] == [b.id]
+    assert check_final_grades(*repos)["drift"] == []
+
+
+def test_upserts_fall_back_to_update_then_insert_without_on_conflict(session, service, monkeypatch):
+    # As on a dialect with no ON CONFLICT syntax
+    monkeypatch.setattr(Upsert, "native", lambda self, dialect: None)
+    a = service.crear_estudiante('S1', 'Uno')
+    b = service.crear_estudiante('S2', 'Dos')
+    service.evaluation_repo.save_many([
+        Evaluation(None, a.id, 12, 40), Evaluation(None, a.id, 18, 60), Evaluation(None, b.id, 9, 100),
+    ])
+    service.agregar_evaluacion(a.id, 20, 0)
+    service.set_attendance(b.id, False)
+
+    totals = service.evaluation_repo.get_totals(a.id)
+    assert (totals.evaluation_count, totals.total_weight, totals.weighted_sum) == (3, 100.0, 1560.0)
+    final_grades = SQLAlchemyFinalGradeRepository(session)
+    assert final_grades.find_by_student_id(a.id).final_grade == 15.6
+    assert final_grades.find_by_student_id(b.id).final_grade == 8.0
+    assert service.version_estudiantes() == 3
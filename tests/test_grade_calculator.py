@@ -1,3 +1,4 @@
+import random
 import pytest
 from src.application.grade_calculator import GradeCalculator
 
@@ -59,3 +60,57 @@ def test_custom_extra_points_per_student():
     res = gc.calculate_final('s5')
     assert res['extra_points'] == 2.0
     assert res['final_grade'] == 15.0
+
+
+def test_calculate_many_matches_calculate_final():
+    rng = random.Random(42)
+    ids, scores, weights = [], [], []
+    gc = GradeCalculator(attendance_penalty=1.5, extra_points=0.75)
+    gc.set_all_years_teachers(True)
+    gc.set_extra_points_for_student('7', 3.0)
+    counts = {}
+    for _ in range(500):
+        sid = rng.randrange(60)
+        score, weight = rng.uniform(0, 20), rng.choice([10, 12.5, 33.3, 40])
+        if counts.get(sid, 0) == gc.max_evaluations:
+            continue
+        counts[sid] = counts.get(sid, 0) + 1
+        gc.add_evaluation(sid, score, weight)
+        ids.append(sid)
+        scores.append(score)
+        weights.append(weight)
+    attendance = {str(sid): sid % 3 != 0 for sid in set(ids)}
+    for sid, flag in attendance.items():
+        gc.set_attendance(sid, flag)
+
+    batch = gc.calculate_many(ids, scores, weights, attendance)
+    assert set(batch) == {str(sid) for sid in ids}
+    for sid, res in batch.items():
+        assert res == gc.calculate_final(sid)
+
+
+def test_calculate_many_error_cases():
+    gc = GradeCalculator(max_evaluations=2)
+    with pytest.raises(ValueError):
+        gc.calculate_many([], [], [])
+    with pytest.raises(ValueError):
+        gc.calculate_many(['a', 'b'], [10, 12], [50, 0])
+    with pytest.raises(ValueError):
+        gc.calculate_many(['a', 'a', 'a'], [10, 12, 14], [30, 30, 40])
+    with pytest.raises(ValueError):
+        gc.calculate_many(['a'], [10, 12], [50, 50])
+
+
+def test_calculate_from_totals_matches_calculate_final():
+    gc = GradeCalculator()
+    gc.add_evaluation('s6', 11.7, 35)
+    gc.add_evaluation('s6', 15.2, 65)
+    gc.set_attendance('s6', False)
+    full = gc.calculate_final('s6')
+    res = gc.calculate_from_totals('s6', full['details']['total_weight'], full['details']['weighted_sum'], 2)
+    assert res['final_grade'] == full['final_grade']
+    assert res['details']['evaluation_count'] == 2
+    with pytest.raises(ValueError):
+        gc.calculate_from_totals('s6', 0.0, 0.0, 0)
+    with pytest.raises(ValueError):
+        gc.calculate_from_totals('s6', 100.0, 1500.0, 11)
@@ -0,0 +1,121 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from src.domain.models import Evaluation, Student
+from src.infrastructure.adapters.database import (
+    metadata,
+    evaluations_table,
+    SQLAlchemyStudentRepository,
+    SQLAlchemyEvaluationRepository,
+)
+from src.infrastructure.adapters.group_commit import GroupCommitWriter, GroupCommitEvaluationRepository
+from src.infrastructure.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def db(tmp_path):
+    # File-backed: the writer thread uses its own connection
+    engine = create_engine(f"sqlite:///{tmp_path / 'gc.db'}")
+
+    @event.listens_for(engine, "connect")
+    def _foreign_keys(dbapi_connection, record):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        for i in range(1, 5):
+            SQLAlchemyStudentRepository(session).save(Student(None, f'S{i}', f'Alumno {i}', True))
+    yield Session
+    engine.dispose()
+
+
+def test_concurrent_saves_are_committed_in_groups_and_get_their_ids(db):
+    registry = MetricsRegistry()
+    writer = GroupCommitWriter(db, max_batch=64, max_delay=0.05, registry=registry)
+    evaluations = [Evaluation(None, 1 + i % 4, 10 + i % 10, 10) for i in range(40)]
+
+    with ThreadPoolExecutor(8) as pool:
+        saved = list(pool.map(writer.save, evaluations))
+    writer.close()
+
+    assert [ev.id for ev in saved] == [ev.id for ev in evaluations]
+    assert len({ev.id for ev in saved}) == 40
+    batches = registry.histogram("evaluation_group_commit_batch_size", "")
+    assert batches.count() < 40
+    with db() as session:
+        rows = {r.id: r.student_id for r in session.execute(select(evaluations_table))}
+        assert rows == {ev.id: ev.student_id for ev in saved}
+        assert SQLAlchemyEvaluationRepository(session).get_totals(1).evaluation_count == 10
+
+
+def test_a_failing_row_only_fails_its_own_caller(db):
+    writer = GroupCommitWriter(db, max_batch=16, max_delay=0.05, registry=MetricsRegistry())
+    futures = [writer.submit(Evaluation(None, sid, 15, 20)) for sid in (1, 99, 2)]
+    writer.close()
+
+    assert futures[0].result().id is not None
+    assert futures[2].result().id is not None
+    with pytest.raises(IntegrityError):
+        futures[1].result()
+
+
+def test_close_flushes_pending_rows_and_rejects_new_ones(db):
+    writer = GroupCommitWriter(db, max_batch=1000, max_delay=60, registry=MetricsRegistry())
+    futures = [writer.submit(Evaluation(None, 3, 12, 50)) for _ in range(5)]
+    writer.close()
+
+    assert all(f.done() and f.result().id for f in futures)
+    with pytest.raises(RuntimeError):
+        writer.submit(Evaluation(None, 3, 12, 50))
+
+
+def test_callers_get_an_error_instead_of_waiting_forever(db):
+    def no_session():
+        raise OSError("database unreachable")
+
+    broken = GroupCommitWriter(no_session, max_delay=0.01, registry=MetricsRegistry())
+    with pytest.raises(OSError):
+        broken.save(Evaluation(None, 1, 10, 10))
+    broken.close()
+
+    slow = GroupCommitWriter(db, max_batch=1000, max_delay=60, registry=MetricsRegistry())
+    with pytest.raises(TimeoutError):
+        slow.save(Evaluation(None, 2, 10, 10), timeout=0.05)
+    slow.close()
+    with db() as session:
+        assert SQLAlchemyEvaluationRepository(session).find_by_student_id(2) == []
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_a_dead_writer_thread_is_restarted(db):
+    writer = GroupCommitWriter(db, max_delay=0.01, timeout=0.2, registry=MetricsRegistry())
+    flush = writer._flush
+
+    def die(batch):
+        writer._flush = flush
+        raise SystemExit  # ends the thread like an unexpected BaseException would
+
+    writer._flush = die
+    with pytest.raises(TimeoutError):
+        writer.save(Evaluation(None, 1, 10, 10))
+    assert writer.save(Evaluation(None, 1, 12, 10)).id is not None
+    writer.close()
+
+
+def test_repository_routes_single_saves_through_the_writer(db):
+    writer = GroupCommitWriter(db, registry=MetricsRegistry())
+    with db() as session:
+        repo = GroupCommitEvaluationRepository(SQLAlchemyEvaluationRepository(session), writer)
+        saved = repo.save(Evaluation(None, 4, 18, 100))
+        assert [ev.id for ev in repo.find_by_student_id(4)] == [saved.id]
+    writer.close()
+
+
+def test_rejects_unknown_durability(db):
+    with pytest.raises(ValueError):
+        GroupCommitWriter(db, durability="none")
@@ -0,0 +1,46 @@
+import os
+import runpy
+
+import pytest
+
+from src.infrastructure.adapters import api
+from src.infrastructure.config import Database
+
+CONF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gunicorn.conf.py")
+
+
+def test_workers_follow_the_usable_cpus(monkeypatch):
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {0, 1, 2}, raising=False)
+    conf = runpy.run_path(CONF)
+    assert conf["workers"] == 7 and conf["worker_class"] == "sync"
+
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    monkeypatch.setenv("GUNICORN_THREADS", "4")
+    conf = runpy.run_path(CONF)
+    assert (conf["workers"], conf["worker_class"]) == (3, "gthread")
+
+
+def test_read_model_refuses_more_than_one_worker(monkeypatch):
+    monkeypatch.setenv("READ_MODEL", "true")
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    with pytest.raises(SystemExit, match="WEB_CONCURRENCY=1"):
+        runpy.run_path(CONF)
+
+    monkeypatch.setenv("WEB_CONCURRENCY", "1")
+    monkeypatch.setenv("GUNICORN_THREADS", "8")
+    conf = runpy.run_path(CONF)
+    assert (conf["workers"], conf["worker_class"]) == (1, "gthread")
+
+
+def test_post_fork_gives_the_worker_a_fresh_engine(monkeypatch, tmp_path):
+    conf = runpy.run_path(CONF)
+    database = Database(f"sqlite:///{tmp_path / 'fork.db'}")
+    monkeypatch.setitem(api.app.extensions, "database", database)
+    parent_engine = database.engine
+
+    conf["post_fork"](None, None)
+
+    assert not database.created
+    assert database.engine is not parent_engine
+    database.dispose()
@@ -0,0 +1,54 @@
+"""Import-time budget, measured with `python -X importtime` in a fresh interpreter."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+FRAMEWORKS = ("sqlalchemy", "flask", "flask_cors", "flask_jwt_extended", "starlette", "numpy", "dotenv")
+# Generous ceiling for the pure layers (they take a few tens of ms); catches heavy imports creeping in
+CORE_BUDGET_US = 250_000
+
+
+def importtime(code: str) -> tuple[dict, str]:
+    """Cumulative import time in µs per module name, and the program's stdout."""
+    env = {**os.environ, "DATABASE_URL": "sqlite://", "PYTHONPATH": str(ROOT)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            times[name.strip()] = int(cumulative)
+    return times, proc.stdout
+
+
+@pytest.mark.parametrize("module", [
+    "src.domain.models",
+    "src.domain.ports",
+    "src.application.services",
+    "src.application.async_services",
+    "src.application.recompute",
+    "src.application.consistency",
+])
+def test_core_layers_import_without_frameworks(module):
+    times, _ = importtime(f"import {module}")
+    assert not sorted(m for m in times if m.split(".")[0] in FRAMEWORKS)
+    assert times[module] < CORE_BUDGET_US
+
+
+def test_config_import_is_lazy():
+    times, out = importtime("import src.infrastructure.config as c; print(c.database.created)")
+    assert "sqlalchemy" not in times
+    assert out.split() == ["False"]
+
+
+def test_flask_app_does_not_create_the_engine_on_import():
+    _, out = importtime(
+        "import src.infrastructure.adapters.api as api; print(api.app.extensions['database'].created)"
+    )
+    assert out.split() == ["False"]
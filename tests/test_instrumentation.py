@@ -0,0 +1,53 @@
+import logging
+
+from sqlalchemy import create_engine, text
+
+from src.infrastructure.instrumentation import (
+    Timed, finish_request, instrument_engine, span, start_request,
+)
+from src.infrastructure.metrics import MetricsRegistry
+
+
+def test_queries_and_spans_are_recorded_per_request():
+    registry = MetricsRegistry()
+    engine = create_engine("sqlite://")
+    instrument_engine(engine, registry)
+
+    start_request("/api/things", "GET")
+    with span("lookup", registry), engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+    stats = finish_request(registry=registry)
+
+    assert stats.queries == 2
+    assert registry.histogram("db_queries_per_request", "", ("endpoint",)).count(endpoint="/api/things") == 1
+    assert registry.histogram("http_request_span_seconds", "", ("endpoint", "span")).count(
+        endpoint="/api/things", span="lookup") == 1
+    assert registry.histogram("db_query_duration_seconds", "", ("operation",)).count(operation="SELECT") == 2
+
+
+def test_n_plus_one_is_logged_over_the_threshold(caplog):
+    registry = MetricsRegistry()
+    engine = create_engine("sqlite://")
+    instrument_engine(engine, registry)
+
+    start_request("/api/grades", "GET")
+    with engine.connect() as conn:
+        for i in range(5):
+            conn.execute(text("SELECT :i"), {"i": i})
+    with caplog.at_level(logging.WARNING):
+        finish_request(n_plus_one_threshold=3, registry=registry)
+
+    assert "Possible N+1" in caplog.text and "(5x)" in caplog.text
+    assert registry.counter("db_n_plus_one_requests_total", "", ("endpoint",)).value(endpoint="/api/grades") == 1
+
+
+def test_timed_proxy_is_transparent_outside_requests():
+    class Repo:
+        limit = 3
+
+        def find(self, x):
+            return x * 2
+
+    repo = Timed(Repo(), "repo")
+    assert repo.find(2) == 4 and repo.limit == 3
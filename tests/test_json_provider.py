@@ -0,0 +1,35 @@
+import json
+
+import pytest
+from flask import Flask
+
+from src.application.mappers import StudentMapper, EvaluationMapper
+from src.domain.models import Student, Evaluation
+from src.infrastructure.adapters import json_provider
+from src.infrastructure.adapters.json_provider import FastJSONProvider, TimedJSONProvider
+
+STUDENTS = [Student(1, "S001", "María García", True), Student(2, "S002", "Luis", False)]
+EVALUATIONS = [Evaluation(1, 1, 14.5, 50.0)]
+
+
+@pytest.mark.parametrize("provider", [TimedJSONProvider, FastJSONProvider])
+def test_dataclasses_encode_like_the_mappers(provider):
+    app = Flask(__name__)
+    app.json = provider(app)
+    payload = {"items": STUDENTS, "evaluations": EVALUATIONS, "by_id": {1: 15.0}}
+    with app.app_context():
+        body = app.json.response(payload).get_data()
+    assert json.loads(body) == {
+        "items": StudentMapper.to_list(STUDENTS),
+        "evaluations": EvaluationMapper.to_list(EVALUATIONS),
+        "by_id": {"1": 15.0},
+    }
+    assert app.json.loads(app.json.dumps(STUDENTS[0])) == StudentMapper.to_dict(STUDENTS[0])
+
+
+def test_fast_provider_falls_back_without_orjson(monkeypatch):
+    monkeypatch.setattr(json_provider, "orjson", None)
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    with app.app_context():
+        assert json.loads(app.json.response(STUDENTS).get_data()) == StudentMapper.to_list(STUDENTS)
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from src.application.services import calcular_nota_desde_totales
+from src.infrastructure.adapters.database import (
+    metadata, SQLAlchemyEvaluationRepository, SQLAlchemyFinalGradeRepository, SQLAlchemyStudentRepository,
+)
+
+
+def _upgrade(url):
+    cfg = Config(str(Path(__file__).resolve().parents[1] / "alembic.ini"))
+    cfg.set_main_option("sqlalchemy.url", url)
+    command.upgrade(cfg, "head")
+
+
+def test_migrations_build_the_declared_schema(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    _upgrade(url)
+    engine = create_engine(url)
+    insp = inspect(engine)
+    assert set(metadata.tables) <= set(insp.get_table_names())
+    assert 'ix_evaluations_student_id_covering' in {ix['name'] for ix in insp.get_indexes('evaluations')}
+    engine.dispose()
+
+
+def test_migrations_apply_on_top_of_a_pre_existing_schema(tmp_path):
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    engine = create_engine(url)
+    metadata.create_all(bind=engine)
+    engine.dispose()
+    _upgrade(url)
+
+
+def test_upgrade_backfills_the_final_grades(tmp_path):
+    url = f"sqlite:///{tmp_path / 'seeded.db'}"
+    engine = create_engine(url)
+    metadata.create_all(bind=engine)
+    # Rows written before final_grades was maintained (as db/init.sql seeds them)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE final_grades"))
+        conn.execute(text("INSERT INTO students (id, code, nombre, attendance) VALUES "
+                          "(1, 'S1', 'Uno', 1), (2, 'S2', 'Dos', 0), (3, 'S3', 'Tres', 1)"))
+        conn.execute(text("INSERT INTO evaluations (student_id, score, weight) VALUES "
+                          "(1, 13.7, 30), (1, 11.2, 30), (1, 16.1, 40), (2, 18.3, 100)"))
+        conn.execute(text("INSERT INTO evaluation_totals (student_id, evaluation_count, total_weight, weighted_sum) "
+                          "SELECT student_id, COUNT(*), SUM(weight), SUM(score * weight) "
+                          "FROM evaluations GROUP BY student_id"))
+    _upgrade(url)
+
+    with Session(engine) as session:
+        students, evaluations = SQLAlchemyStudentRepository(session), SQLAlchemyEvaluationRepository(session)
+        final_grades = SQLAlchemyFinalGradeRepository(session)
+        for sid in (1, 2):
+            expected = calcular_nota_desde_totales(students.find_by_id(sid), evaluations.get_totals(sid))
+            stored = final_grades.find_by_student_id(sid)
+            assert (stored.weighted_average, stored.attendance_penalty, stored.extra_points, stored.final_grade) == \
+                tuple(expected[k] for k in ("weighted_average", "attendance_penalty", "extra_points", "final_grade"))
+        assert final_grades.find_by_student_id(3) is None
+    engine.dispose()
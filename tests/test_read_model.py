@@ -0,0 +1,224 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from src.application.services import StudentService
+from src.domain.models import Evaluation
+from src.infrastructure.adapters.database import (
+    metadata,
+    SQLAlchemyStudentRepository,
+    SQLAlchemyEvaluationRepository,
+    SQLAlchemyFinalGradeRepository,
+)
+from src.infrastructure.adapters.read_model import (
+    GradebookReadModel,
+    ReadModelLoader,
+    ReadModelStudentRepository,
+    ReadModelEvaluationRepository,
+    ReadModelFinalGradeRepository,
+)
+from src.infrastructure.adapters.snapshot import export_snapshot
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'rm.db'}")
+    metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        service = _sql_service(session)
+        for i in range(1, 4):
+            s = service.crear_estudiante(f'R{i}', f'Alumno {i}', attendance=i != 2)
+            service.agregar_evaluacion(s.id, 10 + i, 40)
+            service.agregar_evaluacion(s.id, 14, 60)
+    yield engine, Session
+    engine.dispose()
+
+
+def _sql_service(session):
+    return StudentService(
+        SQLAlchemyStudentRepository(session), SQLAlchemyEvaluationRepository(session),
+        final_grade_repo=SQLAlchemyFinalGradeRepository(session),
+    )
+
+
+def _service(model, session):
+    students = SQLAlchemyStudentRepository(session)
+    return StudentService(
+        ReadModelStudentRepository(model, students),
+        ReadModelEvaluationRepository(model, SQLAlchemyEvaluationRepository(session), students),
+        final_grade_repo=ReadModelFinalGradeRepository(model, SQLAlchemyFinalGradeRepository(session)),
+    )
+
+
+def _record_queries(engine):
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: queries.append(statement))
+    return queries
+
+
+def test_reads_are_served_from_memory_with_the_database_results(db):
+    engine, Session = db
+    model = GradebookReadModel()
+    with Session() as session:
+        model.load_from_database(session)
+        expected = _sql_service(session)
+        service = _service(model, session)
+        queries = _record_queries(engine)
+
+        for details in (True, False):
+            assert service.calcular_notas_finales(include_details=details) == \
+                expected.calcular_notas_finales(include_details=details)
+            assert service.calcular_nota_final(2, include_details=details) == \
+                expected.calcular_nota_final(2, include_details=details)
+        assert service.student_repo.find_by_code('R2').id == 2
+        assert service.evaluation_repo.count_by_student_ids([1, 9]) == {1: 2, 9: 0}
+        assert [s.id for s in service.listar_estudiantes_pagina(after_id=1, limit=5)[0]] == [2, 3]
+        assert [s.id for s in service.iterar_estudiantes(batch_size=2)] == [1, 2, 3]
+        # Only the database service above ran queries: versions and stored grades come from memory too
+        versions = [expected.version_estudiante(sid) for sid in (1, 2, 3)] + [expected.version_estudiantes()]
+        grade = expected.calcular_nota_final(2, include_details=False)
+        queries.clear()
+        service.calcular_notas_finales()
+        assert [service.version_estudiante(sid) for sid in (1, 2, 3)] + [service.version_estudiantes()] == versions
+        assert service.calcular_nota_final(2, include_details=False) == grade
+        assert queries == []
+
+
+def test_writes_go_through_the_database_and_into_the_model(db):
+    engine, Session = db
+    model = GradebookReadModel()
+    with Session() as session:
+        model.load_from_database(session)
+        service = _service(model, session)
+        nuevo = service.crear_estudiante('R4', 'Alumno 4')
+        ev = service.agregar_evaluacion(nuevo.id, 18, 100)
+        service.set_attendance(1, False)
+
+        db_service = _sql_service(session)
+        assert model.student(nuevo.id) == db_service.student_repo.find_by_id(nuevo.id)
+        assert model.evaluations(nuevo.id) == [ev]
+        assert model.student(1).attendance is False
+        assert service.calcular_nota_final(1) == db_service.calcular_nota_final(1)
+        for sid in (1, nuevo.id):
+            assert service.version_estudiante(sid) == db_service.version_estudiante(sid)
+        assert service.version_estudiantes() == db_service.version_estudiantes()
+        assert [s.id for s in service.listar_estudiantes_pagina(after_id=2)[0]] == [3, nuevo.id]
+
+        # Written by another process before our next write: read back along with it
+        db_service.agregar_evaluacion(2, 20, 10)
+        service.agregar_evaluacion(2, 16, 10)
+        assert model.evaluations(2) == db_service.evaluation_repo.find_by_student_id(2)
+        assert service.version_estudiante(2) == db_service.version_estudiante(2)
+        with pytest.raises(ValueError):
+            service.agregar_evaluacion(99, 10, 10)
+        # Handed-out students are copies: mutating one does not change the model
+        service.student_repo.find_by_id(2).attendance = True
+        assert model.student(2).attendance is False
+
+
+def test_snapshot_restore_catches_up_with_later_writes(db, tmp_path):
+    engine, Session = db
+    path = str(tmp_path / "model.snapshot")
+    with Session() as session:
+        source = GradebookReadModel()
+        source.load_from_database(session)
+        source.save_snapshot(path)
+        # Same columnar format as the snapshot CLI
+        export_snapshot(session, str(tmp_path / "exported"))
+        exported = GradebookReadModel()
+        exported.load_snapshot(str(tmp_path / "exported"))
+        assert exported.students() == source.students() and exported.evaluations(2) == source.evaluations(2)
+        # Written by "another process" after the snapshot
+        _sql_service(session).agregar_evaluacion(3, 20, 10)
+        _sql_service(session).set_attendance(3, False)
+
+    loader = ReadModelLoader(GradebookReadModel(), Session, snapshot=path, refresh_interval=0)
+    model = loader.ensure_current()
+    assert model.stats() == {"students": 3, "evaluations": 7}
+    assert model.student(3).attendance is False
+    with Session() as session:
+        assert model.totals(3) == SQLAlchemyEvaluationRepository(session).get_totals(3)
+        assert model.version(3) == SQLAlchemyStudentRepository(session).get_version(3)
+
+
+def test_catch_up_finds_lower_ids_committed_after_a_write_through(db):
+    engine, Session = db
+    model = GradebookReadModel()
+    insert = text("INSERT INTO evaluations (id, student_id, score, weight) VALUES (:id, 1, 10, 10)")
+    with Session() as session:
+        model.load_from_database(session)  # evaluations 1..6
+        # Id 10 is committed and written through; another process still holds id 8
+        session.execute(insert, {"id": 10})
+        session.commit()
+        model.add_evaluations([Evaluation(10, 1, 10.0, 10.0)])
+        assert model.catch_up(session) == 0
+
+        session.execute(insert, {"id": 8})
+        session.commit()
+        assert model.catch_up(session) == 1
+    assert [ev.id for ev in model.evaluations(1)] == [1, 2, 8, 10]
+
+
+def test_loader_catches_up_every_refresh_interval(db):
+    engine, Session = db
+    now = [0.0]
+    loader = ReadModelLoader(GradebookReadModel(), Session, refresh_interval=5, clock=lambda: now[0])
+    model = loader.ensure_current()
+    with Session() as session:
+        _sql_service(session).agregar_evaluacion(1, 20, 10)
+
+    now[0] = 4.0
+    assert len(loader.ensure_current().evaluations(1)) == 2
+    now[0] = 5.0
+    loader.ensure_current()
+    loader.wait(5)
+    assert [ev.score for ev in model.evaluations(1)] == [11, 14, 20]
+    assert model.stats()["evaluations"] == 7
+
+
+def test_requests_keep_reading_while_a_catch_up_runs(db):
+    engine, Session = db
+    now = [0.0]
+    model = GradebookReadModel()
+    loader = ReadModelLoader(model, Session, refresh_interval=5, clock=lambda: now[0])
+    loader.ensure_current()
+    started, release = threading.Event(), threading.Event()
+    catch_up = model.catch_up
+
+    def slow_catch_up(session):
+        started.set()
+        release.wait(5)
+        return catch_up(session)
+
+    model.catch_up = slow_catch_up
+    with Session() as session:
+        _sql_service(session).agregar_evaluacion(1, 20, 10)
+
+    now[0] = 5.0
+    assert loader.ensure_current() is model and started.wait(5)
+    # Due again while the catch-up is still running: served at once, without a second one
+    now[0] = 10.0
+    assert len(loader.ensure_current().evaluations(1)) == 2
+    release.set()
+    loader.wait(5)
+    assert len(model.evaluations(1)) == 3
+
+
+def test_catch_up_rescans_the_last_overlap_intervals(db):
+    engine, Session = db
+    model = GradebookReadModel(catch_up_overlap=2)
+    insert = text("INSERT INTO evaluations (id, student_id, score, weight) VALUES (:id, 1, 10, 10)")
+    with Session() as session:
+        model.load_from_database(session)  # evaluations 1..6
+        session.execute(insert, {"id": 10})
+        session.commit()
+        assert model.catch_up(session) == 1
+        assert model.catch_up(session) == 0
+        # Id 8 commits two catch-ups after id 10 was read: still inside the overlap
+        session.execute(insert, {"id": 8})
+        session.commit()
+        assert model.catch_up(session) == 1
+    assert [ev.id for ev in model.evaluations(1)] == [1, 2, 8, 10]
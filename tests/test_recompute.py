@@ -0,0 +1,89 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.application.recompute import recompute_final_grades
+from src.application.services import StudentService
+from src.infrastructure.adapters.database import (
+    metadata,
+    SQLAlchemyStudentRepository,
+    SQLAlchemyEvaluationRepository,
+    SQLAlchemyFinalGradeRepository,
+)
+
+
+@pytest.fixture
+def repos():
+    engine = create_engine("sqlite://")
+    metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    students = SQLAlchemyStudentRepository(session)
+    evaluations = SQLAlchemyEvaluationRepository(session)
+    service = StudentService(students, evaluations)
+    for i in range(1, 6):
+        s = service.crear_estudiante(f'S{i}', f'Alumno {i}', attendance=i % 2 == 1)
+        if i != 4:
+            service.agregar_evaluacion(s.id, 10 + i, 40)
+            service.agregar_evaluacion(s.id, 12, 60)
+    yield service, SQLAlchemyFinalGradeRepository(session)
+    session.close()
+    engine.dispose()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_recompute_stores_the_service_grades(repos, workers):
+    service, final_grades = repos
+    progress = []
+    summary = recompute_final_grades(
+        service.student_repo, service.evaluation_repo, final_grades,
+        workers=workers, partition_size=2, progress=progress.append,
+    )
+
+    assert (summary["partitions"], summary["graded"], summary["failed"]) == (3, 4, 1)
+    assert progress[-1]["graded"] == 4
+    for sid in (1, 2, 3, 5):
+        expected = service.calcular_nota_final(sid)
+        stored = final_grades.find_by_student_id(sid)
+        assert stored.final_grade == expected["final_grade"]
+        assert stored.attendance_penalty == expected["attendance_penalty"]
+    assert final_grades.find_by_student_id(4) is None
+
+
+def test_recompute_resumes_after_the_checkpoint(repos, tmp_path):
+    service, final_grades = repos
+    final_grades.delete_many([1, 2, 3, 4, 5])  # as if the table had never been filled
+    checkpoint = tmp_path / "recompute.json"
+    checkpoint.write_text(json.dumps({"after_id": 2}))
+
+    summary = recompute_final_grades(
+        service.student_repo, service.evaluation_repo, final_grades,
+        partition_size=2, checkpoint=str(checkpoint),
+    )
+
+    assert summary["resumed_after"] == 2 and summary["graded"] == 2
+    assert final_grades.find_by_student_id(1) is None
+    assert final_grades.find_by_student_id(5) is not None
+    assert not checkpoint.exists()
+
+
+def test_recompute_does_not_overwrite_grades_refreshed_by_later_writes(repos):
+    service, final_grades = repos
+    writer = StudentService(service.student_repo, service.evaluation_repo, final_grade_repo=final_grades)
+    read = service.evaluation_repo.find_by_student_ids
+
+    def read_then_write(ids):
+        rows = read(ids)
+        if 1 in ids:
+            # Lands after the partition was read, with its own on-write refresh of student 1
+            writer.agregar_evaluacion(1, 20, 100)
+        return rows
+
+    service.evaluation_repo.find_by_student_ids = read_then_write
+    summary = recompute_final_grades(service.student_repo, service.evaluation_repo, final_grades, partition_size=2)
+
+    assert summary["skipped"] == 1
+    del service.evaluation_repo.find_by_student_ids
+    assert final_grades.find_by_student_id(1).final_grade == service.calcular_nota_final(1)["final_grade"]
+    assert final_grades.find_by_student_id(2) is not None
@@ -0,0 +1,93 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from src.application.services import StudentService
+from src.infrastructure.adapters.database import (
+    metadata,
+    students_table,
+    SQLAlchemyStudentRepository,
+    SQLAlchemyEvaluationRepository,
+    SQLAlchemyFinalGradeRepository,
+)
+from src.infrastructure.adapters.snapshot import export_snapshot, grade_snapshot, import_snapshot, load_snapshot
+
+
+def _database(path):
+    engine = create_engine(f"sqlite:///{path}")
+    metadata.create_all(bind=engine)
+    return engine, sessionmaker(bind=engine)()
+
+
+def _service(session):
+    return StudentService(
+        SQLAlchemyStudentRepository(session), SQLAlchemyEvaluationRepository(session),
+        final_grade_repo=SQLAlchemyFinalGradeRepository(session),
+    )
+
+
+@pytest.fixture
+def source(tmp_path):
+    engine, session = _database(tmp_path / "source.db")
+    service = _service(session)
+    for i in range(1, 6):
+        s = service.crear_estudiante(f'N{i}', f'Ñandú {i}', attendance=i % 2 == 1)
+        for j in range(i if i != 4 else 0):
+            service.agregar_evaluacion(s.id, 10 + j * 1.5, 10 + j)
+    yield service
+    session.close()
+    engine.dispose()
+
+
+def test_export_round_trips_through_a_memory_mapped_snapshot(source, tmp_path):
+    manifest = export_snapshot(source.student_repo.session, str(tmp_path / "snap"))
+    assert manifest == {"format": 1, "students": 5, "evaluations": 11}
+
+    snap = load_snapshot(str(tmp_path / "snap"))
+    assert snap.student_id.tolist() == [1, 2, 3, 4, 5]
+    assert list(snap.nombre) == [f'Ñandú {i}' for i in range(1, 6)] and snap.code[1] == 'N2'
+    assert snap.attendance.tolist() == [True, False, True, False, True]
+    assert snap.evaluation_student_id.tolist() == [1, 2, 2, 3, 3, 3, 5, 5, 5, 5, 5]
+
+
+def test_import_restores_rows_and_derived_tables(source, tmp_path):
+    export_snapshot(source.student_repo.session, str(tmp_path / "snap"))
+    engine, session = _database(tmp_path / "restored.db")
+    restored = _service(session)
+
+    summary = import_snapshot(session, load_snapshot(str(tmp_path / "snap")), chunk=4)
+
+    assert (summary["students"], summary["evaluations"]) == (5, 11)
+    assert restored.listar_estudiantes() == source.listar_estudiantes()
+    for sid in range(1, 6):
+        assert restored.evaluation_repo.find_by_student_id(sid) == source.evaluation_repo.find_by_student_id(sid)
+        assert restored.evaluation_repo.get_totals(sid) == source.evaluation_repo.get_totals(sid)
+        assert restored.final_grade_repo.find_by_student_id(sid) == source.final_grade_repo.find_by_student_id(sid)
+    # New rows continue after the imported ids
+    assert restored.crear_estudiante('N6', 'Nuevo').id == 6
+    session.close()
+    engine.dispose()
+
+
+def test_import_requires_replace_over_existing_students(source, tmp_path):
+    export_snapshot(source.student_repo.session, str(tmp_path / "snap"))
+    session = source.student_repo.session
+    version = source.version_estudiante(5)
+    snap = load_snapshot(str(tmp_path / "snap"))
+
+    with pytest.raises(ValueError):
+        import_snapshot(session, snap)
+    import_snapshot(session, snap, replace=True)
+    assert len(source.listar_estudiantes()) == 5
+    assert session.execute(select(students_table.c.version).where(students_table.c.id == 1)).scalar() > version
+
+
+def test_grade_snapshot_matches_the_service(source, tmp_path):
+    export_snapshot(source.student_repo.session, str(tmp_path / "snap"))
+    report = grade_snapshot(load_snapshot(str(tmp_path / "snap")), include_details=True)
+
+    assert report["failed"] == [4]
+    for sid, grade in report["grades"].items():
+        expected = source.calcular_nota_final(sid)
+        assert grade["final_grade"] == expected["final_grade"]
+        assert grade["details"]["evaluations"] == expected["details"]["evaluations"]